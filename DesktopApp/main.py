@@ -1,20 +1,42 @@
 # main.py
+import sys
+
+# --tracker-daemon runs screen time tracking headless. It is dispatched before
+# customtkinter and the views are imported so the daemon stays small.
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in ("--tracker-daemon", "--stop-tracker-daemon"):
+    from views.tracker_daemon import run_daemon, stop_daemon
+    if sys.argv[1] == "--tracker-daemon":
+        sys.exit(run_daemon())
+    sys.exit(0 if stop_daemon() else 1)
+
+import time
+# Cold-start reference point for the first-paint measurement
+PROCESS_STARTED = time.perf_counter()
+
 import customtkinter as ctk
+from tkinter import messagebox
 import datetime
 import random
-import sys
 import os
 from theme import Theme
-from views.dashboard_view import DashboardView
-from views.update_info_view import UpdateInfoView
-from views.productivity_view import ProductivityView
-from views.to_do_view import ToDoView, launch_todo_popup
-from views.screen_time_view import ScreenTimeView
-from views.data_utils import read_config, get_user_data_path
+# The views themselves are imported by their factories in TaskSnapApp, on first navigation
+from views.data_utils import get_user_data_path, set_error_reporter
+from views.config_service import get_config_service
+from views.outbound_queue import get_outbound_queue
+from views.view_registry import ViewRegistry, PREWARM_ORDER, prewarm_from_config
+from views.tracker_daemon import create_tracker, stop_tracker
+from views.tracker_lock import TrackerLockHeld
+from views.screen_time_tracker import WORK_THRESHOLD_SECONDS
+from views.durations import to_ms
 from views.Task_Scheduler import create_logon_task, create_daily_task
 from views.tray_manager import TrayManager
 from views.startup_manager import setup_startup_automatically
-from views.productivity_view import launch_productivity_popup  # FIX: Correct function name
+
+# data_utils stays Tk-free for the daemon; in the app its errors are dialogs
+set_error_reporter(messagebox.showerror)
+
+# How often the break reminder is checked while the Screen Time view hasn't been built
+REMINDER_WATCH_MS = 5000
 
 
 def resource_path(relative_path):
@@ -51,36 +73,49 @@ class TaskSnapApp(ctk.CTk):
         self.configure(fg_color=Theme.BACKGROUND)
 
         # --- View Management ---
+        # Views are built on first navigation (see view_registry.py)
         self.current_view = None
+        self.current_view_name = None
+        self.first_paint_reported = False
+        self.views = ViewRegistry()
+        self.views.register("dashboard", self.build_dashboard_view)
+        self.views.register("update_info", self.build_update_info_view)
+        self.views.register("productivity", self.build_productivity_view)
+        self.views.register("todo", self.build_todo_view)
+        self.views.register("screentime", self.build_screen_time_view)
 
         # --- Dynamic Content & Config ---
-        self.config = read_config()
-        
-        user_name = self.config.get('User First Name', '')
-        user_email = self.config.get('User Email', '')
-        
-        greeting = self.get_greeting()
-        quote = self.get_random_quote()
-
-        # --- Initialize Views ---
-        self.dashboard_view = DashboardView(self, user_name, greeting, quote, self.show_update_info, self.show_productivity, self.show_todo, self.show_screen_time, self.toggle_theme)
-        self.update_info_view = UpdateInfoView(self, self.show_dashboard)
-        self.productivity_view = ProductivityView(self, self.show_dashboard)
-        self.to_do_view = ToDoView(self, self.show_dashboard)
-        self.screen_time_view = ScreenTimeView(self, self.show_dashboard)
-        
-        # Load initial data into the Update Info view
-        self.update_info_view.load_current_data(self.config)
+        # Cached, typed view of config.csv; kept current by the subscription below
+        config_service = get_config_service()
+        self.config = config_service.get()
+        config_service.subscribe(self.on_config_changed)
+
+        # --- Tracking starts eagerly; its view does not ---
+        try:
+            self.tracker = create_tracker()
+        except TrackerLockHeld as e:
+            # Another TaskSnap process is tracking and can't be attached to
+            messagebox.showerror("TaskSnap Journal", f"TaskSnap is already running.\n{e}")
+            self.destroy()
+            sys.exit(1)
+        self.tracker.start()
+        self.after(REMINDER_WATCH_MS, self.watch_break_reminder)
+
+        # Start sending any uploads/emails left spooled by the last session
+        get_outbound_queue()
 
         # --- Initialize System Tray ---
         self.tray_manager = TrayManager(self)
         self.tray_manager.start()  # Always start the tray
 
         # --- Show initial view ---
-        if not user_name or not user_email:
-            self.show_update_info()
+        # From the tray the window stays withdrawn, so nothing is built until it is shown
+        if not start_minimized:
+            self.show_initial_view()
         else:
-            self.show_dashboard()
+            print(f"Cold start: ready in the tray after {(time.perf_counter() - PROCESS_STARTED) * 1000:.0f} ms")
+        if prewarm_from_config(self.config, start_minimized):
+            self.views.prewarm(self, PREWARM_ORDER)
         
         # --- Event Bindings ---
         self.bind("<Configure>", self.on_resize)
@@ -94,6 +129,118 @@ class TaskSnapApp(ctk.CTk):
         if self.is_first_run:
             self.after(500, self.handle_first_run)
 
+    # --- View factories (called by the registry on first use) ---
+
+    def build_dashboard_view(self):
+        from views.dashboard_view import DashboardView
+        user_name = self.config.get('User First Name', '')
+        return DashboardView(self, user_name, self.get_greeting(), self.get_random_quote(), self.show_update_info,
+                             self.show_productivity, self.show_todo, self.show_screen_time, self.toggle_theme)
+
+    def build_update_info_view(self):
+        from views.update_info_view import UpdateInfoView
+        return UpdateInfoView(self, self.show_dashboard)
+
+    def build_productivity_view(self):
+        from views.productivity_view import ProductivityView
+        return ProductivityView(self, self.show_dashboard)
+
+    def build_todo_view(self):
+        from views.to_do_view import ToDoView
+        return ToDoView(self, self.show_dashboard)
+
+    def build_screen_time_view(self):
+        from views.screen_time_view import ScreenTimeView
+        return ScreenTimeView(self, self.show_dashboard, tracker=self.tracker)
+
+    # Attribute access builds the view on first use, so other modules can keep using these names
+    @property
+    def dashboard_view(self):
+        return self.views.get("dashboard")
+
+    @property
+    def update_info_view(self):
+        return self.views.get("update_info")
+
+    @property
+    def productivity_view(self):
+        return self.views.get("productivity")
+
+    @property
+    def to_do_view(self):
+        return self.views.get("todo")
+
+    @property
+    def screen_time_view(self):
+        return self.views.get("screentime")
+
+    def show_initial_view(self):
+        """Shows the first view once the window is visible (no-op if one is already shown)."""
+        if self.current_view is not None:
+            return
+        if not self.config.get('User First Name', '') or not self.config.get('User Email', ''):
+            self.show_update_info()
+        else:
+            self.show_dashboard()
+
+    def _show_view(self, name, fg_color=None):
+        """Hides the current view and shows `name`, building it first if needed."""
+        view = self.views.get(name)
+        if self.current_view is not None:
+            self.current_view.pack_forget()
+            if self.current_view_name == "productivity":
+                self.unbind("<Button-1>")
+
+        self.configure(fg_color=fg_color or Theme.BACKGROUND)
+        self.current_view = view
+        self.current_view_name = name
+        view.pack(fill="both", expand=True)
+        view.update_ui_colors()
+        if not self.first_paint_reported:
+            view.bind("<Expose>", self.report_first_paint, add="+")
+        return view
+
+    def report_first_paint(self, event=None):
+        """Logs cold-start-to-first-paint once, with the time spent building each view so far."""
+        if self.first_paint_reported:
+            return
+        self.first_paint_reported = True
+        elapsed_ms = (time.perf_counter() - PROCESS_STARTED) * 1000
+        built = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.views.build_ms.items())
+        print(f"Cold start: first paint after {elapsed_ms:.0f} ms (views built: {built})")
+
+    def watch_break_reminder(self):
+        """
+        The Screen Time view runs the break reminder once it exists. Until then,
+        watch the tracker and build the view when WORK_THRESHOLD_SECONDS of continuous work is up.
+        """
+        if self.views.built("screentime") is not None:
+            return
+        try:
+            self.tracker.refresh()
+            if self.tracker.snapshot.continuous_work_time >= to_ms(WORK_THRESHOLD_SECONDS):
+                self.views.get("screentime")
+                return
+        except Exception as e:
+            print(f"Error checking break reminder: {e}")
+        self.after(REMINDER_WATCH_MS, self.watch_break_reminder)
+
+    def stop_tracking(self):
+        """Final save and silent upload on exit, through the view if it has been built."""
+        view = self.views.built("screentime")
+        if view is not None:
+            view.stop_tracking()
+        else:
+            stop_tracker(self.tracker)
+
+    def take_break(self):
+        """Starts a break (e.g. from the tray). Returns False if one is already running."""
+        view = self.screen_time_view
+        if view.is_on_break:
+            return False
+        view.start_break()
+        return True
+
     # In main.py, replace the handle_first_run method:
 
 
@@ -132,8 +279,7 @@ class TaskSnapApp(ctk.CTk):
                 self._shown_tray_notification = True
         else:
             # No tray running, so fully exit
-            if self.screen_time_view:
-                self.screen_time_view.stop_tracking()
+            self.stop_tracking()
             self.destroy()
             sys.exit(0)
 
@@ -153,81 +299,45 @@ class TaskSnapApp(ctk.CTk):
         except Exception as e:
             print(f"Could not reapply icon after theme change: {e}")
             
-        self.dashboard_view.update_ui_colors()
-        self.update_info_view.update_ui_colors()
-        self.productivity_view.update_ui_colors()
-        self.to_do_view.update_ui_colors()
-        self.screen_time_view.update_ui_colors()
+        # Views not built yet pick up the new theme when they are created
+        for view in self.views.built_views():
+            view.update_ui_colors()
+
+    def on_config_changed(self, config):
+        """Config service subscriber: keeps self.config pointing at the latest values."""
+        self.config = config
 
     def show_dashboard(self):
         """Hides other views and shows the dashboard."""
-        if self.current_view:
-            self.current_view.pack_forget()
-            if self.current_view == self.productivity_view:
-                self.unbind("<Button-1>")
-
-        if self.current_view == self.update_info_view:
+        if self.current_view_name == "update_info":
             try:
-                self.config = read_config()
                 create_logon_task(self.config)
                 create_daily_task(self.config)
             except Exception as e:
                 print(f"Failed to create scheduled tasks: {e}")
 
-        self.configure(fg_color=Theme.BACKGROUND)
-        self.current_view = self.dashboard_view
-        self.current_view.pack(fill="both", expand=True)
-        self.dashboard_view.update_ui_colors()
+        self._show_view("dashboard")
 
     def show_update_info(self):
         """Hides other views and shows the update info screen."""
-        if self.current_view:
-            self.current_view.pack_forget()
-            if self.current_view == self.productivity_view:
-                self.unbind("<Button-1>")
-
-        self.configure(fg_color=Theme.CARD)
-        self.current_view = self.update_info_view
-        self.current_view.pack(fill="both", expand=True)
-        self.update_info_view.update_ui_colors()
+        self._show_view("update_info", Theme.CARD)
 
     def show_productivity(self):
         """Hides other views and shows the productivity screen."""
-        if self.current_view:
-            self.current_view.pack_forget()
-            
-        self.configure(fg_color=Theme.BACKGROUND) 
-        self.current_view = self.productivity_view
-        self.current_view.pack(fill="both", expand=True)
-        self.productivity_view.update_ui_colors()
+        self._show_view("productivity")
 
     def show_todo(self):
         """Hides other views and shows the to-do screen."""
-        if self.current_view:
-            self.current_view.pack_forget()
-            if self.current_view == self.productivity_view:
-                self.unbind("<Button-1>")
-            
-        self.configure(fg_color=Theme.BACKGROUND) 
-        self.current_view = self.to_do_view
-        self.current_view.pack(fill="both", expand=True)
-        self.to_do_view.update_ui_colors()
+        self._show_view("todo")
 
     def show_screen_time(self):
         """Hides other views and shows the screen time screen."""
-        if self.current_view:
-            self.current_view.pack_forget()
-            if self.current_view == self.productivity_view:
-                self.unbind("<Button-1>")
-
-        self.configure(fg_color=Theme.BACKGROUND) 
-        self.current_view = self.screen_time_view
-        self.current_view.pack(fill="both", expand=True)
-        self.screen_time_view.update_ui_colors()
+        self._show_view("screentime")
 
     def on_resize(self, event=None):
-        if self.dashboard_view.winfo_exists() and self.dashboard_view.winfo_ismapped():
-            self.dashboard_view.update_font_sizes(self.winfo_width())
+        dashboard = self.views.built("dashboard")
+        if dashboard is not None and dashboard.winfo_exists() and dashboard.winfo_ismapped():
+            dashboard.update_font_sizes(self.winfo_width())
 
     def get_greeting(self):
         current_hour = datetime.datetime.now().hour
@@ -251,11 +361,13 @@ if __name__ == "__main__":
             start_minimized = True
             
         elif sys.argv[1] == "--todo-popup":
+            from views.to_do_view import launch_todo_popup
             launch_todo_popup()  # This one is correct
             sys.exit(0)
             
         elif sys.argv[1] == "--productivity-popup":
             # FIX: Use the correct function name
+            from views.productivity_view import launch_productivity_popup
             launch_productivity_popup()
             sys.exit(0)
     
@@ -0,0 +1,16 @@
+# tests/conftest.py
+"""
+Shared test setup. The app keeps its data under the user's home (or
+LOCALAPPDATA on Windows), resolved when views.data_utils is imported, so both
+point at a throwaway folder before any test imports the views.
+"""
+import os
+import sys
+import tempfile
+
+DATA_HOME = tempfile.mkdtemp(prefix="tasksnap-tests-")
+os.environ["HOME"] = DATA_HOME
+os.environ["USERPROFILE"] = DATA_HOME
+os.environ["LOCALAPPDATA"] = DATA_HOME
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,64 @@
+# tests/test_app_categories.py
+from datetime import date
+
+from views.app_identity import AppIdentityTable
+from views.category_matcher import APP_CATEGORIES, CategoryMatcher, linear_scan, usage_by_category
+from views.screen_time_journal import ScreenTimeJournal
+from views.tracker_core import TrackerCore
+
+# (title, process, seconds): browser tabs collapse into one app per browser
+SPANS = [
+    ("YouTube - Google Chrome", "chrome.exe", 300),
+    ("Facebook - Google Chrome", "chrome.exe", 120),
+    ("New Tab - Google Chrome", "chrome.exe", 60),
+    ("Netflix - Microsoft Edge", "msedge.exe", 600),
+    ("Slack | general | Acme", "slack.exe", 240),
+]
+
+
+def make_snapshot(tmp_path):
+    table = AppIdentityTable()
+    core = TrackerCore(table, ScreenTimeJournal(str(tmp_path / "journal.jsonl")), date(2024, 1, 1))
+    start_ms = 0
+    for title, process, seconds in SPANS:
+        core.add_app_time(title, process, start_ms, seconds * 1000)
+        start_ms += seconds * 1000
+    core.publish()
+    return table, core.snapshot
+
+
+def test_browser_tabs_keep_their_baseline_categories(tmp_path):
+    table, snapshot = make_snapshot(tmp_path)
+    totals, app_categories = usage_by_category(snapshot.app_times, snapshot.app_titles, table.name,
+                                               CategoryMatcher(APP_CATEGORIES).categorize)
+
+    # The same totals the baseline got by categorizing every title with the keyword scan
+    expected = {}
+    for title, _, seconds in SPANS:
+        category = linear_scan(APP_CATEGORIES, title)
+        expected[category] = expected.get(category, 0) + seconds * 1000
+    assert totals == expected
+    assert totals == {"Learning": 300000, "Social Media": 120000, "Browsing": 60000,
+                      "Entertainment": 600000, "Work": 240000}
+    assert app_categories == {"Google Chrome": "Learning", "Microsoft Edge": "Entertainment", "Slack": "Work"}
+
+
+def test_time_without_titles_is_judged_by_app_name(tmp_path):
+    table = AppIdentityTable()
+    excel = table.intern("Budget - Excel")
+    totals, app_categories = usage_by_category({excel: 5000}, {excel: {"Budget - Excel": 2000}}, table.name,
+                                               CategoryMatcher(APP_CATEGORIES).categorize)
+    assert totals == {"Work": 5000}
+    assert app_categories == {"Excel": "Work"}
+
+
+def test_pipe_separated_titles_keep_the_app():
+    from views.app_identity import normalize_app
+    assert normalize_app("Slack | general | Acme") == ("", "Slack | general | Acme")
+    assert normalize_app("Slack | general | Acme", "slack.exe") == ("slack.exe", "Slack")
+    assert normalize_app("Home | Wiki - Notes | Draft - Word") == ("", "Word")
+    assert normalize_app("main.py - proj - Visual Studio Code") == ("", "Visual Studio Code")
+
+    table = AppIdentityTable()
+    assert table.name(table.intern("Slack | general | Acme")) != "Acme"
+    assert CategoryMatcher(APP_CATEGORIES).categorize(table.name(table.intern("Slack | general | Acme"))) == "Work"
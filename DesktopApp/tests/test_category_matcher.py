@@ -0,0 +1,59 @@
+# tests/test_category_matcher.py
+import itertools
+import os
+import time
+
+from views.category_matcher import APP_CATEGORIES, CategoryMatcher, linear_scan
+
+
+def test_overlapping_keywords_match_the_linear_scan():
+    matcher = CategoryMatcher(APP_CATEGORIES)
+    # "brave" (Browsing) ends where "excel" (Work, higher priority) begins
+    assert matcher.categorize("bravexcel") == linear_scan(APP_CATEGORIES, "bravexcel") == "Work"
+
+
+def test_parity_over_overlapping_titles():
+    matcher = CategoryMatcher(APP_CATEGORIES)
+    keywords = [k for keywords in APP_CATEGORIES.values() for k in keywords]
+    titles = []
+    for first, second in itertools.permutations(keywords, 2):
+        # Share one, two or three characters between the keywords, plus plain concatenation
+        for overlap in range(4):
+            titles.append(first + second[overlap:])
+            titles.append(f"Report - {first[:-1]}{second} - Draft")
+    mismatches = [title for title in titles if matcher.categorize(title) != linear_scan(APP_CATEGORIES, title)]
+    assert mismatches == []
+
+
+def test_user_rules_win_and_reload(tmp_path):
+    rules = tmp_path / "rules.json"
+    rules.write_text('{"Focus": ["excel"]}', encoding="utf-8")
+    matcher = CategoryMatcher(APP_CATEGORIES, rules_file=str(rules))
+    assert matcher.categorize("Budget - Excel") == "Focus"
+    assert matcher.categorize("Unknown window") == "Other"
+
+    rules.write_text('{"Planning": ["budget"]}', encoding="utf-8")
+    mtime = os.path.getmtime(rules) + 10
+    os.utime(rules, (mtime, mtime))
+    matcher.maybe_reload(force=True)
+    # The cached "Focus" answer is gone along with the old rule
+    assert matcher.categorize("Budget - Excel") == "Planning"
+    assert matcher.categorize("Report - Excel") == "Work"
+
+
+def test_uncached_match_is_no_slower_than_the_linear_scan():
+    matcher = CategoryMatcher(APP_CATEGORIES)
+    keywords = [k for keywords in APP_CATEGORIES.values() for k in keywords] + ["unknown app"]
+    titles = [f"Document {i} - {keywords[i % len(keywords)].title()}" for i in range(2000)]
+
+    def best_of(lookup, rounds=5):
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for title in titles:
+                lookup(title)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    assert [matcher._match(title) for title in titles] == [linear_scan(APP_CATEGORIES, title) for title in titles]
+    assert best_of(matcher._match) <= best_of(lambda title: linear_scan(APP_CATEGORIES, title))
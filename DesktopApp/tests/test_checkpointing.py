@@ -0,0 +1,63 @@
+# tests/test_checkpointing.py
+import os
+from datetime import date, datetime, time as dtime
+
+from views.data_store import DataStore
+from views.durations import to_ms
+from views.focus_tracker import ScriptedFocusSource
+from views.idle_detector import ActivitySource
+from views.screen_time_tracker import ScreenTimeTracker
+
+MINUTE = 60.0
+
+
+def make_tracker(tmp_path):
+    return ScreenTimeTracker(history_folder=str(tmp_path / "ScreenTime"), journal_file=str(tmp_path / "journal.jsonl"),
+                             legacy_file=str(tmp_path / "legacy.json"),
+                             store=DataStore(str(tmp_path / "tasksnap.db")))
+
+
+def run_scripted(tracker, timeline, minutes, checkpoint_minutes):
+    """Samples a scripted timeline (today, from 01:00) for `minutes` on the calling thread."""
+    source = ScriptedFocusSource(timeline, wall_start=datetime.combine(date.today(), dtime(1, 0)).timestamp())
+    source.start()
+    tracker.attach_sources(source, ActivitySource(), {"Checkpoint Minutes": str(checkpoint_minutes)})
+    tracker.focus_tracker.run(lambda: source.clock() < minutes * MINUTE, tracker.record_focus_span)
+    return source
+
+
+def test_checkpoints_follow_the_configured_cadence(tmp_path):
+    tracker = make_tracker(tmp_path)
+    try:
+        run_scripted(tracker, [(0, "Editor")], minutes=30, checkpoint_minutes=5)
+        assert tracker.journal.compact_interval == 5 * MINUTE
+        # One checkpoint per 5 scripted minutes, each covering the journal up to it
+        assert tracker.history_version == 6
+        assert tracker.history.journal_seq() == tracker.snapshot.journal_seq
+        saved = tracker.history.get_day(date.today())
+        assert saved["usage"]["Editor"] >= 25 * MINUTE
+    finally:
+        tracker.stop()
+
+
+def test_crash_resumes_from_checkpoint_plus_journal_tail(tmp_path):
+    tracker = make_tracker(tmp_path)
+    run_scripted(tracker, [(0, "Editor"), (4 * MINUTE, "Browser")], minutes=7, checkpoint_minutes=2)
+    before_crash = tracker.snapshot
+    checkpointed = tracker.history.get_day(date.today())
+    # The periodic flush has run; then the process dies without stop() or a final save
+    tracker.journal.flush()
+    tracker.lock.release()
+
+    assert checkpointed["usage"]["Browser"] < before_crash.app_times[tracker.app_table.intern("Browser")] / 1000
+    assert os.path.getsize(str(tmp_path / "journal.jsonl")) > 0
+
+    resumed = make_tracker(tmp_path)
+    try:
+        named = {resumed.app_table.name(app_id): ms for app_id, ms in resumed.snapshot.app_times.items()}
+        assert named == {"Editor": to_ms(4 * MINUTE), "Browser": to_ms(3 * MINUTE)}
+        # The replayed tail is folded into history and the journal compacted behind it
+        assert resumed.history.get_day(date.today())["usage"] == {"Editor": 4 * MINUTE, "Browser": 3 * MINUTE}
+        assert list(resumed.journal.read_intervals(since_seq=resumed.history.journal_seq())) == []
+    finally:
+        resumed.stop()
@@ -0,0 +1,76 @@
+# tests/test_daily_rollups.py
+from datetime import date, timedelta
+
+from views.daily_rollups import DailyRollupCache
+
+TODAY = date(2024, 5, 10)
+
+
+def entry(day, seconds, stamp):
+    return {"date": str(day), "usage": {"Editor": seconds}, "break_time": 0, "last_timestamp": stamp}
+
+
+class FakeHistory:
+    def __init__(self, days=90):
+        self.entries = {str(TODAY - timedelta(days=n)): entry(TODAY - timedelta(days=n), 100 + n, 1.0)
+                        for n in range(days)}
+        self.range_calls = 0
+
+    def range(self, start, end):
+        self.range_calls += 1
+        return [self.entries[day] for day in sorted(self.entries) if str(start) <= day <= str(end)]
+
+    def recent(self, today, days=7):
+        return [self.entries[str(today - timedelta(days=n))] for n in range(days - 1, -1, -1)
+                if str(today - timedelta(days=n)) in self.entries]
+
+
+def test_checkpoint_resums_only_todays_row():
+    history = FakeHistory()
+    cache = DailyRollupCache(history.range)
+    cache.sync(history.recent(TODAY), 1, TODAY)
+    cache.series(30, TODAY, 0)
+    summed = cache.days_summed
+
+    for version, stamp in ((2, 2.0), (3, 3.0), (4, 4.0)):
+        history.entries[str(TODAY)] = entry(TODAY, 500 + version, stamp)
+        cache.sync(history.recent(TODAY), version, TODAY)
+    assert cache.days_summed == summed + 3
+    assert cache.rebuilds == 0
+    assert cache.series(30, TODAY, 0)[-2] == (TODAY - timedelta(days=1), 101)
+
+
+def test_rollover_rebuilds_and_picks_up_yesterdays_final_total():
+    history = FakeHistory()
+    cache = DailyRollupCache(history.range)
+    cache.sync(history.recent(TODAY), 1, TODAY)
+    cache.series(7, TODAY, 0)
+
+    tomorrow = TODAY + timedelta(days=1)
+    history.entries[str(TODAY)] = entry(TODAY, 900, 5.0)
+    cache.sync(history.recent(tomorrow), 2, tomorrow)
+    assert cache.rebuilds == 1
+    assert cache.series(7, tomorrow, 0)[-2] == (TODAY, 900)
+
+
+def test_older_row_changing_rebuilds_everything():
+    history = FakeHistory()
+    cache = DailyRollupCache(history.range)
+    cache.sync(history.recent(TODAY), 1, TODAY)
+    cache.series(30, TODAY, 0)
+
+    # e.g. an import or journal recovery rewrote a day from last week
+    old_day = TODAY - timedelta(days=4)
+    history.entries[str(old_day)] = entry(old_day, 7000, 9.0)
+    cache.sync(history.recent(TODAY), 2, TODAY)
+    assert cache.rebuilds == 1
+    assert dict(cache.series(30, TODAY, 0))[old_day] == 7000
+
+
+def test_unchanged_version_does_nothing():
+    history = FakeHistory()
+    cache = DailyRollupCache(history.range)
+    cache.sync(history.recent(TODAY), 1, TODAY)
+    summed = cache.days_summed
+    cache.sync(history.recent(TODAY), 1, TODAY)
+    assert cache.days_summed == summed
@@ -0,0 +1,53 @@
+# tests/test_data_utils.py
+import os
+import subprocess
+import sys
+
+from views import data_utils
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_tracker_daemon_does_not_import_tk():
+    script = "import sys, views.tracker_daemon; print(any(m.split('.')[0] == 'tkinter' for m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", script], cwd=APP_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+
+def test_errors_go_to_the_registered_reporter(tmp_path, capsys):
+    reported = []
+    data_utils.set_error_reporter(lambda title, message: reported.append(title))
+    try:
+        data_utils.write_config({"User Email": "a@b.c"}, str(tmp_path / "missing" / "nested" / "\0config.csv"))
+    finally:
+        data_utils.set_error_reporter(None)
+    assert reported == ["Config Error"]
+
+    data_utils.report_error("Config Error", "disk full")
+    assert "Config Error: disk full" in capsys.readouterr().out
+
+
+def test_concurrent_atomic_writes_never_collide(tmp_path):
+    import threading
+    path = str(tmp_path / "shared.json")
+    payloads = [f'{{"writer": {n}, "pad": "{"x" * 4096}"}}' for n in range(8)]
+    errors = []
+
+    def write(text):
+        try:
+            for _ in range(25):
+                data_utils.write_text_atomic(path, text)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(text,)) for text in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    # The file is one writer's complete payload, matching its checksum
+    assert data_utils.read_text_verified(path) in payloads
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
@@ -0,0 +1,41 @@
+# tests/test_durations.py
+import random
+
+from views.durations import to_ms, to_seconds, totals_to_seconds
+
+EPOCH_MS = 1_700_000_000_000
+
+
+def random_ms(rng):
+    # Short spans, whole days, and epoch timestamps
+    return rng.choice([rng.randrange(0, 10_000), rng.randrange(0, 86_400_000), EPOCH_MS + rng.randrange(0, 10**10)])
+
+
+def test_ms_round_trip_through_seconds_is_exact():
+    rng = random.Random(14)
+    for _ in range(20_000):
+        ms = random_ms(rng)
+        assert to_ms(to_seconds(ms)) == ms
+
+
+def test_seconds_round_trip_to_the_nearest_ms():
+    rng = random.Random(15)
+    for _ in range(20_000):
+        seconds = rng.uniform(0, 2e9)
+        assert abs(to_seconds(to_ms(seconds)) - seconds) <= 0.0005 + 1e-6
+
+
+def test_spans_from_shared_boundaries_add_up_exactly():
+    rng = random.Random(16)
+    boundaries = [1_700_000_000.0]
+    for _ in range(50_000):
+        boundaries.append(boundaries[-1] + rng.uniform(0.001, 30.0))
+    spans = [to_ms(end) - to_ms(start) for start, end in zip(boundaries, boundaries[1:])]
+    assert sum(spans) == to_ms(boundaries[-1]) - to_ms(boundaries[0])
+
+
+def test_saved_seconds_reload_to_the_same_totals():
+    rng = random.Random(17)
+    totals = {f"app {i}": rng.randrange(0, 86_400_000) for i in range(200)}
+    reloaded = {app: to_ms(seconds) for app, seconds in totals_to_seconds(totals).items()}
+    assert reloaded == totals
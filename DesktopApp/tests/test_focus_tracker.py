@@ -0,0 +1,78 @@
+# tests/test_focus_tracker.py
+from views.durations import to_ms
+from views.focus_tracker import FocusTracker, ScriptedFocusSource
+
+HOUR = 3600.0
+
+
+def track(source, until, heartbeat=5.0, suspend_gap=120.0):
+    """Runs a FocusTracker over `source` until its clock reaches `until`. Returns (per-title ms, suspended ms, tracker)."""
+    totals = {}
+    suspended = [0]
+
+    def on_span(title, process, elapsed_ms, suspended_ms):
+        totals[title] = totals.get(title, 0) + elapsed_ms
+        suspended[0] += suspended_ms
+
+    tracker = FocusTracker(source, heartbeat=heartbeat, suspend_gap=suspend_gap)
+    tracker.run(lambda: source.clock() < until, on_span)
+    return totals, suspended[0], tracker
+
+
+def test_spans_add_up_to_the_scripted_timeline():
+    timeline = [(0, "Editor"), (125.5, "Browser"), (400.25, "Editor"), (401, None), (900, "Mail")]
+    source = ScriptedFocusSource(timeline, start_time=1000.0)
+    source.start()
+    totals, suspended, _ = track(source, 1000.0 + HOUR)
+
+    assert totals == {
+        "Editor": to_ms(125.5) + to_ms(0.75),
+        "Browser": to_ms(400.25 - 125.5),
+        None: to_ms(900 - 401),
+        "Mail": to_ms(HOUR - 900),
+    }
+    assert suspended == 0
+    assert sum(totals.values()) == to_ms(HOUR)
+
+
+def test_wakeups_scale_with_focus_changes_not_a_polling_rate():
+    source = ScriptedFocusSource([(0, "Editor"), (1800, "Browser")])
+    source.start()
+    track(source, HOUR, heartbeat=5.0)
+    # One wakeup per heartbeat plus one per change, nowhere near 10 ms polling
+    assert source.wakeups_per_hour() <= HOUR / 5.0 + 2
+
+
+def test_suspend_is_reported_separately_not_attributed():
+    source = ScriptedFocusSource([(0, "Editor")], suspends=[(602, 2 * HOUR)])
+    source.start()
+    totals, suspended, tracker = track(source, 3 * HOUR)
+
+    assert tracker.suspends == 1
+    assert totals["Editor"] + suspended == to_ms(source.clock())
+    # The span cut short by the suspend is credited with at most one heartbeat
+    assert to_ms(HOUR) - to_ms(5.0) <= totals["Editor"] <= to_ms(HOUR) + to_ms(5.0)
+
+
+def test_wall_clock_jumps_do_not_change_span_lengths():
+    source = ScriptedFocusSource([(0, "Editor"), (600, "Browser")],
+                                 clock_jumps=[(100, -HOUR), (700, 2 * HOUR)], wall_start=1_700_000_000.0)
+    source.start()
+    totals, suspended, tracker = track(source, 1200.0)
+
+    assert totals == {"Editor": to_ms(600), "Browser": to_ms(600)}
+    assert suspended == 0 and tracker.suspends == 0
+
+
+def test_split_gap_attributes_at_most_one_heartbeat_of_a_long_span():
+    tracker = FocusTracker(ScriptedFocusSource([]), heartbeat=5.0, suspend_gap=120.0)
+    # Within the gap: all attributed
+    assert tracker.split_gap(to_ms(119.999), 5.0) == (to_ms(119.999), 0)
+    assert tracker.split_gap(to_ms(120.0), 5.0) == (to_ms(120.0), 0)
+    # Beyond it: one heartbeat attributed, the rest suspended
+    assert tracker.split_gap(to_ms(120.001), 5.0) == (to_ms(5.0), to_ms(115.001))
+    assert tracker.split_gap(to_ms(8 * HOUR), 30.0) == (to_ms(30.0), to_ms(8 * HOUR - 30.0))
+    assert tracker.suspends == 2
+    # A clock that went backwards attributes nothing
+    assert tracker.split_gap(-1, 5.0) == (0, 0)
+    assert tracker.split_gap(0, 5.0) == (0, 0)
@@ -0,0 +1,96 @@
+# tests/test_idle_detector.py
+from datetime import date, datetime, time as dtime
+
+from views.data_store import DataStore
+from views.durations import to_ms
+from views.focus_tracker import ScriptedFocusSource
+from views.idle_detector import IdleDetector, ScriptedActivitySource
+from views.screen_time_tracker import ScreenTimeTracker
+
+MINUTE = 60.0
+THRESHOLD = 5 * MINUTE
+
+
+def detector_at(now, input_times):
+    clock = [now]
+    return IdleDetector(ScriptedActivitySource(input_times, clock=lambda: clock[0]), threshold=THRESHOLD), clock
+
+
+def test_split_cuts_a_span_where_the_threshold_is_crossed():
+    # Last input at 0; a 60 s span ending at 330 s crosses the threshold at 300 s
+    detector, _ = detector_at(330.0, [0.0])
+    assert detector.split(60.0) == (30.0, 30.0)
+    assert detector.is_idle
+
+
+def test_split_of_a_span_that_is_entirely_idle():
+    detector, clock = detector_at(400.0, [0.0])
+    detector.split(30.0)
+    clock[0] = 430.0
+    assert detector.split(30.0) == (0.0, 30.0)
+
+
+def test_split_when_the_user_comes_back():
+    detector, clock = detector_at(400.0, [0.0, 420.0])
+    detector.split(30.0)
+    clock[0] = 430.0
+    # Idle until the input at 420 s, active after it
+    assert detector.split(30.0) == (10.0, 20.0)
+    assert not detector.is_idle
+
+
+def run_tracker(tmp_path, input_offsets, minutes, suspends=()):
+    """Tracks 'Editor' for `minutes` scripted minutes with input at the given offsets (seconds)."""
+    tracker = ScreenTimeTracker(history_folder=str(tmp_path / "ScreenTime"),
+                                journal_file=str(tmp_path / "journal.jsonl"),
+                                legacy_file=str(tmp_path / "legacy.json"),
+                                store=DataStore(str(tmp_path / "tasksnap.db")))
+    wall_start = datetime.combine(date.today(), dtime(1, 0)).timestamp()
+    source = ScriptedFocusSource([(0, "Editor")], suspends=suspends, wall_start=wall_start)
+    source.start()
+    activity = ScriptedActivitySource([wall_start + offset for offset in input_offsets], clock=source.wall_clock)
+    tracker.attach_sources(source, activity, {"Idle Threshold Minutes": str(THRESHOLD / MINUTE)})
+    tracker.focus_tracker.run(lambda: source.clock() < minutes * MINUTE, tracker.record_focus_span)
+    return tracker, source
+
+
+def test_span_crossing_the_idle_threshold_is_split(tmp_path):
+    tracker, source = run_tracker(tmp_path, [0], minutes=8)
+    try:
+        snapshot = tracker.snapshot
+        # Active until the threshold is crossed, idle after, and nothing lost in between
+        assert sum(snapshot.app_times.values()) == to_ms(THRESHOLD)
+        assert snapshot.idle_time == to_ms(source.clock()) - to_ms(THRESHOLD)
+        assert snapshot.continuous_work_time == 0
+        assert tracker.focus_tracker.low_power
+    finally:
+        tracker.stop()
+
+
+def test_span_that_is_entirely_idle_goes_to_idle(tmp_path):
+    tracker, _ = run_tracker(tmp_path, [0], minutes=8)
+    try:
+        app_before, idle_before = sum(tracker.snapshot.app_times.values()), tracker.snapshot.idle_time
+        # One more low-power heartbeat with nobody at the desk
+        span_ms = to_ms(tracker.focus_tracker.heartbeat)
+        tracker.focus_source.advance(tracker.focus_tracker.heartbeat)
+        tracker.record_focus_span("Editor", None, span_ms)
+        assert sum(tracker.snapshot.app_times.values()) == app_before
+        assert tracker.snapshot.idle_time == idle_before + span_ms
+    finally:
+        tracker.stop()
+
+
+def test_suspend_gap_lands_in_suspended_time_not_idle(tmp_path):
+    # Typing every 10 s, except while the machine sleeps for an hour after 3 minutes
+    inputs = [t for t in range(0, 5 * 60 * 60, 10) if not 180 <= t < 180 + 3600]
+    tracker, source = run_tracker(tmp_path, inputs, minutes=70, suspends=[(180, 3600)])
+    try:
+        snapshot = tracker.snapshot
+        assert tracker.focus_tracker.suspends == 1
+        assert to_ms(3600) - to_ms(5.0) <= snapshot.suspended_time <= to_ms(3600)
+        # At most the heartbeat that woke from sleep is counted as idle
+        assert snapshot.idle_time <= to_ms(5.0)
+        assert sum(snapshot.app_times.values()) + snapshot.idle_time + snapshot.suspended_time == to_ms(source.clock())
+    finally:
+        tracker.stop()
@@ -0,0 +1,110 @@
+# tests/test_outbound_queue.py
+import smtplib
+import threading
+
+import pytest
+
+from views.outbound_queue import (KIND_EMAIL, LocalBackend, OutboundQueue, PermanentJobError, _email_result,
+                                  backoff_delay)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_queue(tmp_path, backend, **options):
+    clock = Clock()
+    return OutboundQueue(folder=str(tmp_path / "Outbox"), backends={KIND_EMAIL: backend}, clock=clock, **options), clock
+
+
+def run_all(queue, clock, rounds=50):
+    for _ in range(rounds):
+        queue.run_due()
+        if not queue.pending():
+            return
+        clock.now = queue.pending()[0]["next_attempt_at"]
+
+
+def test_backoff_doubles_up_to_the_cap():
+    assert [backoff_delay(n) for n in (1, 2, 3)] == [5, 10, 20]
+    assert backoff_delay(100) == 30 * 60
+
+
+def test_retryable_failures_stop_at_max_attempts_and_are_dead_lettered(tmp_path):
+    backend = LocalBackend(fail_times=100)
+    queue, clock = make_queue(tmp_path, backend, max_attempts=4)
+    results = []
+    queue.enqueue(KIND_EMAIL, {"month": "05-2024"}, key="email-05-2024", on_result=lambda *r: results.append(r))
+
+    run_all(queue, clock)
+    assert len(backend.calls) == 4
+    assert queue.pending() == []
+    [failed] = queue.dead_letters()
+    assert failed["attempts"] == 4 and "offline" in failed["last_error"]
+    assert results == [(False, "ConnectionError: Local backend offline", True)]
+    # Dead letters are not picked up again on restart
+    assert OutboundQueue(folder=queue.folder, backends={}).pending() == []
+
+
+def test_permanent_failures_are_dead_lettered_at_once(tmp_path):
+    backend = LocalBackend(fail_times=1, permanent=True)
+    queue, clock = make_queue(tmp_path, backend)
+    queue.enqueue(KIND_EMAIL, {"month": "05-2024"})
+    run_all(queue, clock)
+    assert len(backend.calls) == 1
+    assert len(queue.dead_letters()) == 1
+
+
+@pytest.mark.parametrize("error, permanent", [
+    (smtplib.SMTPAuthenticationError(535, b"bad credentials"), True),
+    (smtplib.SMTPRecipientsRefused({"a@b": (550, b"no such user")}), True),
+    (smtplib.SMTPDataError(554, b"rejected"), True),
+    (smtplib.SMTPDataError(451, b"try later"), False),
+    (smtplib.SMTPServerDisconnected("gone"), False),
+    (ConnectionRefusedError("offline"), False),
+    (ValueError("Manager or User email is missing"), True),
+])
+def test_email_failures_are_classified(error, permanent):
+    with pytest.raises(PermanentJobError if permanent else type(error)):
+        _email_result(error)
+
+
+def test_report_emails_are_deduplicated(tmp_path):
+    backend = LocalBackend()
+    queue, clock = make_queue(tmp_path, backend)
+    first = queue.enqueue(KIND_EMAIL, {"month": "05-2024"}, key="email-05-2024", replace=False)
+    second = queue.enqueue(KIND_EMAIL, {"month": "05-2024"}, key="email-05-2024", replace=False)
+    assert first == second
+    run_all(queue, clock)
+    assert len(backend.delivered) == 1
+
+
+def test_a_job_is_never_sent_twice_at_once(tmp_path):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_backend(payload):
+        calls.append(payload)
+        started.set()
+        release.wait(5)
+        return "Delivered"
+
+    queue, clock = make_queue(tmp_path, slow_backend)
+    queue.enqueue(KIND_EMAIL, {"month": "05-2024"}, key="email-05-2024")
+    [job] = queue.pending()
+    worker = threading.Thread(target=queue.run_job, args=(job,))
+    worker.start()
+    assert started.wait(5)
+    # The worker has it claimed: run_due and a second run_job both skip it
+    assert queue.run_due() == 0
+    assert queue.run_job(job) is False
+    release.set()
+    worker.join(5)
+    # Already sent: running the stale job again does nothing
+    assert queue.run_job(job) is False
+    assert len(calls) == 1
@@ -0,0 +1,33 @@
+# tests/test_productivity_save.py
+import statistics
+
+from views.data_store import DataStore
+from views.outbound_queue import OutboundQueue
+from views.productivity_save import SAVE_LATENCY_BUDGET_MS, commit_and_publish
+
+MONTH = "05-2024"
+INCREMENTS = {"QA": {"Simple": 2, "Complex": 1}, "Incident": {"Medium": 3}}
+
+
+def test_save_commits_locally_and_queues_the_publish(tmp_path):
+    store = DataStore(str(tmp_path / "tasksnap.db"))
+    queue = OutboundQueue(folder=str(tmp_path / "Outbox"))
+
+    commit_and_publish(INCREMENTS, month=MONTH, store=store, queue=queue)
+    commit_and_publish(INCREMENTS, month=MONTH, store=store, queue=queue)
+
+    rows = store.productivity_rows(MONTH)
+    assert [row["Category"] for row in rows] == ["QA", "Package", "Incident", "PRF Creations"]
+    assert rows[0] == {"Category": "QA", "Simple": 4, "Medium": 0, "Complex": 2}
+    assert rows[2] == {"Category": "Incident", "Simple": 0, "Medium": 6, "Complex": 0}
+    # Repeat saves supersede the waiting publish for the month
+    assert [job["payload"] for job in queue.pending()] == [{"month": MONTH}]
+
+
+def test_save_stays_within_the_latency_budget(tmp_path):
+    store = DataStore(str(tmp_path / "tasksnap.db"))
+    queue = OutboundQueue(folder=str(tmp_path / "Outbox"))
+    commit_and_publish(INCREMENTS, month=MONTH, store=store, queue=queue)  # warm-up
+
+    timings = [commit_and_publish(INCREMENTS, month=MONTH, store=store, queue=queue) for _ in range(20)]
+    assert statistics.median(timings) < SAVE_LATENCY_BUDGET_MS
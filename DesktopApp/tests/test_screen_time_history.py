@@ -0,0 +1,96 @@
+# tests/test_screen_time_history.py
+import json
+import os
+
+from views.data_store import DataStore
+from views.data_utils import write_text_atomic
+from views.screen_time_history import ScreenTimeHistory
+from views.screen_time_journal import ScreenTimeJournal
+
+
+def make_history(tmp_path):
+    return ScreenTimeHistory(DataStore(str(tmp_path / "tasksnap.db")), str(tmp_path / "ScreenTime"))
+
+
+def test_save_day_replaces_one_row_and_keeps_the_highest_seq(tmp_path):
+    history = make_history(tmp_path)
+    history.save_day({"date": "2024-05-01", "usage": {"Editor": 60}, "break_time": 0, "idle_time": 0}, 7)
+    history.save_day({"date": "2024-05-02", "usage": {"Browser": 30}, "break_time": 5, "idle_time": 0}, 9)
+    history.save_day({"date": "2024-05-01", "usage": {"Editor": 90}, "break_time": 0, "idle_time": 0}, 3)
+
+    assert history.get_day("2024-05-01")["usage"] == {"Editor": 90}
+    assert [entry["date"] for entry in history.range("2024-04-30", "2024-05-02")] == ["2024-05-01", "2024-05-02"]
+    assert history.range("2024-05-02", "2024-05-31")[0]["break_time"] == 5
+    assert history.journal_seq() == 9
+
+
+def test_monthly_files_and_legacy_file_are_migrated_once(tmp_path):
+    folder = tmp_path / "ScreenTime"
+    os.makedirs(folder)
+    write_text_atomic(str(folder / "screen_time_04-2024.json"), json.dumps(
+        {"journal_seq": 41, "days": {"2024-04-30": {"usage": {"Editor": 120}, "break_time": 0, "idle_time": 0}}}))
+    legacy = tmp_path / "screen_time_data.json"
+    legacy.write_text(json.dumps([
+        {"date": "2024-04-30", "usage": {"Editor": 1}, "break_time": 0, "idle_time": 0},
+        {"date": "2024-04-29", "usage": {"Browser": 15}, "break_time": 0, "idle_time": 0},
+    ]))
+    history = make_history(tmp_path)
+
+    assert history.import_legacy(str(legacy)) == 2
+    # The monthly file wins over the older rolling file for the same day
+    assert history.get_day("2024-04-30")["usage"] == {"Editor": 120}
+    assert history.get_day("2024-04-29")["usage"] == {"Browser": 15}
+    assert history.journal_seq() == 41
+    assert os.path.exists(str(folder / "screen_time_04-2024.json.migrated"))
+    assert os.path.exists(str(legacy) + ".migrated")
+    assert history.import_legacy(str(legacy)) == 0
+
+
+def test_compaction_archives_dropped_intervals(tmp_path):
+    history = make_history(tmp_path)
+    journal = ScreenTimeJournal(str(tmp_path / "journal.jsonl"), archive=history.archive_intervals)
+    first = journal.append(1000.0, 1060.0, "Editor")
+    journal.append(1060.0, 1090.0, None, "idle")
+    last = journal.append(1090.0, 1100.0, "Browser")
+
+    journal.compact(last - 1)
+    assert history.intervals(0, 2000) == [(1000.0, 1060.0, "Editor", "app"), (1060.0, 1090.0, None, "idle")]
+    assert [app for _, _, app, _ in journal.read_intervals()] == ["Browser"]
+
+    # Archiving is idempotent, and range queries only return overlapping intervals
+    history.archive_intervals([(first, 1000.0, 1060.0, "Editor", "app")])
+    journal.compact(last)
+    assert [app for _, _, app, _ in history.intervals(1050, 2000)] == ["Editor", None, "Browser"]
+    assert history.intervals(1095, 2000) == [(1090.0, 1100.0, "Browser", "app")]
+
+
+def test_failed_archive_keeps_the_journal(tmp_path):
+    def archive(records):
+        raise OSError("disk full")
+
+    journal = ScreenTimeJournal(str(tmp_path / "journal.jsonl"), archive=archive)
+    last = journal.append(1000.0, 1060.0, "Editor")
+    journal.compact(last)
+    assert list(journal.read_intervals()) == [(1000.0, 1060.0, "Editor", "app")]
+
+
+def test_recovered_titles_are_merged_into_the_day(tmp_path):
+    from datetime import datetime
+    history = make_history(tmp_path)
+    start = datetime(2024, 5, 1, 9).timestamp()
+    history.save_day({"date": "2024-05-01", "usage": {"Outlook": 60}, "titles": {"Outlook": {"Inbox - Outlook": 60}},
+                      "break_time": 0, "idle_time": 0}, 0)
+    journal = ScreenTimeJournal(str(tmp_path / "journal.jsonl"))
+    journal.append(start, start + 30, "Outlook", title="Inbox - Outlook")
+    journal.append(start + 30, start + 45, "Outlook", title="Calendar - Outlook")
+    journal.append(start + 45, start + 50, "Outlook")
+    journal.flush()
+
+    day = journal.replay()["2024-05-01"]
+    assert day["titles"] == {"Outlook": {"Inbox - Outlook": 30, "Calendar - Outlook": 15, "Outlook": 5}}
+    history.merge_day("2024-05-01", day["usage"], day["break_time"], day["idle_time"], day["last_timestamp"],
+                      day["journal_seq"], day["suspended_time"], day["titles"])
+
+    entry = history.get_day("2024-05-01")
+    assert entry["usage"] == {"Outlook": 110}
+    assert entry["titles"] == {"Outlook": {"Inbox - Outlook": 90, "Calendar - Outlook": 15, "Outlook": 5}}
@@ -0,0 +1,36 @@
+# tests/test_screen_time_journal.py
+import threading
+import time
+
+from views.screen_time_journal import ScreenTimeJournal
+
+
+def test_append_is_not_blocked_while_compaction_archives(tmp_path):
+    archiving = threading.Event()
+    release = threading.Event()
+    archived = []
+
+    def slow_archive(records):
+        archiving.set()
+        # Stands in for a slow disk or a busy SQLite WAL
+        assert release.wait(5)
+        archived.extend(records)
+
+    journal = ScreenTimeJournal(str(tmp_path / "journal.jsonl"), flush_interval=0, archive=slow_archive)
+    covered = journal.append(1000.0, 1060.0, "Editor")
+    compaction = threading.Thread(target=journal.compact, args=(covered,))
+    compaction.start()
+    try:
+        assert archiving.wait(5)
+        started = time.perf_counter()
+        seqs = [journal.append(1060.0 + i, 1061.0 + i, "Browser") for i in range(100)]
+        journal.maybe_flush()   # skipped, not waited on, while the compaction owns the file
+        assert time.perf_counter() - started < 0.5
+        assert seqs == list(range(covered + 1, covered + 101))
+    finally:
+        release.set()
+        compaction.join(5)
+
+    assert [record[0] for record in archived] == [covered]
+    journal.flush()
+    assert [app for _, _, app, _ in journal.read_intervals()] == ["Browser"] * 100
@@ -0,0 +1,117 @@
+# tests/test_sheet_sync.py
+from views.sheet_sync import (FakeSpreadsheet, HEADER_FORMAT, PRODUCTIVITY_HEADER_ROWS, SCREEN_TIME_HEADERS,
+                              SCREEN_TIME_MIN_COLS, SheetIndex, sync_productivity_report, sync_screen_time)
+
+TIMESTAMP = "2024-05-01 13:45:10"
+
+
+def productivity_row(name, count=1):
+    return [name, TIMESTAMP] + [count] * 10 + [count * 10]
+
+
+def cell_values(spreadsheet):
+    """Every userEnteredValue sent so far."""
+    for body in spreadsheet.batches:
+        for request in body['requests']:
+            kind, payload = next(iter(request.items()))
+            for row in payload.get('rows', []):
+                for cell in row['values']:
+                    if 'userEnteredValue' in cell:
+                        yield cell['userEnteredValue'], cell.get('userEnteredFormat', {})
+
+
+# --- Productivity report ---
+
+def test_productivity_first_save_is_one_read_and_one_write():
+    spreadsheet = FakeSpreadsheet()
+    worksheet = spreadsheet.add_worksheet("Productivity Report - May 2024", rows=1, cols=1)
+    spreadsheet.round_trips = 0
+
+    assert sync_productivity_report(worksheet, productivity_row("Ann")) == 'appended'
+    assert spreadsheet.round_trips == 2
+    values = worksheet.get_all_values()
+    assert values[0] == PRODUCTIVITY_HEADER_ROWS[0]
+    assert values[2][:3] == ["Ann", TIMESTAMP, "1"]
+    assert len(worksheet.merges) == 7
+
+
+def test_productivity_resave_updates_the_employee_row_in_place():
+    spreadsheet = FakeSpreadsheet()
+    worksheet = spreadsheet.add_worksheet("Report", rows=1, cols=1)
+    sync_productivity_report(worksheet, productivity_row("Ann"))
+    sync_productivity_report(worksheet, productivity_row("Bob"))
+    spreadsheet.round_trips = 0
+
+    assert sync_productivity_report(worksheet, productivity_row("Ann", 2)) == 'updated'
+    assert spreadsheet.round_trips == 2
+    values = worksheet.get_all_values()
+    assert [row[0] for row in values[2:]] == ["Ann", "Bob"]
+    assert values[2][2] == "2"
+
+
+def test_values_are_sent_typed_like_user_entered():
+    spreadsheet = FakeSpreadsheet()
+    worksheet = spreadsheet.add_worksheet("Report", rows=1, cols=1)
+    sync_productivity_report(worksheet, productivity_row("Ann"))
+    sent = list(cell_values(spreadsheet))
+    timestamp_value, timestamp_format = next((value, fmt) for value, fmt in sent if fmt.get('numberFormat'))
+    assert 'numberValue' in timestamp_value
+    assert timestamp_format['numberFormat']['type'] == 'DATE_TIME'
+    assert ({'numberValue': 1}, {'horizontalAlignment': 'CENTER', 'verticalAlignment': 'MIDDLE'}) in sent
+    assert not any(value.get('stringValue') == TIMESTAMP for value, _ in sent)
+
+
+# --- Screen time report ---
+
+def upload(spreadsheet, worksheet, created, index, employee="Ann", day="5/1", value="1.5hrs"):
+    spreadsheet.round_trips = 0
+    sync_screen_time(worksheet, created, employee, day, value, TIMESTAMP, index)
+    return spreadsheet.round_trips
+
+
+def test_screen_time_uploads_cost_a_fixed_number_of_requests(tmp_path):
+    spreadsheet = FakeSpreadsheet()
+    worksheet = spreadsheet.add_worksheet("Screen Time Report", rows=1, cols=SCREEN_TIME_MIN_COLS)
+    index = SheetIndex(str(tmp_path / "index.json"))
+
+    # New sheet: headers, date column and row go out in one batch
+    assert upload(spreadsheet, worksheet, True, index) == 1
+    # Row placed by the server, so not in the index yet: one rebuild read, one write
+    assert upload(spreadsheet, worksheet, False, index, value="2hrs") == 2
+    # Known positions: one probe, one write, however large the sheet is
+    for employee in ["Bob", "Cy", "Di"]:
+        upload(spreadsheet, worksheet, False, index, employee=employee)
+        upload(spreadsheet, worksheet, False, index, employee=employee)
+    assert upload(spreadsheet, worksheet, False, index, value="3hrs") == 2
+
+    values = worksheet.get_all_values()
+    assert values[0][:3] == SCREEN_TIME_HEADERS + ["5/1"]
+    assert values[1][:3] == ["Ann", TIMESTAMP, "3hrs"]
+
+
+def test_new_date_column_gets_the_header_format(tmp_path):
+    spreadsheet = FakeSpreadsheet()
+    worksheet = spreadsheet.add_worksheet("Screen Time Report", rows=1, cols=SCREEN_TIME_MIN_COLS)
+    index = SheetIndex(str(tmp_path / "index.json"))
+    upload(spreadsheet, worksheet, True, index)
+    upload(spreadsheet, worksheet, False, index, day="5/2")
+
+    header = worksheet.get_all_values()[0]
+    col = header.index("5/2")
+    cell_format = worksheet.formats[(0, col)]
+    assert {key: cell_format[key] for key in HEADER_FORMAT} == HEADER_FORMAT
+    assert cell_format['numberFormat']['type'] == 'DATE'
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    spreadsheet = FakeSpreadsheet()
+    worksheet = spreadsheet.add_worksheet("Screen Time Report", rows=1, cols=SCREEN_TIME_MIN_COLS)
+    index = SheetIndex(str(tmp_path / "index.json"))
+    upload(spreadsheet, worksheet, True, index)
+    upload(spreadsheet, worksheet, False, index)
+    # Someone else moves rows around: Ann's cached row now holds another name
+    worksheet.cells[(1, 0)] = "Zed"
+
+    assert upload(spreadsheet, worksheet, False, index, value="4hrs") == 3
+    names = [row[0] for row in worksheet.get_all_values()[1:]]
+    assert names == ["Zed", "Ann"]
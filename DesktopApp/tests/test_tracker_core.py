@@ -0,0 +1,52 @@
+# tests/test_tracker_core.py
+from datetime import date
+
+from views.app_identity import AppIdentityTable
+from views.render_scheduler import RenderScheduler
+from views.screen_time_journal import ScreenTimeJournal
+from views.tracker_core import TrackerCore
+
+START_MS = 1_700_000_000_000
+
+
+def make_core(tmp_path):
+    return TrackerCore(AppIdentityTable(), ScreenTimeJournal(str(tmp_path / "journal.jsonl")), date(2024, 1, 1))
+
+
+def test_heartbeat_without_changes_keeps_usage_version(tmp_path):
+    core = make_core(tmp_path)
+    before = core.snapshot
+    core.set_continuous_work_time(0)
+    core.publish(1.0)
+    assert core.snapshot.version > before.version
+    assert core.snapshot.usage_version == before.usage_version
+
+
+def test_totals_bump_usage_version(tmp_path):
+    core = make_core(tmp_path)
+    versions = [core.snapshot.usage_version]
+    for add in (lambda: core.add_app_time("Editor", "code.exe", START_MS, 1000),
+                lambda: core.add_idle(START_MS + 1000, 500),
+                lambda: core.add_break(START_MS + 1500, 500)):
+        add()
+        core.publish()
+        versions.append(core.snapshot.usage_version)
+    assert versions == sorted(set(versions))
+
+
+def test_charts_keyed_on_usage_version_skip_idle_heartbeats(tmp_path):
+    core = make_core(tmp_path)
+    renders = []
+    scheduler = RenderScheduler(lambda: True)
+    scheduler.register("pie", lambda: renders.append(core.snapshot.version), lambda: core.snapshot.usage_version)
+    scheduler.run()
+    # A break: the sampler publishes every heartbeat but no total changes
+    for second in range(10):
+        core.set_continuous_work_time(0)
+        core.publish(float(second))
+        scheduler.run()
+    assert len(renders) == 1
+    core.add_app_time("Editor", "code.exe", START_MS, 1000)
+    core.publish()
+    scheduler.run()
+    assert len(renders) == 2
@@ -0,0 +1,55 @@
+# tests/test_tracker_lock.py
+import os
+
+import pytest
+
+from views.screen_time_tracker import ScreenTimeTracker
+from views.tracker_daemon import create_tracker
+from views.tracker_lock import TrackerLock, TrackerLockHeld
+
+
+def make_tracker(folder):
+    return ScreenTimeTracker(history_folder=os.path.join(folder, "ScreenTime"),
+                             journal_file=os.path.join(folder, "journal.jsonl"),
+                             legacy_file=os.path.join(folder, "legacy.json"))
+
+
+def test_lock_is_exclusive_until_released(tmp_path):
+    first = TrackerLock(str(tmp_path / "tracker.lock"))
+    second = TrackerLock(str(tmp_path / "tracker.lock"))
+    assert first.acquire()
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
+    second.release()
+
+
+def test_second_tracker_on_same_journal_is_refused(tmp_path):
+    tracker = make_tracker(str(tmp_path))
+    try:
+        with pytest.raises(TrackerLockHeld):
+            make_tracker(str(tmp_path))
+    finally:
+        tracker.stop()
+    # The lock goes with the tracker
+    make_tracker(str(tmp_path)).stop()
+
+
+def test_app_does_not_track_in_process_while_locked(tmp_path):
+    tracker = make_tracker(str(tmp_path))
+    try:
+        # No daemon address to connect to, and the lock is taken
+        with pytest.raises(TrackerLockHeld):
+            create_tracker(daemon_file=str(tmp_path / "daemon.json"), wait=0,
+                           tracker_factory=lambda: make_tracker(str(tmp_path)))
+    finally:
+        tracker.stop()
+
+
+def test_daemon_refuses_to_start_while_app_tracks():
+    from views.tracker_daemon import run_daemon
+    tracker = ScreenTimeTracker()
+    try:
+        assert run_daemon() == 1
+    finally:
+        tracker.stop()
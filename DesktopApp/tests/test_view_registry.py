@@ -0,0 +1,77 @@
+# tests/test_view_registry.py
+from views.view_registry import PREWARM_ORDER, ViewRegistry, prewarm_from_config
+
+
+class FakeWidget:
+    """Collects after()/after_idle() callbacks so a test can run Tk's idle slots one by one."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay_ms, callback):
+        self.scheduled.append(callback)
+
+    def after_idle(self, callback):
+        self.scheduled.append(callback)
+
+    def run_next(self):
+        self.scheduled.pop(0)()
+
+    def run_all(self):
+        while self.scheduled:
+            self.run_next()
+
+
+def make_registry(built):
+    registry = ViewRegistry()
+    for name in PREWARM_ORDER:
+        registry.register(name, lambda name=name: built.append(name) or f"<{name} view>")
+    return registry
+
+
+def test_views_are_built_on_first_access_only():
+    built = []
+    registry = make_registry(built)
+    assert built == []
+    assert registry.built("todo") is None
+    assert built == []
+
+    assert registry.get("todo") == "<todo view>"
+    assert registry.get("todo") == "<todo view>"
+    assert built == ["todo"]
+    assert registry.built("todo") == "<todo view>"
+    assert set(registry.build_ms) == {"todo"}
+
+
+def test_prewarm_builds_one_view_per_idle_slot_in_prewarm_order():
+    built = []
+    registry = make_registry(built)
+    registry.get("dashboard")   # the initial view is already shown
+    widget = FakeWidget()
+    registry.prewarm(widget, PREWARM_ORDER)
+    assert built == ["dashboard"]
+
+    widget.run_next()   # the startup delay
+    widget.run_next()   # first idle slot
+    assert built == ["dashboard", "screentime"]
+    widget.run_all()
+    assert built == ["dashboard"] + [name for name in PREWARM_ORDER if name != "dashboard"]
+    assert PREWARM_ORDER[0] == "screentime"
+
+
+def test_prewarm_skips_views_built_by_navigation_meanwhile():
+    built = []
+    registry = make_registry(built)
+    widget = FakeWidget()
+    registry.prewarm(widget, PREWARM_ORDER)
+    registry.get("productivity")
+    widget.run_all()
+    assert sorted(built) == sorted(PREWARM_ORDER)
+    assert built.count("productivity") == 1
+
+
+def test_prewarm_defaults_to_visible_starts_only():
+    assert prewarm_from_config({}) is True
+    assert prewarm_from_config({}, start_minimized=True) is False
+    assert prewarm_from_config({"Prewarm Views": "yes"}, start_minimized=True) is True
+    assert prewarm_from_config({"Prewarm Views": "off"}) is False
@@ -8,6 +8,7 @@ from datetime import datetime
 from PIL import Image, ImageTk
 import io
 from .data_utils import resource_path # Import resource_path for assets
+from .data_store import get_data_store, PRODUCTIVITY_COLUMNS
 from theme import Theme
 
 # Function to load PNG icon for window title bar
@@ -27,9 +28,9 @@ def load_png_icon(path):
 
 class EditableDataDialog(ctk.CTkToplevel):
     # --- CHANGE 1: Added update_callback argument ---
-    def __init__(self, master, csv_file_path, update_callback=None):
+    def __init__(self, master, month, update_callback=None):
         super().__init__(master)
-        self.csv_file_path = csv_file_path
+        self.month = month # 'MM-YYYY' key of the counts being edited
         self.update_callback = update_callback # Store the callback function
         self.title("Edit")
         self.iconbitmap("assets/TaskSnap.ico")
@@ -52,7 +53,7 @@ class EditableDataDialog(ctk.CTkToplevel):
         main_frame = ctk.CTkFrame(self)
         main_frame.pack(fill="both", expand=True, padx=20, pady=20)
 
-        data = self.read_csv_file()
+        data = self.read_month_data()
         if not data:
             self.destroy()
             return
@@ -81,21 +82,20 @@ class EditableDataDialog(ctk.CTkToplevel):
                                    fg_color=Theme.ACCENT_BLUE, hover_color=Theme.ACCENT_BLUE_HOVER, font=Theme.FONT_NORMAL)
         save_button.grid(row=len(data), column=0, columnspan=len(data[0]), pady=10)
 
-    def read_csv_file(self):
-        if not os.path.exists(self.csv_file_path):
+    def read_month_data(self):
+        """Header row plus one row per category, as shown in the grid."""
+        try:
+            rows = get_data_store().productivity_rows(self.month)
+        except Exception as e:
+            messagebox.showerror("Error Reading Data", f"Error reading productivity data: {e}")
+            return []
+        if not rows:
             messagebox.showwarning(
                 "No Data Found",
-                f"No saved productivity data is available for editing this month: {os.path.basename(self.csv_file_path)}"
+                f"No saved productivity data is available for editing this month: {self.month}"
             )
             return []
-            
-        try:
-            with open(self.csv_file_path, 'r', newline='') as file:
-                reader = csv.reader(file)
-                return list(reader)
-        except Exception as e:
-            messagebox.showerror("Error Reading File", f"Error reading CSV file: {e}")
-            return []
+        return [PRODUCTIVITY_COLUMNS] + [[row[column] for column in PRODUCTIVITY_COLUMNS] for row in rows]
 
     def save_changes(self):
         edited_data = []
@@ -117,9 +117,8 @@ class EditableDataDialog(ctk.CTkToplevel):
             edited_data.append(row_data)
 
         try:
-            with open(self.csv_file_path, 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerows(edited_data)
+            # Row 0 is the header
+            get_data_store().replace_productivity(self.month, edited_data[1:])
 
             # --- CHANGE 2: Call the callback function after successful local save ---
             if self.update_callback:
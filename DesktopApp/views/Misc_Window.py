@@ -7,6 +7,7 @@ from datetime import datetime
 from PIL import Image, ImageTk
 import io
 from .data_utils import resource_path # Import resource_path for assets
+from .data_store import get_data_store
 from theme import Theme
 
 # Function to load PNG icon for window title bar
@@ -25,9 +26,9 @@ def load_png_icon(path):
         return None
         
 class Misc_Window(ctk.CTkToplevel):
-    def __init__(self, master, misc_file):
+    def __init__(self, master, month):
         super().__init__(master)
-        self.misc_file = misc_file
+        self.month = month # 'MM-YYYY' key of the notes being edited
         self.title("Miscellaneous")
         self.iconbitmap("assets/TaskSnap.ico")
         self.geometry("700x600")
@@ -66,19 +67,15 @@ class Misc_Window(ctk.CTkToplevel):
 
     def load_text(self):
         try:
-            # Ensure folder exists
-            os.makedirs(os.path.dirname(self.misc_file), exist_ok=True)
-            with open(self.misc_file, 'r') as file:
-                existing_text = file.read()
-                return existing_text
-        except FileNotFoundError:
+            return get_data_store().misc_note(self.month)
+        except Exception as e:
+            print(f"Error loading miscellaneous tasks: {e}")
             return ''
 
     def save_text(self):
         text_to_save = self.text_edit.get("0.0", "end-1c") # Remove trailing newline from CTkTextbox
         try:
-            with open(self.misc_file, 'w') as file:
-                file.write(text_to_save)
+            get_data_store().save_misc_note(self.month, text_to_save)
             messagebox.showinfo("Success", "Changes saved successfully!")
             self.destroy()
         except Exception as e:
@@ -4,7 +4,9 @@ import smtplib
 from email.mime.text import MIMEText
 import pandas as pd
 from datetime import datetime
-from .data_utils import read_config, resource_path, CONFIG_FILE, TASK_DATA_FOLDER
+from .data_utils import resource_path, TASK_DATA_FOLDER
+from .config_service import get_config
+from .data_store import get_data_store, PRODUCTIVITY_COLUMNS
 
 
 # Get the current month and year for file naming and subject lines
@@ -17,7 +19,7 @@ class EmailSender:
     
     def read_manager_user_details(self):
         """Reads the manager's email, user's name, and user's email from the config file."""
-        config = read_config(CONFIG_FILE)
+        config = get_config()
         
         manager_email = config.get('Manager Email')
         user_firstname = config.get('User First Name')
@@ -25,14 +27,16 @@ class EmailSender:
 
         return manager_email, user_firstname, user_email
 
-    def format_report_details(self, task_file_path):
+    def format_report_details(self, month):
         """
-        Reads a CSV file, calculates a 'Total' column, and formats the data into an HTML table.
+        Reads a month's productivity counts, calculates a 'Total' column, and formats the data into an HTML table.
         Replaces NaN values with 0 before formatting.
         """
         try:
-            # Read the CSV file into a DataFrame
-            df = pd.read_csv(task_file_path)
+            rows = get_data_store().productivity_rows(month)
+            if not rows:
+                return "Productivity data file not found."
+            df = pd.DataFrame(rows, columns=PRODUCTIVITY_COLUMNS)
             
             # --- FIX 2: Replace NaN with 0 to prevent "NaN" strings in email ---
             numeric_cols = ['Simple', 'Medium', 'Complex']
@@ -56,39 +60,45 @@ class EmailSender:
             
             return css_style + html_table
         
-        except FileNotFoundError:
-            return "Productivity data file not found."
         except Exception as e:
             print(f"Error formatting report details: {e}")
             return f"Error generating report table: {e.__class__.__name__}"
 
 
-    def format_misc_task(self, misc_file_path):
-        """Reads the miscellaneous tasks from a text file and formats them for the email body."""
+    def format_misc_task(self, month):
+        """Reads a month's miscellaneous tasks and formats them for the email body."""
         try:
-            with open(misc_file_path, 'r') as f:
-                content = f.read()
-                # Format text content for HTML, preserving line breaks
-                html_content = content.replace('\n', '<br>')
-                return f"<p>{html_content}</p>"
-        except FileNotFoundError:
-            return "<p>No miscellaneous tasks recorded for this month.</p>"
+            content = get_data_store().misc_note(month)
+            if not content:
+                return "<p>No miscellaneous tasks recorded for this month.</p>"
+            # Format text content for HTML, preserving line breaks
+            html_content = content.replace('\n', '<br>')
+            return f"<p>{html_content}</p>"
         except Exception as e:
             return f"<p>Error reading miscellaneous tasks: {e}</p>"
 
 
-    def send_report_email(self, manager_email, user_firstname, user_email, report_details, misc_tasks_details):
-        """Connects to SMTP and sends the email."""
+    def send_report_email(self, manager_email, user_firstname, user_email, report_details, misc_tasks_details,
+                          raise_errors=False):
+        """
+        Connects to SMTP and sends the email. Returns True on success; with
+        `raise_errors`, failures raise (ValueError for missing details) instead
+        of returning False, so the outbound queue can tell what is worth retrying.
+        """
         # Constants for email credentials
         TASKSNAP_EMAIL = "tasksnapjournal@gmail.com"
         TASKSNAP_PASSWORD = "inxw gskm nqls grai"
         
         if not TASKSNAP_EMAIL or not TASKSNAP_PASSWORD:
             print("Email aborted: TaskSnap credentials missing from config.")
+            if raise_errors:
+                raise ValueError("TaskSnap email credentials are missing")
             return False
         
         if not manager_email or not user_email:
             print("Email aborted: Manager or User email missing.")
+            if raise_errors:
+                raise ValueError("Manager or User email is missing")
             return False
 
         try:
@@ -125,4 +135,6 @@ class EmailSender:
 
         except Exception as e:
             print(f"Error sending email: {e}")
+            if raise_errors:
+                raise
             return False
@@ -2,7 +2,6 @@
 from datetime import datetime
 import os
 import sys
-import re
 import pandas as pd
 import matplotlib.pyplot as plt
 import customtkinter as ctk
@@ -10,7 +9,8 @@ from tkinter import messagebox
 from PIL import Image, ImageTk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import mplcursors
-from .data_utils import resource_path 
+from .data_utils import resource_path
+from .data_store import get_data_store, PRODUCTIVITY_COLUMNS
 from theme import Theme
 
 def load_png_icon(path):
@@ -29,9 +29,8 @@ def load_png_icon(path):
 
 
 class MatplotlibPlotter(ctk.CTkToplevel):
-    def __init__(self, directory_path, master=None):
+    def __init__(self, master=None):
         super().__init__(master)
-        self.directory_path = directory_path
         self.title("Summary")
         self.iconbitmap("assets/TaskSnap.ico")
         self.geometry("700x500")
@@ -69,55 +68,44 @@ class MatplotlibPlotter(ctk.CTkToplevel):
 
     def load_and_combine_data(self):
         all_data = []
-        # Expected column structure for reading all CSV files consistently
-        EXPECTED_COLS = ['Category', 'Simple', 'Medium', 'Complex']
+        # Expected column structure for reading every month consistently
+        EXPECTED_COLS = PRODUCTIVITY_COLUMNS
         
-        pattern = re.compile(r'tasks_(\d{2}-\d{4})\.csv$')
-
-        for filename in os.listdir(self.directory_path):
-            match = pattern.match(filename)
-            if match:
-                month_year_str = match.group(1)
-                file_path = os.path.join(self.directory_path, filename)
+        store = get_data_store()
+        months = store.productivity_months() # Oldest first
+
+        for month_year_str in months:
+            try:
+                rows = store.productivity_rows(month_year_str)
+                if not rows:
+                    raise pd.errors.EmptyDataError
+                df = pd.DataFrame(rows, columns=EXPECTED_COLS)
+                # Convert the numerical columns to numeric type, coercing errors to NaN and filling with 0
+                df['Simple'] = pd.to_numeric(df['Simple'], errors='coerce').fillna(0)
+                df['Medium'] = pd.to_numeric(df['Medium'], errors='coerce').fillna(0)
+                df['Complex'] = pd.to_numeric(df['Complex'], errors='coerce').fillna(0)
+                
+                # Add Month and Year columns
+                df['File_Month'] = month_year_str
+                df['Month'] = datetime.strptime(month_year_str, '%m-%Y').strftime('%b %Y')
+
+                # Melt the numerical columns only
+                df_long = pd.melt(df, 
+                                  id_vars=['Category', 'File_Month', 'Month'], 
+                                  value_vars=['Simple', 'Medium', 'Complex'], 
+                                  var_name='Complexity', 
+                                  value_name='Value')
                 
-                try:
-                    # Read the CSV file
-                    df = pd.read_csv(file_path)
-
-                    # --- FIX: Ensure all expected columns exist, filling missing with 0 ---
-                    for col in EXPECTED_COLS:
-                        if col not in df.columns:
-                            # If a column (like 'Complex') is missing, create it and set to 0
-                            df[col] = 0
-                        
-                    # Drop any unexpected columns to standardize the structure
-                    df = df[EXPECTED_COLS]
-                    # Convert the numerical columns to numeric type, coercing errors to NaN and filling with 0
-                    df['Simple'] = pd.to_numeric(df['Simple'], errors='coerce').fillna(0)
-                    df['Medium'] = pd.to_numeric(df['Medium'], errors='coerce').fillna(0)
-                    df['Complex'] = pd.to_numeric(df['Complex'], errors='coerce').fillna(0)
-                    
-                    # Add Month and Year columns
-                    df['File_Month'] = month_year_str
-                    df['Month'] = datetime.strptime(month_year_str, '%m-%Y').strftime('%b %Y')
-
-                    # Melt the numerical columns only
-                    df_long = pd.melt(df, 
-                                      id_vars=['Category', 'File_Month', 'Month'], 
-                                      value_vars=['Simple', 'Medium', 'Complex'], 
-                                      var_name='Complexity', 
-                                      value_name='Value')
-                    
-                    # Aggregate value by Category and Month
-                    df_sum = df_long.groupby(['Month', 'Category']).agg({'Value': 'sum'}).reset_index()
-                    df_sum.rename(columns={'Value': 'Total'}, inplace=True)
-                    
-                    all_data.append(df_sum)
-
-                except pd.errors.EmptyDataError:
-                    print(f"Warning: File {filename} is empty.")
-                except Exception as e:
-                    print(f"Error reading or processing {filename}: {e}")
+                # Aggregate value by Category and Month
+                df_sum = df_long.groupby(['Month', 'Category']).agg({'Value': 'sum'}).reset_index()
+                df_sum.rename(columns={'Value': 'Total'}, inplace=True)
+                
+                all_data.append(df_sum)
+
+            except pd.errors.EmptyDataError:
+                print(f"Warning: No productivity data for {month_year_str}.")
+            except Exception as e:
+                print(f"Error reading or processing {month_year_str}: {e}")
 
         if not all_data:
             return None
@@ -125,19 +113,16 @@ class MatplotlibPlotter(ctk.CTkToplevel):
         # Combine all monthly data into one DataFrame
         combined_df = pd.concat(all_data, ignore_index=True)
         
-        # Sort the data by Month (using the internal File_Month key) to ensure correct plotting order
-        # We need the File_Month from the *original* data for accurate sorting
+        # Sort the data by Month to ensure correct plotting order
+        # The store lists months chronologically, so their position is the sort key
         month_order_map = {}
-        for filename in os.listdir(self.directory_path):
-            match = re.match(r'tasks_(\d{2}-\d{4})\.csv$', filename)
-            if match:
-                month_year_str = match.group(1)
-                month_name = datetime.strptime(month_year_str, '%m-%Y').strftime('%b %Y')
-                month_order_map[month_name] = month_year_str
+        for index, month_year_str in enumerate(months):
+            month_name = datetime.strptime(month_year_str, '%m-%Y').strftime('%b %Y')
+            month_order_map[month_name] = index
 
 
-        # Create a temporary sort key column using the raw YYYY-MM string for correct chronology
-        combined_df['Sort_Key'] = combined_df['Month'].map(lambda x: month_order_map.get(x, '01-1900'))
+        # Create a temporary sort key column for correct chronology
+        combined_df['Sort_Key'] = combined_df['Month'].map(lambda x: month_order_map.get(x, -1))
         combined_df.sort_values(by='Sort_Key', inplace=True)
         
         # Final cleanup and return
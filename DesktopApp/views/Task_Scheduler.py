@@ -11,10 +11,12 @@ except ImportError:
     print("Warning: 'win32com.client' module not found. Scheduled tasks will not be created.")
     HAS_SCHEDULER = False
 
-from .data_utils import read_config
 
 def create_logon_task(config):
-    """Creates or updates a scheduled task to launch ToDo popup 1 hour after shift starts."""
+    """
+    Creates or updates a scheduled task to launch ToDo popup 1 hour after shift starts.
+    `config` is a ConfigValues (see config_service.py).
+    """
     if not HAS_SCHEDULER:
         print("Skipping ToDo task creation: win32com.client not available.")
         return
@@ -34,14 +36,12 @@ def create_logon_task(config):
         
         task_def = scheduler.NewTask(0)
 
-        shift_start_time_str = config.get('Shift Start Time', '09:00 AM')
-        shift_start_time = datetime.datetime.strptime(shift_start_time_str, '%I:%M %p').time()
+        shift_start_time = config.shift_start
         
         # Launch 1 hour (60 minutes) after start time
         launch_time = (datetime.datetime.combine(datetime.date.today(), shift_start_time) + datetime.timedelta(hours=1)).time()
 
-        week_offs_str = config.get('Week Offs', '')
-        week_off_days = [day.strip().lower() for day in week_offs_str.split(',') if day.strip()] 
+        week_off_days = config.week_offs
         
         # Using a weekly trigger
         TASK_TRIGGER_WEEKLY = 3
@@ -57,7 +57,7 @@ def create_logon_task(config):
         
         days_to_run = 0
         for day in days_of_week_map.keys():
-            if day not in week_off_days:
+            if day[:3].title() not in week_off_days:
                 days_to_run |= days_of_week_map[day]
         
         if days_to_run > 0:
@@ -108,7 +108,10 @@ def create_logon_task(config):
 
 
 def create_daily_task(config):
-    """Creates or updates a scheduled task to launch TaskSnap main window 1 hour before shift ends."""
+    """
+    Creates or updates a scheduled task to launch TaskSnap main window 1 hour before shift ends.
+    `config` is a ConfigValues (see config_service.py).
+    """
     if not HAS_SCHEDULER:
         print("Skipping daily task creation: win32com.client not available.")
         return
@@ -127,14 +130,12 @@ def create_daily_task(config):
             pass
 
         task_def = scheduler.NewTask(0)
-        shift_end_time_str = config.get('Shift End Time', '05:00 PM')
-        shift_end_time = datetime.datetime.strptime(shift_end_time_str, '%I:%M %p').time()
+        shift_end_time = config.shift_end
         
         # Launch 1 hour (60 minutes) before end time
         launch_time = (datetime.datetime.combine(datetime.date.today(), shift_end_time) - datetime.timedelta(hours=1)).time()
 
-        week_offs_str = config.get('Week Offs', '')
-        week_off_days = [day.strip().lower() for day in week_offs_str.split(',') if day.strip()] 
+        week_off_days = config.week_offs
         
         # Using a weekly trigger
         TASK_TRIGGER_WEEKLY = 3
@@ -150,7 +151,7 @@ def create_daily_task(config):
         
         days_to_run = 0
         for day in days_of_week_map.keys():
-            if day not in week_off_days:
+            if day[:3].title() not in week_off_days:
                 days_to_run |= days_of_week_map[day]
         
         if days_to_run > 0:
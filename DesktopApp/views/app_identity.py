@@ -0,0 +1,110 @@
+# views/app_identity.py
+"""
+Application identity table for screen time.
+
+Raw window titles ("Inbox - Outlook", "main.py - proj - Visual Studio Code")
+are normalised to a stable (process, app) key and interned to a small integer
+id, so per-day totals grow with the number of distinct apps rather than the
+number of distinct titles. Per-title detail is kept as a bounded sub-breakdown.
+"""
+
+# Separators apps commonly put between the document/page and the app name.
+# Pipes are left out: pipe-separated titles usually lead with the app
+# ("Slack | general | Acme"), so their last segment is a workspace or channel.
+TITLE_SEPARATORS = (" - ", " — ", " – ")
+
+# Friendly names for processes whose titles don't end in the app name
+KNOWN_PROCESS_NAMES = {
+    "chrome.exe": "Google Chrome",
+    "msedge.exe": "Microsoft Edge",
+    "firefox.exe": "Firefox",
+    "brave.exe": "Brave",
+    "opera.exe": "Opera",
+    "code.exe": "Visual Studio Code",
+    "explorer.exe": "File Explorer",
+    "winword.exe": "Word",
+    "excel.exe": "Excel",
+    "powerpnt.exe": "PowerPoint",
+    "outlook.exe": "Outlook",
+    "teams.exe": "Microsoft Teams",
+    "ms-teams.exe": "Microsoft Teams",
+    "slack.exe": "Slack",
+    "discord.exe": "Discord",
+    "zoom.exe": "Zoom",
+    "spotify.exe": "Spotify",
+    "notepad.exe": "Notepad",
+}
+
+# Per-app title detail is capped; further titles are folded into one bucket
+MAX_TITLES_PER_APP = 25
+OTHER_TITLES = "(other titles)"
+
+# Bound on the title -> id memo so a day of unique titles can't grow it forever
+TITLE_CACHE_SIZE = 4096
+
+
+def normalize_app(title, process=None):
+    """Returns the (process, app) identity key for a window title."""
+    process_key = process.lower() if process else ""
+    if process_key in KNOWN_PROCESS_NAMES:
+        return process_key, KNOWN_PROCESS_NAMES[process_key]
+
+    app_name = title.strip()
+    for separator in TITLE_SEPARATORS:
+        if separator in app_name:
+            app_name = app_name.rsplit(separator, 1)[-1].strip()
+    return process_key, app_name or title.strip()
+
+
+class AppIdentityTable:
+    """Interns (process, app) keys to integer ids."""
+
+    def __init__(self):
+        self._ids = {}        # (process, app) -> id
+        self._keys = []       # id -> (process, app)
+        self._title_cache = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def intern(self, title, process=None):
+        """Returns the id for a window title, creating it on first sight."""
+        cache_key = (title, process)
+        app_id = self._title_cache.get(cache_key)
+        if app_id is not None:
+            return app_id
+
+        key = normalize_app(title, process)
+        app_id = self._ids.get(key)
+        if app_id is None:
+            app_id = len(self._keys)
+            self._ids[key] = app_id
+            self._keys.append(key)
+
+        if len(self._title_cache) >= TITLE_CACHE_SIZE:
+            self._title_cache.clear()
+        self._title_cache[cache_key] = app_id
+        return app_id
+
+    def name(self, app_id):
+        """Display name for an id."""
+        return self._keys[app_id][1]
+
+    def key(self, app_id):
+        return self._keys[app_id]
+
+    def named_totals(self, totals_by_id):
+        """Converts {id: seconds} to {app name: seconds}, merging ids that share a name."""
+        named = {}
+        for app_id, seconds in totals_by_id.items():
+            name = self._keys[app_id][1]
+            named[name] = named.get(name, 0) + seconds
+        return named
+
+
+def add_title_detail(title_totals, title, seconds, max_titles=MAX_TITLES_PER_APP):
+    """Adds `seconds` to a bounded {title: seconds} breakdown for one app."""
+    if title in title_totals or len(title_totals) < max_titles:
+        title_totals[title] = title_totals.get(title, 0) + seconds
+    else:
+        title_totals[OTHER_TITLES] = title_totals.get(OTHER_TITLES, 0) + seconds
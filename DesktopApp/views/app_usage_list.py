@@ -0,0 +1,175 @@
+# views/app_usage_list.py
+"""
+Virtualized (windowed) list for the screen time "App Usage List".
+
+Only the rows inside the viewport, plus a small overscan, exist as widgets.
+They form a recycled pool: scrolling re-binds a slot to a different app and
+moves it with place(), and each slot remembers what it shows so only labels
+whose text or colour actually changed are reconfigured. Rendering a month of
+titles costs the same Tk work as rendering ten.
+"""
+import sys
+import tkinter as tk
+import customtkinter as ctk
+from theme import Theme
+
+ROW_HEIGHT = 28
+OVERSCAN_ROWS = 3
+WHEEL_ROWS = 3
+
+
+class _AppRow:
+    """One recycled row widget. Remembers what it displays to skip no-op updates."""
+
+    __slots__ = ("frame", "name_label", "category_label", "time_label",
+                 "name_text", "time_text", "category_text", "category_color", "y")
+
+    def __init__(self, parent):
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent", corner_radius=0, height=ROW_HEIGHT)
+        self.name_label = ctk.CTkLabel(self.frame, text="", anchor="w", font=("Rubik", 11), padx=5, fg_color="transparent")
+        self.name_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.category_label = ctk.CTkLabel(self.frame, text="", anchor="e", font=("Rubik", 10), padx=5, fg_color="transparent")
+        self.category_label.pack(side=tk.RIGHT)
+        self.time_label = ctk.CTkLabel(self.frame, text="", anchor="e", font=("Rubik", 11), padx=5, fg_color="transparent")
+        self.time_label.pack(side=tk.RIGHT)
+        self.name_text = None
+        self.time_text = None
+        self.category_text = None
+        self.category_color = None
+        self.y = None
+
+    def widgets(self):
+        return (self.frame, self.name_label, self.category_label, self.time_label)
+
+
+class AppUsageList(ctk.CTkFrame):
+    """Scrollable list of (name, seconds, category) rows that materializes only the visible rows."""
+
+    def __init__(self, master, format_time, height=260, **kwargs):
+        super().__init__(master, height=height, corner_radius=10, **kwargs)
+        self.format_time = format_time
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.viewport.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(5, 0), pady=5)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=5)
+
+        self.items = []
+        self.pool = []
+        self.scroll_y = 0
+
+        # Counters for measuring render cost
+        self.rows_created = 0
+        self.labels_updated = 0
+        self.rows_placed = 0
+
+        self.viewport.bind("<Configure>", lambda event: self._render())
+        self._bind_wheel(self.viewport)
+
+    # --- Public API ---
+
+    def set_rows(self, sorted_times):
+        """Shows `sorted_times`, a list of (name, seconds, category) in display order."""
+        self.items = sorted_times
+        self._clamp_scroll()
+        self._render()
+
+    # --- Scrolling ---
+
+    def _bind_wheel(self, widget):
+        if sys.platform.startswith("linux"):
+            widget.bind("<Button-4>", lambda event: self._scroll_by(-WHEEL_ROWS * ROW_HEIGHT))
+            widget.bind("<Button-5>", lambda event: self._scroll_by(WHEEL_ROWS * ROW_HEIGHT))
+        else:
+            widget.bind("<MouseWheel>", self._on_mousewheel)
+
+    def _on_mousewheel(self, event):
+        notches = -event.delta / 120 if sys.platform == "win32" else -event.delta
+        self._scroll_by(int(notches * WHEEL_ROWS * ROW_HEIGHT))
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_y = int(float(args[1]) * self._content_height())
+        elif args[0] == "scroll":
+            step = ROW_HEIGHT if args[2] == "units" else max(ROW_HEIGHT, self.viewport.winfo_height())
+            self.scroll_y += int(args[1]) * step
+        self._clamp_scroll()
+        self._render()
+
+    def _scroll_by(self, pixels):
+        self.scroll_y += pixels
+        self._clamp_scroll()
+        self._render()
+
+    def _content_height(self):
+        return len(self.items) * ROW_HEIGHT
+
+    def _clamp_scroll(self):
+        max_scroll = max(0, self._content_height() - self.viewport.winfo_height())
+        self.scroll_y = max(0, min(self.scroll_y, max_scroll))
+
+    # --- Rendering ---
+
+    def _ensure_pool(self, size):
+        while len(self.pool) < size:
+            row = _AppRow(self.viewport)
+            for widget in row.widgets():
+                self._bind_wheel(widget)
+            self.pool.append(row)
+            self.rows_created += 1
+
+    def _render(self):
+        view_height = self.viewport.winfo_height()
+        if view_height < ROW_HEIGHT:
+            view_height = ROW_HEIGHT * 10  # Not mapped yet; assume a sensible size
+
+        visible_rows = view_height // ROW_HEIGHT + 1
+        pool_size = min(len(self.items), visible_rows + 2 * OVERSCAN_ROWS)
+        self._ensure_pool(pool_size)
+
+        first = max(0, self.scroll_y // ROW_HEIGHT - OVERSCAN_ROWS)
+        last = min(len(self.items), first + pool_size)
+
+        used = set()
+        for index in range(first, last):
+            # Ring mapping: scrolling by one row re-binds exactly one slot
+            slot = index % pool_size
+            used.add(slot)
+            name, seconds, category = self.items[index]
+            self._bind_row(self.pool[slot], name, seconds, category, index * ROW_HEIGHT - self.scroll_y)
+
+        for slot, row in enumerate(self.pool):
+            if slot not in used and row.y is not None:
+                row.frame.place_forget()
+                row.y = None
+
+        content_height = self._content_height()
+        if content_height > 0:
+            self.scrollbar.set(self.scroll_y / content_height, min(1.0, (self.scroll_y + view_height) / content_height))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _bind_row(self, row, name, seconds, category, y):
+        if name != row.name_text:
+            row.name_label.configure(text=name)
+            row.name_text = name
+            self.labels_updated += 1
+
+        time_text = self.format_time(seconds)
+        if time_text != row.time_text:
+            row.time_label.configure(text=time_text)
+            row.time_text = time_text
+            self.labels_updated += 1
+
+        category_text = f"[{category}]"
+        category_color = Theme.ACCENT_BLUE if category == "Work" else Theme.TEXT_SECONDARY
+        if category_text != row.category_text or category_color != row.category_color:
+            row.category_label.configure(text=category_text, text_color=category_color)
+            row.category_text = category_text
+            row.category_color = category_color
+            self.labels_updated += 1
+
+        if y != row.y:
+            row.frame.place(x=0, y=y, relwidth=1.0, height=ROW_HEIGHT)
+            row.y = y
+            self.rows_placed += 1
@@ -0,0 +1,182 @@
+# views/config_service.py
+"""
+Process-wide cached view of config.csv.
+
+read_config() reopens and re-parses the file on every call, and it used to be
+called on every Sheets upload, every dashboard switch and every view start. The
+ConfigService loads it once and hands out an immutable ConfigValues: the raw
+strings (so `config.get('User Email')` keeps working) plus the typed values the
+callers actually need - shift times as datetime.time and week-offs as a set.
+
+The cache is dropped when write_config() saves the file, or when the file's
+mtime changes underneath us (e.g. edited by hand); the mtime is checked at most
+once every STAT_INTERVAL_SECONDS, so a read is normally a dictionary lookup.
+Subscribers are called with the new ConfigValues on the thread that noticed the
+change; UI subscribers should hop to the Tk thread with after() if they touch
+widgets.
+"""
+import os
+import time
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+from types import MappingProxyType
+
+from .data_utils import CONFIG_FILE, read_config
+
+STAT_INTERVAL_SECONDS = 2.0
+SHIFT_TIME_FORMAT = '%I:%M %p'
+DEFAULT_SHIFT_START = '9:00 AM'
+DEFAULT_SHIFT_END = '5:00 PM'
+DEFAULT_WEEK_OFFS = 'Sat, Sun'
+
+
+def parse_shift_time(value, default):
+    """'9:00 AM' -> datetime.time, falling back to `default` (same format) if unparseable."""
+    try:
+        return datetime.strptime(value.strip(), SHIFT_TIME_FORMAT).time()
+    except (AttributeError, ValueError):
+        return datetime.strptime(default, SHIFT_TIME_FORMAT).time()
+
+
+def parse_week_offs(value):
+    """'Sat, Sun' -> frozenset({'Sat', 'Sun'}); day names are cut to 3-letter title case."""
+    return frozenset(day.strip()[:3].title() for day in (value or '').split(',') if day.strip())
+
+
+class ConfigValues(Mapping):
+    """One immutable parse of config.csv: raw string values plus typed fields."""
+
+    def __init__(self, raw):
+        self._raw = MappingProxyType(dict(raw))
+        self.shift_start = parse_shift_time(raw.get('Shift Start Time'), DEFAULT_SHIFT_START)
+        self.shift_end = parse_shift_time(raw.get('Shift End Time'), DEFAULT_SHIFT_END)
+        self.week_offs = parse_week_offs(raw.get('Week Offs', DEFAULT_WEEK_OFFS))
+
+    def __getitem__(self, key):
+        return self._raw[key]
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __eq__(self, other):
+        return isinstance(other, Mapping) and dict(self._raw) == dict(other)
+
+    __hash__ = None
+
+    def to_dict(self):
+        """A mutable copy of the raw values, e.g. to edit and pass to write_config()."""
+        return dict(self._raw)
+
+
+class ConfigService:
+    """Loads config.csv once and serves the cached ConfigValues until it changes."""
+
+    def __init__(self, path=CONFIG_FILE, stat_interval=STAT_INTERVAL_SECONDS):
+        self.path = path
+        self.stat_interval = stat_interval
+        self._lock = threading.RLock()
+        self._values = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._loading = False
+        self._subscribers = []
+        self.loads = 0
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        self._loading = True
+        try:
+            values = ConfigValues(read_config(self.path))
+        finally:
+            self._loading = False
+        self._values = values
+        self._mtime = self._file_mtime()
+        self._checked_at = time.monotonic()
+        self.loads += 1
+        return values
+
+    def get(self):
+        """The current ConfigValues, reloading first if the file changed on disk."""
+        changed = None
+        with self._lock:
+            if self._values is None:
+                return self._load()
+            now = time.monotonic()
+            if now - self._checked_at >= self.stat_interval:
+                self._checked_at = now
+                if self._file_mtime() != self._mtime:
+                    previous = self._values
+                    changed = self._load()
+                    if changed == previous:
+                        changed = None
+            values = self._values
+        if changed is not None:
+            self._notify(changed)
+        return values
+
+    def invalidate(self):
+        """Drops the cache and reloads now (called by write_config), notifying subscribers on change."""
+        with self._lock:
+            # read_config() writes the defaults when the file is missing; that
+            # write lands here while the outer load is still running
+            if self._loading:
+                return
+            previous = self._values
+            values = self._load()
+        if previous is not None and values != previous:
+            self._notify(values)
+
+    def subscribe(self, callback):
+        """Calls callback(values) after every change. Returns a function that unsubscribes."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _notify(self, values):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(values)
+            except Exception as e:
+                print(f"Error in config subscriber {callback}: {e}")
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_config_service():
+    """The shared ConfigService for CONFIG_FILE."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ConfigService()
+        return _service
+
+
+def get_config():
+    """Shortcut for get_config_service().get()."""
+    return get_config_service().get()
+
+
+def config_written(file_path):
+    """Hook for write_config(): refreshes the shared service if it caches `file_path`."""
+    with _service_lock:
+        service = _service
+    if service is not None and os.path.abspath(file_path) == os.path.abspath(service.path):
+        service.invalidate()
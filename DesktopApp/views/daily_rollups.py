@@ -0,0 +1,89 @@
+# views/daily_rollups.py
+"""
+Daily rollup cache for the screen time bar graph.
+
+A finished day's total never changes, so it is summed once from its history
+entry and kept. Today's total comes straight from the running totals in the
+tracker snapshot. Drawing N days is then N dict lookups with no per-app
+summation, and widening the view (7 -> 30 -> 90 days) only loads the days that
+haven't been seen yet.
+
+Checkpoints rewrite only today's history row, so syncing after one re-sums only
+the rows whose saved timestamp moved. Everything is rebuilt only when the day
+rolls over or an older row changes underneath (history imported or recovered).
+"""
+from datetime import timedelta
+
+# Bar graph ranges offered in the screen time view, in days
+BAR_RANGES = (7, 30, 90)
+
+_UNSEEN = object()
+
+
+def day_total(entry):
+    """Screen time shown for one saved day: app usage plus breaks."""
+    return sum(entry.get("usage", {}).values()) + entry.get("break_time", 0)
+
+
+class DailyRollupCache:
+    """Per-day totals for finished days, loaded lazily from history."""
+
+    def __init__(self, load_range):
+        # load_range(start, end) -> saved entries, e.g. ScreenTimeTracker.history_range
+        self.load_range = load_range
+        self._totals = {}           # 'YYYY-MM-DD' -> seconds
+        self._loaded_since = None   # earliest date fetched from history so far
+        self._history_version = None
+        self._stamps = {}           # 'YYYY-MM-DD' -> last_timestamp of the synced entry
+        self._synced_day = None
+        self.days_summed = 0        # entries summed so far; one per checkpoint in the normal case
+        self.rebuilds = 0
+
+    def sync(self, recent_entries, history_version, today):
+        """Picks up re-saved recent days (today's checkpoint, yesterday's final total after midnight)."""
+        if history_version == self._history_version:
+            return
+        self._history_version = history_version
+        changed = [entry for entry in recent_entries
+                   if self._stamps.get(entry["date"], _UNSEEN) != entry.get("last_timestamp")]
+        yesterday = str(today - timedelta(days=1))
+        if self._synced_day is not None and (today != self._synced_day or
+                                             any(entry["date"] < yesterday for entry in changed)):
+            self.invalidate()
+            changed = recent_entries
+        self._synced_day = today
+        for entry in changed:
+            self._totals[entry["date"]] = day_total(entry)
+            self._stamps[entry["date"]] = entry.get("last_timestamp")
+            self.days_summed += 1
+
+    def invalidate(self):
+        """Drops every cached total; they are summed again as they are needed."""
+        self._totals = {}
+        self._stamps = {}
+        self._loaded_since = None
+        self.rebuilds += 1
+
+    def _ensure_loaded(self, days, today):
+        start = today - timedelta(days=days - 1)
+        if self._loaded_since is not None and start >= self._loaded_since:
+            return
+        end = self._loaded_since - timedelta(days=1) if self._loaded_since is not None else today - timedelta(days=1)
+        for entry in self.load_range(start, end):
+            # Days already synced are newer than what history had when it was first read
+            if entry["date"] not in self._totals:
+                self._totals[entry["date"]] = day_total(entry)
+                self.days_summed += 1
+        self._loaded_since = start
+
+    def series(self, days, today, today_total):
+        """[(date, seconds)] for the days with data in the last `days` days, oldest first, ending with today."""
+        self._ensure_loaded(days, today)
+        series = []
+        for days_ago in range(days - 1, 0, -1):
+            day = today - timedelta(days=days_ago)
+            total = self._totals.get(str(day))
+            if total is not None:
+                series.append((day, total))
+        series.append((today, today_total))
+        return series
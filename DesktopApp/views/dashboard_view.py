@@ -42,6 +42,7 @@ class DashboardView(ctk.CTkFrame):
         self.greeting_label = None 
         self.quote_label = None
         self.theme_toggle_btn = None
+        self.sync_status_label = None
         self.cards = []
 
         try:
@@ -60,6 +61,11 @@ class DashboardView(ctk.CTkFrame):
         if self.greeting_label:
             self.greeting_label.configure(text=f"{self.greeting}, {self.user_name}!")
 
+    def set_sync_status(self, text):
+        """Shows a one-line background sync status under the cards ('' clears it)."""
+        if self.sync_status_label:
+            self.sync_status_label.configure(text=text)
+
     def tint_icon(self, image_path, color_hex, size=(40, 40)):
         try:
             original_img = Image.open(resource_path(image_path)).convert("RGBA")
@@ -98,7 +104,7 @@ class DashboardView(ctk.CTkFrame):
         self.theme_toggle_btn.pack(side="right", anchor="ne", padx=(0, 20), pady=(0, 10))
 
         self.main_frame = ctk.CTkFrame(self, fg_color="transparent")
-        self.main_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 20))
+        self.main_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(0, 5))
         self.main_frame.grid_columnconfigure((0, 1, 2, 3), weight=1)
         self.main_frame.grid_rowconfigure(0, weight=1)
 
@@ -109,6 +115,10 @@ class DashboardView(ctk.CTkFrame):
         self.cards.append(self.create_dashboard_card(self.main_frame, 2, "To-Do List", "Organize your tasks", "assets/list_icon.png", Theme.ACCENT_YELLOW,  self.show_todo))
         self.cards.append(self.create_dashboard_card(self.main_frame, 3, "Screen Time", "Monitor your usage", "assets/monitor_icon.png", Theme.ACCENT_PURPLE, self.show_screen_time))
 
+        # Background sync progress (e.g. the Google Sheets update after saving productivity)
+        self.sync_status_label = ctk.CTkLabel(self, text="", font=self.font_card_subtitle, anchor="w")
+        self.sync_status_label.grid(row=2, column=0, sticky="ew", padx=40, pady=(0, 10))
+
     def create_dashboard_card(self, parent, col, title, subtitle, icon_path, accent_color, command):
         # FIX: Set corner_radius to 17 instead of 18 to potentially fix rendering bug.
         card = ctk.CTkFrame(parent, corner_radius=17, border_width=0)
@@ -148,6 +158,7 @@ class DashboardView(ctk.CTkFrame):
         self.greeting_label.configure(text_color=Theme.TEXT)
         # FIX: Change from Theme.TEXT_SECONDARY to the correct name
         self.quote_label.configure(text_color=Theme.TEXT_SECONDARY)  # This is correct!
+        self.sync_status_label.configure(text_color=Theme.TEXT_SECONDARY)
 
         new_icon = self.sun_icon if self.is_dark_mode else self.moon_icon
         hover_color = Theme.ACCENT_BLUE_HOVER if not self.is_dark_mode else Theme.ACCENT_BLUE
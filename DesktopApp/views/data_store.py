@@ -0,0 +1,296 @@
+# views/data_store.py
+"""
+Embedded SQLite store for the app's productivity and screen time data.
+
+To-dos, the monthly productivity counts and the monthly misc notes used to live
+in tasks.json, Tasks/tasks_MM-YYYY.csv and Misc/misc_MM-YYYY.txt, each parsed
+in full and rewritten in full on every change. They are now rows in one
+database under the user data folder, opened in WAL mode, so ticking a to-do or
+adding today's counts is a single-row update and readers never block the writer.
+
+Screen time lives here too: one row per day of rollups (see
+screen_time_history.py) and one row per focus interval, archived from the
+journal when it is compacted, indexed by start time.
+
+migrate_legacy_files() imports the old files once and renames them to
+*.migrated. Months are keyed 'MM-YYYY', like the old file names. The screen
+time files are imported by ScreenTimeHistory.import_legacy(). config.csv is
+not moved: it is a handful of settings, read once through config_service.py.
+"""
+import os
+import re
+import csv
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from .data_utils import DATA_STORE_FILE, DATA_ROOT, TASK_DATA_FOLDER, MISC_DATA_FOLDER, read_text_verified
+
+PRODUCTIVITY_COLUMNS = ['Category', 'Simple', 'Medium', 'Complex']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS todos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    created_date TEXT
+);
+CREATE INDEX IF NOT EXISTS todos_completed ON todos (completed);
+CREATE TABLE IF NOT EXISTS productivity_counts (
+    month TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    simple INTEGER NOT NULL DEFAULT 0,
+    medium INTEGER NOT NULL DEFAULT 0,
+    complex INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, category)
+);
+CREATE INDEX IF NOT EXISTS productivity_month_position ON productivity_counts (month, position);
+CREATE TABLE IF NOT EXISTS misc_notes (
+    month TEXT PRIMARY KEY,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS screen_time_days (
+    day TEXT PRIMARY KEY,
+    entry TEXT NOT NULL,
+    journal_seq INTEGER NOT NULL DEFAULT -1
+);
+CREATE TABLE IF NOT EXISTS focus_intervals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    seq INTEGER UNIQUE,
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    app TEXT,
+    kind TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS focus_intervals_start ON focus_intervals (start_time);
+"""
+
+LEGACY_MIGRATION_KEY = "legacy_files_migrated"
+
+
+def current_month():
+    """'MM-YYYY' key for this month."""
+    return datetime.now().strftime("%m-%Y")
+
+
+def _count(value):
+    try:
+        return int(value) if str(value).strip() else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+class DataStore:
+    """Row-level access to to-dos, productivity counts and misc notes."""
+
+    def __init__(self, path=DATA_STORE_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # One connection shared by the UI and worker threads, serialised by a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _write(self, sql, params=()):
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params)
+
+    # --- To-dos ---
+
+    def todos(self, include_completed=True):
+        """[{'id', 'text', 'completed', 'created_date'}] in the order they were added."""
+        sql = "SELECT id, text, completed, created_date FROM todos"
+        if not include_completed:
+            sql += " WHERE completed = 0"
+        return [{"id": row["id"], "text": row["text"], "completed": bool(row["completed"]),
+                 "created_date": row["created_date"]} for row in self._query(sql + " ORDER BY id")]
+
+    def add_todo(self, text, completed=False, created_date=None):
+        """Adds a to-do and returns its id."""
+        created_date = created_date or datetime.now().strftime("%b %d, %Y")
+        return self._write("INSERT INTO todos (text, completed, created_date) VALUES (?, ?, ?)",
+                           (text, int(completed), created_date)).lastrowid
+
+    def set_todo_completed(self, todo_id, completed):
+        self._write("UPDATE todos SET completed = ? WHERE id = ?", (int(completed), todo_id))
+
+    def delete_completed_todos(self):
+        self._write("DELETE FROM todos WHERE completed = 1")
+
+    # --- Productivity counts ---
+
+    def productivity_months(self):
+        """Month keys that have counts, oldest first."""
+        months = [row["month"] for row in self._query("SELECT DISTINCT month FROM productivity_counts")]
+        return sorted(months, key=lambda month: datetime.strptime(month, "%m-%Y"))
+
+    def productivity_rows(self, month):
+        """[{'Category', 'Simple', 'Medium', 'Complex'}] for one month, in display order."""
+        rows = self._query("SELECT category, simple, medium, complex FROM productivity_counts "
+                           "WHERE month = ? ORDER BY position", (month,))
+        return [{"Category": row["category"], "Simple": row["simple"], "Medium": row["medium"],
+                 "Complex": row["complex"]} for row in rows]
+
+    def add_productivity(self, month, counts):
+        """Adds {category: {'Simple': n, 'Medium': n, 'Complex': n}} to a month's running totals."""
+        with self._lock, self._conn:
+            for category, values in counts.items():
+                self._conn.execute(
+                    "INSERT INTO productivity_counts (month, position, category, simple, medium, complex) "
+                    "VALUES (?, (SELECT COUNT(*) FROM productivity_counts WHERE month = ?), ?, ?, ?, ?) "
+                    "ON CONFLICT (month, category) DO UPDATE SET "
+                    "simple = simple + excluded.simple, medium = medium + excluded.medium, "
+                    "complex = complex + excluded.complex",
+                    (month, month, category, _count(values.get('Simple')), _count(values.get('Medium')),
+                     _count(values.get('Complex'))))
+
+    def replace_productivity(self, month, rows):
+        """Replaces a month's counts with rows of [category, simple, medium, complex] (e.g. after editing)."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM productivity_counts WHERE month = ?", (month,))
+            for position, row in enumerate(rows):
+                row = list(row) + [0] * (4 - len(row))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO productivity_counts (month, position, category, simple, medium, complex) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (month, position, str(row[0]), _count(row[1]), _count(row[2]), _count(row[3])))
+
+    # --- Misc notes ---
+
+    def misc_note(self, month):
+        rows = self._query("SELECT text FROM misc_notes WHERE month = ?", (month,))
+        return rows[0]["text"] if rows else ""
+
+    def save_misc_note(self, month, text):
+        self._write("INSERT INTO misc_notes (month, text) VALUES (?, ?) "
+                    "ON CONFLICT (month) DO UPDATE SET text = excluded.text", (month, text))
+
+    # --- Screen time ---
+
+    def screen_time_days(self, start, end):
+        """[(date_str, entry, journal_seq)] with start <= date <= end ('YYYY-MM-DD'), oldest first."""
+        rows = self._query("SELECT day, entry, journal_seq FROM screen_time_days "
+                           "WHERE day BETWEEN ? AND ? ORDER BY day", (start, end))
+        return [(row["day"], json.loads(row["entry"]), row["journal_seq"]) for row in rows]
+
+    def save_screen_time_day(self, day, entry, journal_seq=None):
+        """Replaces one day's rollup entry. The day's journal_seq only moves forward."""
+        journal_seq = -1 if journal_seq is None else journal_seq
+        self._write("INSERT INTO screen_time_days (day, entry, journal_seq) VALUES (?, ?, ?) "
+                    "ON CONFLICT (day) DO UPDATE SET entry = excluded.entry, "
+                    "journal_seq = MAX(journal_seq, excluded.journal_seq)",
+                    (day, json.dumps(entry, separators=(",", ":")), journal_seq))
+
+    def screen_time_journal_seq(self):
+        """Last journal record covered by the saved rollups, or -1."""
+        rows = self._query("SELECT MAX(journal_seq) AS seq FROM screen_time_days")
+        return rows[0]["seq"] if rows and rows[0]["seq"] is not None else -1
+
+    def add_focus_intervals(self, intervals):
+        """
+        Archives (seq, start, end, app, kind) intervals. Numbered intervals that
+        are already stored are skipped, so archiving the same records twice is harmless.
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO focus_intervals (seq, start_time, end_time, app, kind) VALUES (?, ?, ?, ?, ?)",
+                list(intervals))
+
+    def focus_intervals(self, start, end):
+        """[(start, end, app, kind)] for intervals overlapping the [start, end) timestamps, oldest first."""
+        rows = self._query("SELECT start_time, end_time, app, kind FROM focus_intervals "
+                           "WHERE start_time < ? AND end_time > ? ORDER BY start_time", (end, start))
+        return [(row["start_time"], row["end_time"], row["app"], row["kind"]) for row in rows]
+
+    # --- Migration ---
+
+    def is_migrated(self):
+        return bool(self._query("SELECT 1 FROM meta WHERE key = ?", (LEGACY_MIGRATION_KEY,)))
+
+    def migrate_legacy_files(self, data_root=DATA_ROOT, task_folder=TASK_DATA_FOLDER, misc_folder=MISC_DATA_FOLDER):
+        """
+        One-shot import of tasks.json, Tasks/tasks_MM-YYYY.csv and
+        Misc/misc_MM-YYYY.txt. Imported files are renamed to *.migrated.
+        Returns the number of files imported.
+        """
+        if self.is_migrated():
+            return 0
+
+        imported = []
+        todo_file = os.path.join(data_root, "tasks.json")
+        if os.path.exists(todo_file):
+            try:
+                for task in json.loads(read_text_verified(todo_file)):
+                    self.add_todo(task['text'], task.get('completed', False), task.get('created_date'))
+                imported.append(todo_file)
+            except Exception as e:
+                print(f"Error migrating {todo_file}: {e}")
+
+        for folder, pattern, load in (
+                (task_folder, re.compile(r'tasks_(\d{2}-\d{4})\.csv$'), self._import_productivity_file),
+                (misc_folder, re.compile(r'misc_(\d{2}-\d{4})\.txt$', re.IGNORECASE), self._import_misc_file)):
+            if not os.path.isdir(folder):
+                continue
+            for filename in sorted(os.listdir(folder)):
+                match = pattern.match(filename)
+                if not match:
+                    continue
+                path = os.path.join(folder, filename)
+                try:
+                    load(match.group(1), path)
+                    imported.append(path)
+                except Exception as e:
+                    print(f"Error migrating {path}: {e}")
+
+        self._write("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    (LEGACY_MIGRATION_KEY, datetime.now().isoformat(timespec="seconds")))
+
+        for path in imported:
+            try:
+                os.replace(path, path + ".migrated")
+            except OSError as e:
+                print(f"Could not rename migrated file {path}: {e}")
+        return len(imported)
+
+    def _import_productivity_file(self, month, path):
+        rows = list(csv.DictReader(read_text_verified(path).splitlines()))
+        self.replace_productivity(month, [[row.get(column, 0) for column in PRODUCTIVITY_COLUMNS]
+                                          for row in rows if row.get('Category')])
+
+    def _import_misc_file(self, month, path):
+        text = read_text_verified(path)
+        existing = self.misc_note(month)
+        self.save_misc_note(month, f"{existing}\n{text}" if existing else text)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_data_store():
+    """The shared DataStore, opened (and legacy files migrated) on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DataStore()
+            _store.migrate_legacy_files()
+        return _store
@@ -2,13 +2,13 @@
 import sys
 import os
 import csv
-from tkinter import messagebox
 from datetime import datetime, date
-import gspread
-import pandas as pd
 from collections import defaultdict
 import json
-import gspread.utils # Explicitly imported to be available for column letter calculation
+import threading
+# gspread and pandas are imported inside the Sheets helpers, so modules that only
+# need paths/config (e.g. the headless tracker daemon) stay lightweight. Tk is not
+# imported at all; errors go through report_error() (see set_error_reporter).
 import sys
 import os
 
@@ -47,26 +47,229 @@ def resource_path(relative_path):
 
 DATA_ROOT = get_user_data_path()
 CONFIG_FILE = os.path.join(DATA_ROOT, 'config.csv')
+# Legacy monthly productivity CSVs and misc notes; imported into DATA_STORE_FILE on first run
 TASK_DATA_FOLDER = os.path.join(DATA_ROOT, 'Tasks')
-# NEW: Folder for miscellaneous text files
 MISC_DATA_FOLDER = os.path.join(DATA_ROOT, 'Misc') 
+# Legacy rolling 7-day file and monthly history files; imported into DATA_STORE_FILE on first run
 SCREEN_TIME_FILE = os.path.join(DATA_ROOT, "screen_time_data.json")
+SCREEN_TIME_HISTORY_FOLDER = os.path.join(DATA_ROOT, 'ScreenTime')
+SCREEN_TIME_JOURNAL_FILE = os.path.join(DATA_ROOT, "screen_time_journal.jsonl")
+CATEGORY_RULES_FILE = os.path.join(DATA_ROOT, "category_rules.json")
+# SQLite store for to-dos, productivity counts, misc notes and screen time (see data_store.py)
+DATA_STORE_FILE = os.path.join(DATA_ROOT, "tasksnap.db")
+# Address + auth key of the running headless tracker daemon (see tracker_daemon.py)
+TRACKER_DAEMON_FILE = os.path.join(DATA_ROOT, "tracker_daemon.json")
+# Spooled Google Sheets / email jobs waiting to be sent (see outbound_queue.py)
+OUTBOX_FOLDER = os.path.join(DATA_ROOT, 'Outbox')
+# Cached row/column positions in the shared Google Sheets (see sheet_sync.py)
+SHEET_INDEX_FILE = os.path.join(DATA_ROOT, "sheet_index.json")
 GSPREAD_CREDENTIALS_FILE = resource_path("assets/gspread_credentials.json")
 
 
-# --- Helper for monthly misc file path ---
-def get_misc_file_path():
-    """Returns the monthly file path for miscellaneous tasks (e.g., Misc/misc_05-2025.txt)."""
-    os.makedirs(MISC_DATA_FOLDER, exist_ok=True)
-    month_year_str = datetime.now().strftime("%m-%Y")
-    return os.path.join(MISC_DATA_FOLDER, f"misc_{month_year_str}.txt")
+# --- Durable File Storage ---
+#
+# Every file the app owns goes through these helpers. A write goes to a unique
+# temp file that is fsynced and then renamed over the target (and, on POSIX, the
+# directory is fsynced so the rename itself survives a power loss), so an
+# interrupted save leaves the old file or the new one, never a truncated mix. The previous version
+# is kept as <file>.bak and each version's SHA-256 as <file>.sha256. Reads verify
+# the checksum and fall back to the backup if the file is missing, fails the
+# check, or (for JSON) doesn't parse.
+
+BACKUP_SUFFIX = ".bak"
+CHECKSUM_SUFFIX = ".sha256"
+
+
+class StorageError(Exception):
+    """Raised when neither a file nor its backup can be read intact."""
+
+
+def _sha256(data):
+    import hashlib
+    return hashlib.sha256(data).hexdigest()
+
+
+def _fsync_directory(directory):
+    """Makes a rename in `directory` durable. POSIX only; Windows can't open directories."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_bytes_atomic(file_path, data):
+    import tempfile
+    directory = os.path.dirname(file_path) or "."
+    # A unique temp file per write, so concurrent writers (threads or processes) never share one
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(file_path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+
+def _path_lock(file_path):
+    with _path_locks_guard:
+        return _path_locks.setdefault(os.path.abspath(file_path), threading.Lock())
+
+
+def write_text_atomic(file_path, text, backup=True):
+    """
+    Replaces a file's contents all-or-nothing. With `backup`, the previous
+    version (and its checksum) are kept as <file>.bak.
+    """
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    data = text.encode("utf-8")
+    checksum_path = file_path + CHECKSUM_SUFFIX
+    # Writers of the same file in this process take turns, so a file and its checksum always match
+    with _path_lock(file_path):
+        if backup and os.path.exists(file_path):
+            # The old file and its checksum move aside together; a crash before the
+            # new file lands leaves only the backup, which reads fall back to
+            os.replace(file_path, file_path + BACKUP_SUFFIX)
+            if os.path.exists(checksum_path):
+                os.replace(checksum_path, file_path + BACKUP_SUFFIX + CHECKSUM_SUFFIX)
+        _write_bytes_atomic(file_path, data)
+        if backup:
+            _write_bytes_atomic(checksum_path, _sha256(data).encode("ascii"))
+
+
+def _read_verified_bytes(path):
+    """The file's bytes, or None if it is missing or fails its checksum."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        data = f.read()
+    checksum_path = path + CHECKSUM_SUFFIX
+    if os.path.exists(checksum_path):
+        with open(checksum_path, "r", encoding="ascii") as f:
+            expected = f.read().strip()
+        if expected and expected != _sha256(data):
+            print(f"Checksum mismatch for {path}; trying its backup")
+            return None
+    return data
+
+
+def _decode(data):
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        # Files written before this layer used the platform's default encoding
+        import locale
+        return data.decode(locale.getpreferredencoding(False), errors="replace")
+
+
+def data_file_exists(file_path):
+    """True if the file or its backup exists."""
+    return os.path.exists(file_path) or os.path.exists(file_path + BACKUP_SUFFIX)
+
+
+def read_text_verified(file_path, parse=None):
+    """
+    Returns the file's text (or `parse(text)`), falling back to the backup.
+    Raises FileNotFoundError if neither exists and StorageError if neither is intact.
+    """
+    found = False
+    for path in (file_path, file_path + BACKUP_SUFFIX):
+        data = _read_verified_bytes(path)
+        found = found or os.path.exists(path)
+        if data is None:
+            continue
+        text = _decode(data)
+        if parse is None:
+            return text
+        try:
+            return parse(text)
+        except ValueError as e:
+            print(f"Could not parse {path}: {e}")
+    if not found:
+        raise FileNotFoundError(file_path)
+    raise StorageError(f"{os.path.basename(file_path)} and its backup are damaged")
+
+
+def write_json_atomic(file_path, data, **dump_options):
+    write_text_atomic(file_path, json.dumps(data, **dump_options))
+
+
+def read_json_verified(file_path):
+    return read_text_verified(file_path, json.loads)
+
+
+def write_csv_atomic(file_path, rows, fieldnames=None):
+    """Writes rows (lists, or dicts when `fieldnames` is given) as CSV."""
+    import io
+    buffer = io.StringIO(newline="")
+    if fieldnames is not None:
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+        writer.writeheader()
+    else:
+        writer = csv.writer(buffer)
+    writer.writerows(rows)
+    write_text_atomic(file_path, buffer.getvalue())
+
+
+def read_csv_verified(file_path):
+    """Returns the CSV's rows as lists."""
+    import io
+    return list(csv.reader(io.StringIO(read_text_verified(file_path), newline="")))
+
+
+def read_csv_dicts_verified(file_path):
+    """Returns the CSV's rows as dicts keyed by the header row."""
+    import io
+    return list(csv.DictReader(io.StringIO(read_text_verified(file_path), newline="")))
+
+
+# --- Error Reporting ---
+#
+# The headless tracker daemon imports this module, so it can't show dialogs
+# itself. The app registers messagebox.showerror at startup; until something is
+# registered (and always in the daemon) errors are printed.
+
+def _print_error(title, message):
+    print(f"{title}: {message}")
+
+
+_error_reporter = _print_error
+
+
+def set_error_reporter(reporter):
+    """Sends user-facing errors to `reporter(title, message)`; None goes back to printing."""
+    global _error_reporter
+    _error_reporter = reporter or _print_error
+
+
+def report_error(title, message):
+    """Reports an error to the user through the registered reporter."""
+    try:
+        _error_reporter(title, message)
+    except Exception as e:
+        # e.g. a dialog from a thread without a Tk root
+        print(f"{title}: {message} (could not be shown: {e})")
+
 
 # --- Config Read/Write Helpers ---
 
 def read_config(file_path=CONFIG_FILE):
     """Reads the configuration from the config.csv file, creating it if necessary."""
     config = {}
-    if not os.path.exists(file_path):
+    if not data_file_exists(file_path):
         initial_data = {
             'User First Name': '', 
             'User Email': '', 
@@ -79,68 +282,60 @@ def read_config(file_path=CONFIG_FILE):
         return initial_data
         
     try:
-        with open(file_path, 'r', newline='') as file:
-            reader = csv.reader(file)
-            for row in reader:
-                if len(row) >= 2:
-                    config[row[0].strip()] = ','.join(row[1:]).strip()
+        for row in read_csv_verified(file_path):
+            if len(row) >= 2:
+                config[row[0].strip()] = ','.join(row[1:]).strip()
     except Exception as e:
-        messagebox.showerror("Config Error", f"Error reading config file: {e}")
+        report_error("Config Error", f"Error reading config file: {e}")
         
     return config
 
 def write_config(config_dict, file_path=CONFIG_FILE):
     """Writes the configuration dictionary back to the config.csv file."""
     try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w', newline='') as file:
-            writer = csv.writer(file)
-            for key, value in config_dict.items():
-                writer.writerow([key, value])
+        write_csv_atomic(file_path, [[key, value] for key, value in config_dict.items()])
     except Exception as e:
-        messagebox.showerror("Config Error", f"Error writing config file: {e}")
+        report_error("Config Error", f"Error writing config file: {e}")
+        return
+    # Imported here: config_service imports this module
+    from .config_service import config_written
+    config_written(file_path)
 
 # --- Google Sheets Integration Helper (Productivity Report - Fixed) ---
 
-def update_google_sheet(sheet_name="TaskSnapJournal", base_worksheet_name="Productivity Report"):
+def update_google_sheet(sheet_name="TaskSnapJournal", base_worksheet_name="Productivity Report", month=None, show_errors=True):
     """
-    Authenticates with Google Sheets, reads the local CSV, and updates the shared sheet.
-    It now creates a new worksheet monthly based on the current date.
+    Authenticates with Google Sheets, reads the month's counts from the local store, and updates the shared sheet.
+    It now creates a new worksheet monthly based on the current date, or on `month` ('MM-YYYY') when given.
+    `show_errors=False` suppresses the error dialog (for callers off the Tk thread, e.g. the outbound queue).
     """
+    import gspread
+    import pandas as pd
+    from .sheet_sync import sync_productivity_report
+    from .sheets_client import get_sheets_client
+
     try:
         if not os.path.exists(GSPREAD_CREDENTIALS_FILE):
             return "Error: Google Sheets credentials file not found. Please follow setup instructions."
             
-        gc = gspread.service_account(filename=GSPREAD_CREDENTIALS_FILE)
-
-        try:
-            sh = gc.open(sheet_name)
-        except gspread.exceptions.SpreadsheetNotFound:
-            sh = gc.create(sheet_name)
-        
         current_date = datetime.now()
+        month_year_str = month or current_date.strftime("%m-%Y")
         # --- NEW: Dynamic Worksheet Name ---
-        worksheet_name = f"{base_worksheet_name} - {current_date.strftime('%b %Y')}"
+        worksheet_name = f"{base_worksheet_name} - {datetime.strptime(month_year_str, '%m-%Y').strftime('%b %Y')}"
 
-        try:
-            worksheet = sh.worksheet(worksheet_name)
-        except gspread.exceptions.WorksheetNotFound:
-            # If the monthly sheet doesn't exist, create it
-            worksheet = sh.add_worksheet(title=worksheet_name, rows=1, cols=1)
-            
-        month_year_str = current_date.strftime("%m-%Y")
-        local_csv_path = os.path.join(TASK_DATA_FOLDER, f"tasks_{month_year_str}.csv")
+        from .data_store import get_data_store, PRODUCTIVITY_COLUMNS
+        rows = get_data_store().productivity_rows(month_year_str)
 
-        if not os.path.exists(local_csv_path):
+        if not rows:
             return "No local data to upload."
             
-        df = pd.read_csv(local_csv_path)
+        df = pd.DataFrame(rows, columns=PRODUCTIVITY_COLUMNS)
 
         if df.empty:
             return "No data to upload."
 
-        config = read_config()
-        employee_name = config.get('User First Name', 'Unknown User')
+        from .config_service import get_config
+        employee_name = get_config().get('User First Name', 'Unknown User')
         
         # --- Data Transformation: Robust Flattening and Renaming ---
         
@@ -198,209 +393,75 @@ def update_google_sheet(sheet_name="TaskSnapJournal", base_worksheet_name="Produ
         total_value = sum(cleaned_row[2:])
         cleaned_row.append(total_value) # This makes the row length 13 (A-M)
 
-        # --- Check for existing headers and create them if necessary ---
-        existing_data = worksheet.get_all_values()
-        
-        headers_exist = len(existing_data) >= 2 and existing_data[0][0] == 'Employee Name'
-
-        if not headers_exist:
-            # Corrected header layout to match 13 columns (A-M)
-            header_row_1 = ['Employee Name', 'Data Submitted', 'Packages', 'Packages', 'Packages', 'QA', 'QA', 'QA', 'Incident', 'Incident', 'Incident', 'PRF Creation', 'Total']
-            header_row_2 = ['', '', 'Simple', 'Medium', 'Complex', 'Simple', 'Medium', 'Complex', 'P1', 'P2', 'P3', 'Simple', '']
-            worksheet.update('A1', [header_row_1, header_row_2])
-
-            # ===== FORMAT THE HEADER ROWS =====
-            worksheet.format('A1:M2', {
-                'backgroundColor': {'red': 0.26, 'green': 0.52, 'blue': 0.96},
-                'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}},
-                'horizontalAlignment': 'CENTER',
-                'verticalAlignment': 'MIDDLE'
-            })
-
-            # Merge cells for main category headers
-            worksheet.merge_cells('A1:A2')
-            worksheet.merge_cells('B1:B2')
-            worksheet.merge_cells('C1:E1')
-            worksheet.merge_cells('F1:H1')
-            worksheet.merge_cells('I1:K1')
-            worksheet.merge_cells('L1:L2')
-            worksheet.merge_cells('M1:M2')
-
-            existing_data = worksheet.get_all_values()
-
-        # --- Check for existing row and update instead of appending ---
-        update_row_index = -1
-        
-        # Start checking from row 3 (index 2) onwards to skip the two header rows
-        # --- FIX: Match ONLY Employee Name ---
-        # NOTE: We iterate over the entire dataset starting from the first potential data row (index 2)
-        for i, row in enumerate(existing_data[2:]):
-            # We assume a single row per employee per month for repeated updates.
-            if len(row) > 0 and row[0] == employee_name:
-                update_row_index = i + 3 # +3 accounts for 0-based index and 2 header rows skipped (A1, A2)
-                break
-        
-        if update_row_index != -1:
-            # Corrected the cell range to M to match the 13 columns (A to M)
-            cell_range = f'A{update_row_index}:M{update_row_index}'
-            worksheet.update(cell_range, [cleaned_row], value_input_option='USER_ENTERED')
-
-            # Format the updated row with center alignment
-            worksheet.format(cell_range, {
-                'horizontalAlignment': 'CENTER',
-                'verticalAlignment': 'MIDDLE'
-            })
-
+        # Client, spreadsheet and worksheet handles are cached for the whole process
+        # (the monthly worksheet is created first if it doesn't exist yet)
+        worksheet, _ = get_sheets_client().worksheet(sheet_name, worksheet_name)
+        # Headers, the employee's row and its formatting go out in one batch after a single read
+        result = sync_productivity_report(worksheet, cleaned_row)
+        if result == 'updated':
             return f"Success: Data for {current_date.strftime('%b %d')} updated in '{worksheet_name}'."
-        else:
-            # If the employee is not found, append a new row
-            worksheet.append_row(cleaned_row, value_input_option='USER_ENTERED')
-
-            # Format the newly appended row
-            new_row_num = len(worksheet.get_all_values())
-            worksheet.format(f'A{new_row_num}:M{new_row_num}', {
-                'horizontalAlignment': 'CENTER',
-                'verticalAlignment': 'MIDDLE'
-            })
-
-            return f"Success: New data row appended to '{worksheet_name}'."
+        return f"Success: New data row appended to '{worksheet_name}'."
 
     except FileNotFoundError:
         return "Error: Google Sheets credentials file not found. Please follow setup instructions."
     except gspread.exceptions.WorksheetNotFound as e:
         # This should only catch the case where the base sheet name is wrong, but the dynamic name logic should handle the monthly creation
+        get_sheets_client().invalidate()
         return f"Error: Worksheet '{worksheet_name}' not found. Please check the name or retry."
     except gspread.exceptions.SpreadsheetNotFound:
+        get_sheets_client().invalidate()
         return f"Error: Spreadsheet '{sheet_name}' not found. Please check the name and sharing permissions."
     except Exception as e:
         # This catches generic errors like DimensionMismatch
-        messagebox.showerror("Google Sheets Warning", f"An unexpected error occurred during Google Sheets update:\n{e.__class__.__name__}: {e}")
+        # Cached handles may be stale (revoked token, deleted worksheet); start clean next time
+        get_sheets_client().invalidate()
+        if show_errors:
+            report_error("Google Sheets Warning", f"An unexpected error occurred during Google Sheets update:\n{e.__class__.__name__}: {e}")
         return f"An unexpected error occurred during Google Sheets update: {e.__class__.__name__}: {e}"
 
 # --- Screen Time Report Update (Wide/Daily Column Format - FINAL FIX) ---
 
-def update_google_sheet_screen_time(sheet_name="TaskSnapJournal", base_worksheet_name="Screen Time Report", user_screen_time_data=None):
+def update_google_sheet_screen_time(sheet_name="TaskSnapJournal", base_worksheet_name="Screen Time Report", user_screen_time_data=None,
+                                    day=None, show_errors=True):
     """
     Authenticates with Google Sheets and updates the shared screen time sheet in a wide format:
     Employee Name | Last Updated On | Date 1 | Date 2 | ...
+    The total goes in today's column, or in the column for `day` ('YYYY-MM-DD') when given.
+    Row/column positions come from a local index (see sheet_sync.py), so the upload
+    doesn't download the whole sheet.
     """
     
     if user_screen_time_data is None:
         return "Error: No screen time data provided."
-    
-    # --- Define Fixed Structure ---
-    HEADERS_BASE = ['Employee Name', 'Last Updated On']
-    MIN_COLS = len(HEADERS_BASE) + 10 # Ensure at least 12 columns for future dates
+
+    from .sheet_sync import SheetIndex, SCREEN_TIME_MIN_COLS, sync_screen_time
+    from .sheets_client import get_sheets_client
     
     try:
         if not os.path.exists(GSPREAD_CREDENTIALS_FILE):
             return "Error: Google Sheets credentials file not found."
             
-        gc = gspread.service_account(filename=GSPREAD_CREDENTIALS_FILE)
-
-        try:
-            sh = gc.open(sheet_name)
-        except gspread.exceptions.SpreadsheetNotFound:
-            sh = gc.create(sheet_name)
-
-        try:
-            worksheet = sh.worksheet(base_worksheet_name)
-        except gspread.exceptions.WorksheetNotFound:
-            # Create a new sheet with initial headers and enough columns
-            worksheet = sh.add_worksheet(title=base_worksheet_name, rows=1, cols=MIN_COLS)
-            worksheet.update('A1', [HEADERS_BASE])
-
-            # ===== FORMAT THE HEADER ROW =====
-            worksheet.format('A1:L1', {
-                'backgroundColor': {'red': 0.26, 'green': 0.52, 'blue': 0.96},  # Blue color
-                'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}},  # White text
-                'horizontalAlignment': 'CENTER',
-                'verticalAlignment': 'MIDDLE'
-            })
-        
-        config = read_config()
-        employee_name = config.get('User First Name', 'Unknown User')
+        from .config_service import get_config
+        employee_name = get_config().get('User First Name', 'Unknown User')
         
         # Prepare data for today
-        current_date_obj = date.today()
+        current_date_obj = date.fromisoformat(day) if day else date.today()
         # Use simple date format (e.g., 10/4, 10/5) for column header as shown in the image
-        date_header_str = current_date_obj.strftime("%#m/%#d").replace('#', '') 
+        date_header_str = f"{current_date_obj.month}/{current_date_obj.day}"
         
-        # 1. Calculate Total App Time in Hours (App Usage Only)
+        # Total App Time in Hours (App Usage Only)
         total_app_time_seconds = sum(user_screen_time_data.get("usage", {}).values())
         total_time_hrs_str = f"{round(total_app_time_seconds / 3600, 2)}hrs"
-        
-        # 2. Get all existing headers and data
-        existing_headers = worksheet.row_values(1) # CRITICAL FIX: Get headers from Row 1
-        existing_data = worksheet.get_all_values()
-        
-        # CRITICAL: Ensure the sheet has enough columns right now.
-        if worksheet.col_count < MIN_COLS:
-             worksheet.resize(cols=MIN_COLS)
-             # Refetch to be safe
-             existing_headers = worksheet.row_values(1)
-             existing_data = worksheet.get_all_values()
-
-        # --- Find or Create Date Column (Today's Date) ---
-        
-        date_col_index = -1 # 0-based index
-        
-        try:
-            # Safely try to find the column index of today's date header (e.g., '10/4')
-            date_col_index = existing_headers.index(date_header_str)
-        except ValueError:
-            # Date column doesn't exist, so we must add it as the last column
-            
-            # 1. Get the new column index (1-based for gspread update)
-            new_col_index = len(existing_headers) + 1
-            
-            # 2. Update the header row using update_cell (SAFEST METHOD)
-            worksheet.update_cell(1, new_col_index, date_header_str)
-            
-            # 3. Update internal header list and column index
-            existing_headers.append(date_header_str)
-            date_col_index = len(existing_headers) - 1 # 0-based index
 
-            # Check for worksheet resize needed if we've gone past the MIN_COLS buffer
-            if new_col_index > worksheet.col_count:
-                 worksheet.resize(cols=new_col_index)
-        
-        # --- Find or Create Employee Row ---
-        
-        employee_row_index = -1 # 1-based index (row 1 is header)
-        
-        # Search for employee row starting from row 2 (index 1 in existing_data)
-        for i, row in enumerate(existing_data[1:]):
-            if row and row[0] == employee_name:
-                employee_row_index = i + 2 # +2 because we skipped the header row (index 0)
-                break
-        
-        if employee_row_index == -1:
-            # Employee not found, append a new row
-            timestamp_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # CRITICAL FIX: Pad the new row with empty strings up to the required column count
-            # This prevents the 'Invalid value' API error when trying to update a new, short row.
-            padded_row = [employee_name, timestamp_str] + [''] * (len(existing_headers) - 2)
-            
-            worksheet.append_row(padded_row, value_input_option='USER_ENTERED')
-            
-            # Get the new row index (last row number)
-            existing_data = worksheet.get_all_values()
-            employee_row_index = len(existing_data)
-        
-        # --- Update the Specific Cell ---
-        
-        # 1. Update the total time cell
-        # Column index is 0-based, gspread cell operations are 1-based.
-        worksheet.update_cell(employee_row_index, date_col_index + 1, total_time_hrs_str)
-        
-        # 2. Update the "Last Updated On" cell (Column B)
-        worksheet.update_cell(employee_row_index, 2, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        worksheet, created = get_sheets_client().worksheet(sheet_name, base_worksheet_name, cols=SCREEN_TIME_MIN_COLS)
+        sync_screen_time(worksheet, created, employee_name, date_header_str, total_time_hrs_str,
+                         datetime.now().strftime("%Y-%m-%d %H:%M:%S"), SheetIndex())
         
         return f"Success: Screen time data for {date_header_str} updated in wide format."
 
     except Exception as e:
+        get_sheets_client().invalidate()
         error_message = f"An unexpected error occurred during Google Sheets update:\n{e.__class__.__name__}: {e}"
-        messagebox.showerror("Google Sheets Warning", error_message)
+        if show_errors:
+            report_error("Google Sheets Warning", error_message)
         return error_message
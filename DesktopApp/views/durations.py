@@ -0,0 +1,29 @@
+# views/durations.py
+"""
+Integer-millisecond duration accounting for screen time.
+
+Tracked time is measured from interval boundaries: each clock reading is turned
+into whole milliseconds once, and a span's duration is the difference of its
+two boundaries. Consecutive spans share a boundary, so their durations add up to
+exactly the time between the first and last reading - no floating-point drift
+however many spans a day has. Totals are kept as ints and only turned back into
+seconds for display and saving, where a millisecond value has a short repr
+(3723.456 rather than 3723.4560000000233).
+"""
+
+MS_PER_SECOND = 1000
+
+
+def to_ms(seconds):
+    """Whole milliseconds for a time or duration in seconds."""
+    return int(round(seconds * MS_PER_SECOND))
+
+
+def to_seconds(ms):
+    """Seconds for a millisecond value, exact to the millisecond."""
+    return ms / MS_PER_SECOND
+
+
+def totals_to_seconds(totals):
+    """{key: ms} -> {key: seconds}, e.g. for saving or display."""
+    return {key: to_seconds(ms) for key, ms in totals.items()}
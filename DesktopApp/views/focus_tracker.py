@@ -0,0 +1,422 @@
+# views/focus_tracker.py
+"""
+Pluggable "focus sources" for the screen time tracker.
+
+A focus source answers two questions: which window title is in front right now,
+and "wake me when that might have changed". The tracker thread blocks inside
+wait() instead of spinning, so CPU cost scales with how often the user switches
+windows rather than with a fixed polling rate.
+
+Spans are measured on the monotonic clock, so wall-clock steps (NTP, DST, a
+user changing the time) never make them negative or huge. The wall clock is
+only used to timestamp spans. A wait never lasts much longer than the
+heartbeat, so a span far longer than that means the machine was suspended
+(sleep, hibernate, a stalled VM); that time is reported separately instead of
+being attributed to the window that happened to be in front.
+"""
+import sys
+import time
+import threading
+
+from .durations import to_ms
+
+# Longest the tracker sleeps without a focus change. Keeps day rollover, break
+# reminders and the 5 second chart refresh fed while one window stays in front.
+HEARTBEAT_SECONDS = 5.0
+
+# Heartbeat used in low-power mode, e.g. while the user is idle
+LOW_POWER_HEARTBEAT_SECONDS = 30.0
+
+# A span longer than this counts as a suspend. Must stay well above the low-power
+# heartbeat; overridable via 'Suspend Gap Minutes' in config.csv
+DEFAULT_SUSPEND_GAP_SECONDS = 120.0
+
+# Adaptive polling fallback: start at 1s and back off while nothing changes.
+POLL_MIN_SECONDS = 1.0
+POLL_MAX_SECONDS = 5.0
+POLL_BACKOFF = 1.5
+
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+
+def process_name_for_hwnd(hwnd):
+    """Returns the executable name (e.g. 'chrome.exe') owning a window, or None. Windows only."""
+    if sys.platform != "win32" or not hwnd:
+        return None
+    try:
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+
+        pid = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
+        if not handle:
+            return None
+        try:
+            size = wintypes.DWORD(260)
+            buffer = ctypes.create_unicode_buffer(size.value)
+            if not kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+                return None
+            return buffer.value.replace("/", "\\").rsplit("\\", 1)[-1]
+        finally:
+            kernel32.CloseHandle(handle)
+    except Exception:
+        return None
+
+
+class FocusSource:
+    """Base class for all focus backends."""
+
+    def __init__(self, clock=time.monotonic, wall_clock=time.time):
+        # clock measures spans; wall_clock only timestamps them
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.wakeups = 0
+        self.started_at = None
+
+    def start(self):
+        self.started_at = self.clock()
+
+    def stop(self):
+        pass
+
+    def set_low_power(self, enabled):
+        """Hints that focus changes don't need prompt detection right now."""
+        pass
+
+    def current_title(self):
+        """Returns the title of the foreground window, or None."""
+        raise NotImplementedError
+
+    def current_process(self):
+        """Returns the executable name of the foreground window, or None if unknown."""
+        return None
+
+    def wait(self, timeout):
+        """Blocks until focus may have changed or `timeout` elapses. Returns True on a change."""
+        raise NotImplementedError
+
+    def wakeups_per_hour(self):
+        """Average number of times wait() returned per hour since start()."""
+        if self.started_at is None:
+            return 0.0
+        elapsed = self.clock() - self.started_at
+        if elapsed <= 0:
+            return 0.0
+        return self.wakeups * 3600.0 / elapsed
+
+
+class AdaptivePollFocusSource(FocusSource):
+    """Polls pygetwindow at a coarse interval that backs off while focus is stable."""
+
+    def __init__(self, min_interval=POLL_MIN_SECONDS, max_interval=POLL_MAX_SECONDS, backoff=POLL_BACKOFF):
+        super().__init__()
+        import pygetwindow as gw
+        self._gw = gw
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self._normal_max_interval = max_interval
+        self._stop_event = threading.Event()
+        self._last_title = None
+
+    def start(self):
+        super().start()
+        self._stop_event.clear()
+        self._last_title = self.current_title()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def set_low_power(self, enabled):
+        self.max_interval = LOW_POWER_HEARTBEAT_SECONDS if enabled else self._normal_max_interval
+        self.interval = min(self.interval, self.max_interval)
+
+    def current_title(self):
+        try:
+            window = self._gw.getActiveWindow()
+            return window.title if window and window.title else None
+        except Exception:
+            return None
+
+    def current_process(self):
+        try:
+            window = self._gw.getActiveWindow()
+            return process_name_for_hwnd(getattr(window, "_hWnd", None)) if window else None
+        except Exception:
+            return None
+
+    def wait(self, timeout):
+        self._stop_event.wait(min(self.interval, timeout))
+        self.wakeups += 1
+
+        title = self.current_title()
+        changed = title != self._last_title
+        self._last_title = title
+
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return changed
+
+
+class WinEventFocusSource(FocusSource):
+    """
+    Event-driven backend for Windows. A hook thread receives EVENT_SYSTEM_FOREGROUND
+    (focus moved to another window) and EVENT_OBJECT_NAMECHANGE on the foreground
+    window (e.g. a browser tab switch), so the tracker only wakes when it matters.
+    """
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+    WM_QUIT = 0x0012
+
+    def __init__(self):
+        super().__init__()
+        import ctypes
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self._user32 = ctypes.windll.user32
+        self._changed = threading.Event()
+        self._ready = threading.Event()
+        self._thread = None
+        self._thread_id = None
+        self._hooks = []
+        self.hook_ok = False
+
+        self._WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        # Keep a reference so the callback is not garbage collected while hooked
+        self._callback = self._WinEventProc(self._on_event)
+
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        if event == self.EVENT_OBJECT_NAMECHANGE:
+            if id_object != self.OBJID_WINDOW or hwnd != self._user32.GetForegroundWindow():
+                return
+        self._changed.set()
+
+    def _hook_loop(self):
+        kernel32 = self._ctypes.windll.kernel32
+        self._thread_id = kernel32.GetCurrentThreadId()
+        flags = self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+        for event in (self.EVENT_SYSTEM_FOREGROUND, self.EVENT_OBJECT_NAMECHANGE):
+            hook = self._user32.SetWinEventHook(event, event, 0, self._callback, 0, 0, flags)
+            if hook:
+                self._hooks.append(hook)
+        self.hook_ok = bool(self._hooks)
+        self._ready.set()
+        if not self.hook_ok:
+            return
+
+        # Hooks are delivered through this thread's message queue
+        msg = self._wintypes.MSG()
+        while self._user32.GetMessageW(self._ctypes.byref(msg), 0, 0, 0) > 0:
+            self._user32.TranslateMessage(self._ctypes.byref(msg))
+            self._user32.DispatchMessageW(self._ctypes.byref(msg))
+
+        for hook in self._hooks:
+            self._user32.UnhookWinEvent(hook)
+        self._hooks = []
+
+    def start(self):
+        super().start()
+        self._thread = threading.Thread(target=self._hook_loop, daemon=True)
+        self._thread.start()
+        self._ready.wait(2.0)
+        if not self.hook_ok:
+            raise OSError("SetWinEventHook failed")
+
+    def stop(self):
+        if self._thread_id is not None:
+            self._user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+        self._changed.set()
+
+    def current_title(self):
+        hwnd = self._user32.GetForegroundWindow()
+        if not hwnd:
+            return None
+        length = self._user32.GetWindowTextLengthW(hwnd)
+        if length <= 0:
+            return None
+        buffer = self._ctypes.create_unicode_buffer(length + 1)
+        self._user32.GetWindowTextW(hwnd, buffer, length + 1)
+        return buffer.value or None
+
+    def current_process(self):
+        return process_name_for_hwnd(self._user32.GetForegroundWindow())
+
+    def wait(self, timeout):
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        self.wakeups += 1
+        return changed
+
+
+class ScriptedFocusSource(FocusSource):
+    """
+    Fake backend driven by a scripted timeline and a simulated clock, so tracker
+    accuracy and wakeups-per-hour can be checked headlessly on any platform.
+
+    `timeline` is a list of (seconds_from_start, title) or
+    (seconds_from_start, title, process) tuples; title may be None.
+
+    `suspends` is a list of (seconds_from_start, duration): the machine sleeps at
+    that point, so the wait in progress returns `duration` seconds late.
+    `clock_jumps` is a list of (seconds_from_start, seconds): the wall clock is
+    stepped by that much (negative for backwards) while the monotonic clock runs on.
+    """
+
+    def __init__(self, timeline, start_time=0.0, suspends=(), clock_jumps=(), wall_start=None):
+        self._now = float(start_time)
+        # The wall clock starts out equal to the simulated one unless wall_start is given
+        self._wall_offset = float(wall_start) - self._now if wall_start is not None else 0.0
+        super().__init__(clock=lambda: self._now, wall_clock=lambda: self._now + self._wall_offset)
+        self._start_time = float(start_time)
+        self._timeline = sorted(timeline, key=lambda item: item[0])
+        self._index = 0
+        self._suspends = sorted(suspends)
+        self._clock_jumps = sorted(clock_jumps)
+        self.suspended_seconds = 0.0
+        self._title = None
+        self._process = None
+        self._apply_due_events()
+
+    def _apply_due_events(self):
+        while self._clock_jumps and self._start_time + self._clock_jumps[0][0] <= self._now:
+            self._wall_offset += self._clock_jumps.pop(0)[1]
+
+        changed = False
+        while self._index < len(self._timeline) and self._start_time + self._timeline[self._index][0] <= self._now:
+            event = self._timeline[self._index]
+            new_title = event[1]
+            new_process = event[2] if len(event) > 2 else None
+            changed = changed or new_title != self._title or new_process != self._process
+            self._title = new_title
+            self._process = new_process
+            self._index += 1
+        return changed
+
+    def advance(self, seconds):
+        """Moves the simulated clock forward without waking the tracker."""
+        self._now += seconds
+        self._apply_due_events()
+
+    def current_title(self):
+        return self._title
+
+    def current_process(self):
+        return self._process
+
+    def wait(self, timeout):
+        deadline = self._now + timeout
+        if self._index < len(self._timeline):
+            deadline = min(deadline, self._start_time + self._timeline[self._index][0])
+        if self._suspends and self._start_time + self._suspends[0][0] <= deadline:
+            # Asleep mid-wait: the wait only returns once the machine resumes
+            at, duration = self._suspends.pop(0)
+            deadline = max(self._now, self._start_time + at) + duration
+            self.suspended_seconds += duration
+        self._now = deadline
+        self.wakeups += 1
+        return self._apply_due_events()
+
+
+def suspend_gap_from_config(config):
+    """Reads 'Suspend Gap Minutes' from the config dict, falling back to the default."""
+    try:
+        minutes = float(config.get('Suspend Gap Minutes', ''))
+        if minutes > 0:
+            return max(minutes * 60, LOW_POWER_HEARTBEAT_SECONDS * 2)
+    except (TypeError, ValueError):
+        pass
+    return DEFAULT_SUSPEND_GAP_SECONDS
+
+
+def create_focus_source():
+    """Returns the best focus source available on this platform."""
+    if sys.platform == "win32":
+        try:
+            source = WinEventFocusSource()
+            source.start()
+            return source
+        except Exception as e:
+            print(f"Event-driven focus tracking unavailable, falling back to polling: {e}")
+    source = AdaptivePollFocusSource()
+    source.start()
+    return source
+
+
+class FocusTracker:
+    """
+    Turns focus-source wakeups into attributed spans. Each span is reported to
+    `on_span(title, process, elapsed_ms, suspended_ms)` for the window that was in
+    front for that span. Durations are whole milliseconds between consecutive
+    monotonic clock readings, so the spans always add up exactly to the time
+    tracked. Of a span longer than `suspend_gap`, only the heartbeat the tracker
+    was waiting for is attributed; the rest is reported as suspended_ms.
+    """
+
+    def __init__(self, source, heartbeat=HEARTBEAT_SECONDS, low_power_heartbeat=LOW_POWER_HEARTBEAT_SECONDS,
+                 suspend_gap=DEFAULT_SUSPEND_GAP_SECONDS):
+        self.source = source
+        self.normal_heartbeat = heartbeat
+        self.low_power_heartbeat = low_power_heartbeat
+        self.heartbeat = heartbeat
+        self.suspend_gap = suspend_gap
+        self.suspends = 0
+        self.low_power = False
+        self.current_title = None
+        self.current_process = None
+        self.last_update_time = None
+        self._last_update_ms = None
+
+    def set_low_power(self, enabled):
+        """Switches to the long heartbeat, e.g. while the user is away from the desk."""
+        if enabled == self.low_power:
+            return
+        self.low_power = enabled
+        self.heartbeat = self.low_power_heartbeat if enabled else self.normal_heartbeat
+        self.source.set_low_power(enabled)
+
+    def split_gap(self, elapsed_ms, heartbeat):
+        """Splits a measured span into (attributed, suspended) ms."""
+        if elapsed_ms <= 0:
+            # Only a misbehaving clock goes backwards; attribute nothing
+            return 0, 0
+        if elapsed_ms <= to_ms(self.suspend_gap):
+            return elapsed_ms, 0
+        self.suspends += 1
+        attributed = min(elapsed_ms, to_ms(heartbeat))
+        return attributed, elapsed_ms - attributed
+
+    def run(self, is_running, on_span):
+        """Blocks until `is_running()` returns False."""
+        self.current_title = self.source.current_title()
+        self.current_process = self.source.current_process()
+        self.last_update_time = self.source.clock()
+        self._last_update_ms = to_ms(self.last_update_time)
+
+        while is_running():
+            heartbeat = self.heartbeat
+            self.source.wait(heartbeat)
+            now = self.source.clock()
+            now_ms = to_ms(now)
+            elapsed_ms, suspended_ms = self.split_gap(now_ms - self._last_update_ms, heartbeat)
+            try:
+                on_span(self.current_title, self.current_process, elapsed_ms, suspended_ms)
+            except Exception as e:
+                print(f"Error while recording focus span: {e}")
+            self.last_update_time = now
+            self._last_update_ms = now_ms
+            self.current_title = self.source.current_title()
+            self.current_process = self.source.current_process()
@@ -0,0 +1,116 @@
+# views/idle_detector.py
+"""
+Idle/AFK detection for the screen time tracker.
+
+An activity source reports how long ago the user last touched the keyboard or
+mouse. The IdleDetector uses that to split each tracked span into active time
+(attributed to the foreground app) and idle time (recorded in its own bucket).
+"""
+import sys
+import time
+
+IDLE_BUCKET = "Idle"
+
+# Default idle threshold, overridable via 'Idle Threshold Minutes' in config.csv
+DEFAULT_IDLE_THRESHOLD_SECONDS = 300
+
+
+class ActivitySource:
+    """Base class for input-activity backends."""
+
+    def seconds_since_input(self):
+        """Seconds since the last keyboard/mouse input, or None if unknown."""
+        return None
+
+
+class Win32LastInputSource(ActivitySource):
+    """Uses GetLastInputInfo, which covers all input on the interactive desktop."""
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", wintypes.UINT), ("dwTime", wintypes.DWORD)]
+
+        self._ctypes = ctypes
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._info = LASTINPUTINFO()
+        self._info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+
+    def seconds_since_input(self):
+        if not self._user32.GetLastInputInfo(self._ctypes.byref(self._info)):
+            return None
+        # Both tick counts are 32-bit milliseconds and wrap every ~49.7 days
+        millis = (self._kernel32.GetTickCount() - self._info.dwTime) & 0xFFFFFFFF
+        return millis / 1000.0
+
+
+class ScriptedActivitySource(ActivitySource):
+    """Fake backend: reports input at the given times on a (usually simulated) clock."""
+
+    def __init__(self, input_times, clock=time.time):
+        self.input_times = sorted(input_times)
+        self.clock = clock
+
+    def seconds_since_input(self):
+        now = self.clock()
+        past = [t for t in self.input_times if t <= now]
+        if not past:
+            return None
+        return now - past[-1]
+
+
+def create_activity_source():
+    """Returns the best activity source available on this platform."""
+    if sys.platform == "win32":
+        try:
+            return Win32LastInputSource()
+        except Exception as e:
+            print(f"Idle detection unavailable: {e}")
+    return ActivitySource()
+
+
+def idle_threshold_from_config(config):
+    """Reads 'Idle Threshold Minutes' from the config dict, falling back to the default."""
+    try:
+        minutes = float(config.get('Idle Threshold Minutes', ''))
+        if minutes > 0:
+            return minutes * 60
+    except (TypeError, ValueError):
+        pass
+    return DEFAULT_IDLE_THRESHOLD_SECONDS
+
+
+class IdleDetector:
+    """Tracks whether the user is away and splits spans into active and idle time."""
+
+    def __init__(self, source, threshold=DEFAULT_IDLE_THRESHOLD_SECONDS):
+        self.source = source
+        self.threshold = threshold
+        self.is_idle = False
+
+    def split(self, elapsed):
+        """
+        Splits a span of `elapsed` seconds that ends now into (active, idle) seconds.
+        The first `threshold` seconds after the last input still count as active
+        (reading, watching a video); idle time starts when the threshold is crossed,
+        so it does not depend on how late the tracker woke up to notice.
+        """
+        since_input = self.source.seconds_since_input()
+        if since_input is None:
+            self.is_idle = False
+            return elapsed, 0.0
+
+        if since_input >= self.threshold:
+            idle = min(elapsed, since_input - self.threshold)
+            self.is_idle = True
+        elif self.is_idle:
+            # The user came back during this span; only the tail after their input is active
+            idle = max(0.0, elapsed - since_input)
+            self.is_idle = False
+        else:
+            idle = 0.0
+
+        return elapsed - idle, idle
@@ -0,0 +1,406 @@
+# views/outbound_queue.py
+"""
+Durable outbound job queue for Google Sheets uploads and report emails.
+
+Uploads used to run inline: on the Tk thread when saving, and on shutdown in
+stop_tracking, where a network timeout held up app exit and a failed upload was
+simply lost. Now callers enqueue() a job and return at once. Each job is
+spooled to its own file under the Outbox folder before enqueue() returns, and a
+worker thread drains the folder, retrying failures with exponential backoff.
+Jobs left over when the app exits are picked up on the next start.
+
+Jobs that share a `key` supersede each other: only the latest daily screen time
+total, or the latest state of a month's productivity report, is worth sending,
+so enqueueing a newer one replaces whatever is still waiting. Report emails are
+keyed too, but never replaced: asking again while one is waiting (or being
+sent) keeps the one already queued, so nobody gets the same report twice.
+
+Sending is done by backends, one callable per job kind taking the payload.
+A backend returns normally on success, raises PermanentJobError for jobs that
+can never succeed, and raises anything else to be retried. A job that fails
+permanently, or is still failing after MAX_ATTEMPTS tries, is moved to the
+Failed subfolder (the dead letters) with its last error, and is not retried.
+default_backends() wires up the real Sheets/email code; LocalBackend is a
+stand-in that records payloads and can be told to fail.
+
+A job is claimed while it is being sent, so the worker and run_due() never
+send the same job at once.
+"""
+import os
+import re
+import json
+import time
+import uuid
+import threading
+
+from .data_utils import OUTBOX_FOLDER, read_json_verified, write_text_atomic
+
+KIND_SCREEN_TIME = "screen_time"
+KIND_PRODUCTIVITY = "productivity"
+KIND_EMAIL = "email"
+
+BASE_BACKOFF_SECONDS = 5.0
+MAX_BACKOFF_SECONDS = 30 * 60.0
+# About two hours of retrying with the backoff above
+MAX_ATTEMPTS = 12
+JOB_SUFFIX = ".json"
+DEAD_LETTER_FOLDER_NAME = "Failed"
+
+
+class PermanentJobError(Exception):
+    """Raised by a backend for a job that retrying cannot fix."""
+
+
+def backoff_delay(attempts, base=BASE_BACKOFF_SECONDS, cap=MAX_BACKOFF_SECONDS):
+    """Seconds to wait after the `attempts`-th failure: base, 2*base, 4*base, ... up to cap."""
+    return min(cap, base * (2 ** max(0, attempts - 1)))
+
+
+def _job_filename(key):
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', key) + JOB_SUFFIX
+
+
+class OutboundQueue:
+    """Spools jobs to disk and sends them from a worker thread."""
+
+    def __init__(self, folder=OUTBOX_FOLDER, backends=None, clock=time.time, max_attempts=MAX_ATTEMPTS):
+        self.folder = folder
+        self.dead_letter_folder = os.path.join(folder, DEAD_LETTER_FOLDER_NAME)
+        self.backends = dict(backends or {})
+        self.clock = clock
+        self.max_attempts = max_attempts
+        self._jobs = {}       # key -> job dict (mirrors the spool folder)
+        self._callbacks = {}  # job id -> on_result, in memory only
+        self._inflight = set()  # keys of jobs being sent right now
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self.sent = 0
+        self.failures = 0
+        os.makedirs(folder, exist_ok=True)
+        self._load_spool()
+
+    # --- Spool ---
+
+    def _path(self, job):
+        return os.path.join(self.folder, _job_filename(job["key"]))
+
+    def _load_spool(self):
+        for filename in sorted(os.listdir(self.folder)):
+            if not filename.endswith(JOB_SUFFIX):
+                continue
+            path = os.path.join(self.folder, filename)
+            try:
+                job = read_json_verified(path)
+                self._jobs[job["key"]] = job
+            except Exception as e:
+                print(f"Skipping unreadable outbound job {path}: {e}")
+
+    def _write(self, job):
+        # The queue is the only copy of the job, but the file is rewritten on
+        # every attempt; the atomic rename is enough, no .bak needed
+        write_text_atomic(self._path(job), json.dumps(job), backup=False)
+
+    def _remove(self, job):
+        try:
+            os.remove(self._path(job))
+        except FileNotFoundError:
+            pass
+
+    def _dead_letter(self, job):
+        """Moves a job that will not be retried out of the spool, keeping it for inspection."""
+        job["failed_at"] = self.clock()
+        path = os.path.join(self.dead_letter_folder, f"{job['id']}{JOB_SUFFIX}")
+        try:
+            write_text_atomic(path, json.dumps(job), backup=False)
+        except Exception as e:
+            print(f"Error keeping failed outbound job {job['key']}: {e}")
+        self._remove(job)
+
+    def dead_letters(self):
+        """Jobs that failed for good, oldest first."""
+        if not os.path.isdir(self.dead_letter_folder):
+            return []
+        jobs = []
+        for filename in os.listdir(self.dead_letter_folder):
+            if filename.endswith(JOB_SUFFIX):
+                try:
+                    jobs.append(read_json_verified(os.path.join(self.dead_letter_folder, filename)))
+                except Exception as e:
+                    print(f"Skipping unreadable failed job {filename}: {e}")
+        return sorted(jobs, key=lambda job: job.get("failed_at", 0))
+
+    # --- Producer side (any thread) ---
+
+    def enqueue(self, kind, payload, key=None, on_result=None, replace=True):
+        """
+        Spools a job and wakes the worker. With a `key`, replaces any waiting
+        job with the same key, or with `replace=False` keeps the existing job
+        and returns its id. on_result(ok, message, will_retry) is called on
+        the worker thread after the job's first attempt (UI callers should hop
+        back to the Tk thread with after()). Returns the job id.
+        """
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "key": key or f"{kind}-{job_id}",
+            "kind": kind,
+            "payload": payload,
+            "attempts": 0,
+            "next_attempt_at": 0,
+            "created_at": self.clock(),
+        }
+        with self._cond:
+            superseded = self._jobs.get(job["key"])
+            if superseded is not None and not replace:
+                if on_result and superseded["attempts"] == 0:
+                    self._callbacks.setdefault(superseded["id"], on_result)
+                return superseded["id"]
+            if superseded is not None:
+                self._callbacks.pop(superseded["id"], None)
+            self._write(job)
+            self._jobs[job["key"]] = job
+            if on_result:
+                self._callbacks[job_id] = on_result
+            self._cond.notify_all()
+        return job_id
+
+    def pending(self):
+        """Jobs waiting to be sent, oldest first."""
+        with self._cond:
+            return sorted(self._jobs.values(), key=lambda job: job["created_at"])
+
+    # --- Worker ---
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stops the worker after its current job. Waiting jobs stay spooled."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _next_due(self):
+        """(job, seconds to wait): the earliest job not being sent and how long until it is due."""
+        waiting = [job for key, job in self._jobs.items() if key not in self._inflight]
+        if not waiting:
+            return None, None
+        job = min(waiting, key=lambda job: (job["next_attempt_at"], job["created_at"]))
+        return job, max(0.0, job["next_attempt_at"] - self.clock())
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    job, wait = self._next_due()
+                    if job is not None and wait == 0:
+                        break
+                    self._cond.wait(wait)
+                if not self._running:
+                    return
+            self.run_job(job)
+
+    def run_due(self):
+        """Sends every job that is due now on the calling thread. Returns how many were attempted."""
+        attempted = 0
+        while True:
+            with self._cond:
+                job, wait = self._next_due()
+            if job is None or wait > 0:
+                return attempted
+            if self.run_job(job):
+                attempted += 1
+
+    def run_job(self, job):
+        """
+        One attempt at `job`: done, dead-lettered, or rescheduled with backoff.
+        Returns False without sending if the job is being sent elsewhere, or
+        was already sent or superseded by the time it is claimed.
+        """
+        with self._cond:
+            current = self._jobs.get(job["key"])
+            if job["key"] in self._inflight or current is None or current["id"] != job["id"]:
+                return False
+            self._inflight.add(job["key"])
+        try:
+            self._attempt(job)
+        finally:
+            with self._cond:
+                self._inflight.discard(job["key"])
+                self._cond.notify_all()
+        return True
+
+    def _attempt(self, job):
+        backend = self.backends.get(job["kind"])
+        will_retry = False
+        try:
+            if backend is None:
+                raise PermanentJobError(f"No backend for job kind '{job['kind']}'")
+            message = backend(job["payload"]) or "Sent"
+            ok = True
+        except PermanentJobError as e:
+            ok, message = False, str(e)
+            print(f"Outbound {job['kind']} job failed permanently: {e}")
+        except Exception as e:
+            ok, message, will_retry = False, f"{e.__class__.__name__}: {e}", True
+
+        with self._cond:
+            callback = self._callbacks.pop(job["id"], None)
+            current = self._jobs.get(job["key"])
+            if current is not None and current["id"] == job["id"]:
+                # Still the latest job for its key (not superseded mid-send)
+                job["attempts"] += 1
+                if not ok:
+                    job["last_error"] = message
+                if will_retry and job["attempts"] >= self.max_attempts:
+                    will_retry = False
+                    print(f"Giving up on outbound {job['kind']} job after {job['attempts']} attempts")
+                if will_retry:
+                    job["next_attempt_at"] = self.clock() + backoff_delay(job["attempts"])
+                    try:
+                        self._write(job)
+                    except Exception as e:
+                        print(f"Error updating outbound job {job['key']}: {e}")
+                else:
+                    del self._jobs[job["key"]]
+                    if ok:
+                        self._remove(job)
+                    else:
+                        self._dead_letter(job)
+            if ok:
+                self.sent += 1
+            else:
+                self.failures += 1
+
+        if will_retry:
+            print(f"Outbound {job['kind']} job failed (attempt {job['attempts']}), will retry: {message}")
+        if callback:
+            try:
+                callback(ok, message, will_retry)
+            except Exception as e:
+                print(f"Error in outbound job callback: {e}")
+
+
+class LocalBackend:
+    """
+    Stand-in backend: records every payload it is given. Fails the first
+    `fail_times` calls with a retryable error (or PermanentJobError when
+    `permanent` is set).
+    """
+
+    def __init__(self, fail_times=0, permanent=False):
+        self.fail_times = fail_times
+        self.permanent = permanent
+        self.calls = []
+        self.delivered = []
+
+    def __call__(self, payload):
+        self.calls.append(payload)
+        if len(self.calls) <= self.fail_times:
+            if self.permanent:
+                raise PermanentJobError("Rejected by local backend")
+            raise ConnectionError("Local backend offline")
+        self.delivered.append(payload)
+        return "Delivered"
+
+
+# --- Real backends ---
+
+def _sheet_result(result):
+    """Maps the Sheets helpers' status strings onto the backend contract."""
+    if result.startswith("Success") or result.startswith("No "):
+        return result
+    if "credentials file not found" in result:
+        raise PermanentJobError(result)
+    raise RuntimeError(result)
+
+
+def send_screen_time(payload):
+    from .data_utils import update_google_sheet_screen_time
+    return _sheet_result(update_google_sheet_screen_time(
+        user_screen_time_data=payload["data"], day=payload["date"], show_errors=False))
+
+
+def send_productivity(payload):
+    from .data_utils import update_google_sheet
+    return _sheet_result(update_google_sheet(month=payload["month"], show_errors=False))
+
+
+def _email_result(error):
+    """
+    Maps an SMTP failure onto the backend contract: rejected credentials,
+    addresses or commands (and 5xx replies) are permanent; connection trouble
+    and 4xx replies are retried.
+    """
+    import smtplib
+    permanent = (smtplib.SMTPAuthenticationError, smtplib.SMTPRecipientsRefused,
+                 smtplib.SMTPSenderRefused, smtplib.SMTPNotSupportedError, ValueError)
+    if isinstance(error, permanent):
+        raise PermanentJobError(f"{error.__class__.__name__}: {error}") from error
+    if isinstance(error, smtplib.SMTPResponseException) and 500 <= error.smtp_code < 600:
+        raise PermanentJobError(f"{error.__class__.__name__}: {error}") from error
+    raise error
+
+
+def send_email(payload):
+    from .Send_Email import EmailSender
+    email_sender = EmailSender()
+    report_details = email_sender.format_report_details(payload["month"])
+    misc_tasks_details = email_sender.format_misc_task(payload["month"])
+    try:
+        email_sender.send_report_email(payload["manager_email"], payload["user_firstname"],
+                                       payload["user_email"], report_details, misc_tasks_details,
+                                       raise_errors=True)
+    except Exception as e:
+        _email_result(e)
+    return "Report sent"
+
+
+def default_backends():
+    return {
+        KIND_SCREEN_TIME: send_screen_time,
+        KIND_PRODUCTIVITY: send_productivity,
+        KIND_EMAIL: send_email,
+    }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_outbound_queue():
+    """The shared queue with the real backends, its worker started on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = OutboundQueue(backends=default_backends())
+            _queue.start()
+        return _queue
+
+
+def enqueue_screen_time_upload(day_data, on_result=None):
+    """Queues today's screen time total; supersedes any waiting upload for the same day."""
+    return get_outbound_queue().enqueue(KIND_SCREEN_TIME, {"date": day_data["date"], "data": day_data},
+                                        key=f"{KIND_SCREEN_TIME}-{day_data['date']}", on_result=on_result)
+
+
+def enqueue_productivity_upload(month, on_result=None, queue=None):
+    """Queues a push of the month's productivity counts (read from the store when sent)."""
+    return (queue or get_outbound_queue()).enqueue(KIND_PRODUCTIVITY, {"month": month},
+                                        key=f"{KIND_PRODUCTIVITY}-{month}", on_result=on_result)
+
+
+def enqueue_report_email(month, manager_email, user_firstname, user_email, on_result=None):
+    """Queues the monthly report email, unless the same report is already queued or being sent."""
+    return get_outbound_queue().enqueue(KIND_EMAIL, {
+        "month": month, "manager_email": manager_email,
+        "user_firstname": user_firstname, "user_email": user_email,
+    }, key=f"{KIND_EMAIL}-{month}-{manager_email}", on_result=on_result, replace=False)
@@ -0,0 +1,34 @@
+# views/productivity_save.py
+"""
+The Save path of the productivity form, without any widgets.
+
+Saving is split in two: a local commit (one SQLite transaction adding the
+entered counts to the month's totals) and a publish that is only queued here
+(the outbound queue spools it and sends it from its worker). Both run on the
+Tk thread, so together they must stay inside SAVE_LATENCY_BUDGET_MS; the
+view's navigation and dialogs are not part of the measured path.
+"""
+import time
+
+from .data_store import get_data_store, current_month
+from .outbound_queue import enqueue_productivity_upload
+
+# Longest the Save click may hold the Tk thread; the network work happens on the outbound queue
+SAVE_LATENCY_BUDGET_MS = 20
+
+# Every category gets a row, in display order, even if nothing was entered
+PRODUCTIVITY_CATEGORIES = ['QA', 'Package', 'Incident', 'PRF Creations']
+
+
+def commit_and_publish(increments, month=None, store=None, queue=None, on_result=None):
+    """
+    Adds `increments` ({category: {'Simple': n, ...}}) to the month's totals and
+    queues the Google Sheets publish. Returns the time taken in ms.
+    """
+    started = time.perf_counter()
+    month = month or current_month()
+    (store or get_data_store()).add_productivity(month, {
+        category: increments.get(category, {}) for category in PRODUCTIVITY_CATEGORIES
+    })
+    enqueue_productivity_upload(month, on_result=on_result, queue=queue)
+    return (time.perf_counter() - started) * 1000
@@ -1,9 +1,6 @@
 # views/productivity_view.py
-import csv
 import sys
 import os
-import threading
-from collections import defaultdict
 import customtkinter as ctk
 from tkinter import messagebox
 from datetime import datetime
@@ -12,9 +9,11 @@ from theme import Theme
 from .Summary_Window import MatplotlibPlotter
 from .Edit_Details import EditableDataDialog
 from .Misc_Window import Misc_Window
-from .Send_Email import EmailSender
-# IMPORT FIX: Added get_misc_file_path to ensure it's available for Misc_Window
-from .data_utils import read_config, resource_path, get_user_data_path, TASK_DATA_FOLDER, CONFIG_FILE, update_google_sheet, get_misc_file_path 
+from .config_service import get_config
+from .data_utils import resource_path, get_user_data_path, CONFIG_FILE
+from .outbound_queue import enqueue_productivity_upload, enqueue_report_email
+from .data_store import current_month
+from .productivity_save import commit_and_publish
 
 def launch_productivity_popup():
     """Launch productivity view as standalone popup window"""
@@ -36,7 +35,7 @@ def launch_productivity_popup():
     ctk.set_appearance_mode(ctk.get_appearance_mode())
     Theme.set_mode(ctk.get_appearance_mode())
     
-    config = read_config()
+    config = get_config()
     view = ProductivityView(root, config)
     view.pack(fill="both", expand=True)
     
@@ -103,42 +102,16 @@ def load_png_image(path, size=(25, 25)):
         print(f"Error loading PNG image from {path}: {e}")
         return None
 
-class EmailThread(threading.Thread):
-    """A thread to send the email in the background."""
-    def __init__(self, app, manager_email, user_firstname, user_email, report_details, misc_tasks_details):
-        super().__init__()
-        self.app = app
-        self.manager_email = manager_email
-        self.user_firstname = user_firstname
-        self.user_email = user_email
-        self.report_details = report_details
-        self.misc_tasks_details = misc_tasks_details
-
-    def run(self):
-        """Call the email sending method."""
-        email_sender = EmailSender()
-        task_file = os.path.join(TASK_DATA_FOLDER, f"tasks_{datetime.now().strftime('%m-%Y')}.csv")
-        misc_file = os.path.join(TASK_DATA_FOLDER, f"Misc_{datetime.now().strftime('%m-%Y')}.txt")
-
-        report_details = email_sender.format_report_details(task_file)
-        misc_tasks_details = email_sender.format_misc_task(misc_file)
-        
-        success = email_sender.send_report_email(
-            self.manager_email, self.user_firstname, self.user_email, report_details, misc_tasks_details
-        )
-        self.app.after(0, self.app.on_report_sent, success)
-
 class ProductivityView(ctk.CTkFrame):
     def __init__(self, master, back_to_dashboard_callback):
         super().__init__(master, fg_color=Theme.BACKGROUND)
         
-        os.makedirs(TASK_DATA_FOLDER, exist_ok=True)
-        
         self.back_to_dashboard_callback = back_to_dashboard_callback
         self.master = master
 
         self.summary_window = None
         self.edit_window = None
+        self.last_save_ms = None
         self.misc_window_obj = None # Store the Misc_Window object here
         self.sidebar_frame = None
         self.sidebar_visible = False
@@ -476,7 +449,7 @@ class ProductivityView(ctk.CTkFrame):
                 self.toggle_sidebar_menu()
 
     def show_confirmation_dialog(self):
-        config = self.master.config # Access config from the main app instance
+        config = get_config()
         manager_email = config.get('Manager Email', '')
         user_firstname = config.get('User First Name', 'User')
         user_email = config.get('User Email', '')
@@ -488,24 +461,13 @@ class ProductivityView(ctk.CTkFrame):
         response = messagebox.askyesno("Confirm Send", f"Are you sure you want to send the report to {manager_email}?")
         if response:
             try:
-                # Placeholder data retrieval (Actual logic is inside EmailThread)
-                report_details = "Generating Report..."
-                misc_tasks_details = "Loading Miscellaneous Tasks..."
-
-                # --- FIX 3: Pass 'self' (the ProductivityView instance) to the thread ---
-                email_thread = EmailThread(
-                    self, # Pass the ProductivityView instance
-                    manager_email,
-                    user_firstname,
-                    user_email,
-                    report_details,
-                    misc_tasks_details
-                )
-                email_thread.start()
+                # The report is built and sent by the outbound queue; it is kept on disk until it goes out
+                enqueue_report_email(current_month(), manager_email, user_firstname, user_email,
+                                     on_result=self.report_result_callback)
                 messagebox.showinfo("Sending...", "Report sending started in the background. You will receive a notification when complete.")
 
             except Exception as e:
-                messagebox.showerror("Thread Error", f"Could not start email thread: {e}")
+                messagebox.showerror("Queue Error", f"Could not queue the report email: {e}")
 
     def send_report_in_thread(self):
         config = self.get_current_config()
@@ -517,32 +479,32 @@ class ProductivityView(ctk.CTkFrame):
             messagebox.showerror("Configuration Error", "Please fill in User Email and Manager Email in the configuration section.")
             return
 
-        # Use dummy data or gather real data if necessary
-        report_details = "Daily Task Report Placeholder"
-        misc_tasks_details = "Miscellaneous Tasks Placeholder"
-        
-        email_thread = EmailThread(self.master, manager_email, user_firstname, user_email, report_details, misc_tasks_details)
-        email_thread.start()
+        enqueue_report_email(current_month(), manager_email, user_firstname, user_email,
+                             on_result=self.report_result_callback)
+
+    def report_result_callback(self, success, message, will_retry):
+        """Outbound queue callback (worker thread): hands the result to the Tk thread."""
+        self.after(0, self.on_report_sent, success, will_retry)
 
-    def on_report_sent(self, success):
-        """Called by the EmailThread to show success/failure message on the main thread."""
+    def on_report_sent(self, success, will_retry=False):
+        """Shows the email's success/failure message on the main thread."""
         if success:
             messagebox.showinfo("Report Sent", "Productivity report sent successfully!")
+        elif will_retry:
+            messagebox.showwarning("Email Delayed", "The productivity report couldn't be sent right now. It has been saved and will be retried automatically.")
         else:
             messagebox.showerror("Email Error", "Failed to send the productivity report. Check your email configuration.")
 
 
     def get_current_config(self):
-        # Logic to read config (already handled by data_utils)
-        return read_config()
+        return get_config()
 
     def edit_saved_report(self):
         if self.edit_window and self.edit_window.winfo_exists():
             self.edit_window.focus_set()
             return
-        TASK_FILE = os.path.join(TASK_DATA_FOLDER, f"tasks_{datetime.now().strftime('%m-%Y')}.csv")
         # --- FIX: Pass update_callback for Google Sheets sync ---
-        self.edit_window = EditableDataDialog(self.master, TASK_FILE, update_callback=self.sheets_update_wrapper)
+        self.edit_window = EditableDataDialog(self.master, current_month(), update_callback=self.sheets_update_wrapper)
         if self.edit_window and not self.edit_window.winfo_exists():
             self.edit_window = None
 
@@ -551,15 +513,13 @@ class ProductivityView(ctk.CTkFrame):
             self.misc_window_obj.focus_set()
             return
         
-        # --- FIX for TypeError: Calculate and pass the required 'misc_file' argument ---
-        misc_file_path = get_misc_file_path()
-        self.misc_window_obj = Misc_Window(self.master, misc_file=misc_file_path)
+        self.misc_window_obj = Misc_Window(self.master, month=current_month())
 
     def show_summary_window(self):
         if self.summary_window and self.summary_window.winfo_exists():
             self.summary_window.focus_set()
             return
-        self.summary_window = MatplotlibPlotter(TASK_DATA_FOLDER, self.master)
+        self.summary_window = MatplotlibPlotter(self.master)
         
     def get_input_data(self):
         data = {
@@ -599,97 +559,74 @@ class ProductivityView(ctk.CTkFrame):
 
         self.prf_input.delete(0, 'end')
 
-    def load_existing_data(self):
-        TASK_FILE = os.path.join(TASK_DATA_FOLDER, f"tasks_{datetime.now().strftime('%m-%Y')}.csv")
-        if not os.path.exists(TASK_FILE):
-            return defaultdict(lambda: defaultdict(int))
-
-        data = defaultdict(lambda: defaultdict(int))
-        try:
-            with open(TASK_FILE, 'r', newline='') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    category = row.get('Category')
-                    if category:
-                        for key in ['Simple', 'Medium', 'Complex']:
-                            if key in row:
-                                try:
-                                    data[category][key] = int(row[key])
-                                except ValueError:
-                                    data[category][key] = 0
-        except Exception as e:
-            messagebox.showerror("Load Error", f"Error loading existing data: {e}")
-        return data
-
     def close_and_save(self):
+        """
+        Save button: commits the counts locally, queues the Google Sheets publish
+        and returns to the dashboard. Nothing here waits on the network; the
+        publish reports back through after() (see on_publish_result).
+        """
+        increments = self.entered_increments()
         try:
-            new_data = self.get_input_data()
-            TASK_FILE = os.path.join(TASK_DATA_FOLDER, f"tasks_{datetime.now().strftime('%m-%Y')}.csv")
-            
-            existing_values = self.load_existing_data()
-
-            # 1. Process New Data and Update Cumulative Values
-            for category, complexities in new_data.items():
-                for complexity, value in complexities.items():
-                    # Pass the name of the complexity as it appears in the input field
-                    # e.g., 'P1 Ticket', 'Simple', 'PRF Creations'
-                    self.update_cumulative_values(existing_values, category, complexity, value)
-
-            # 2. Write the Combined Data back to CSV
-            all_categories = ['QA', 'Package', 'Incident', 'PRF Creations']
-            with open(TASK_FILE, 'w', newline='') as file:
-                fieldnames = ['Category', 'Simple', 'Medium', 'Complex']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for category in all_categories:
-                    values = existing_values.get(category, defaultdict(int))
-                    
-                    # Special mapping for Incident and PRF Creations back to CSV keys if needed
-                    if category == 'Incident':
-                         # Map Incident P-tickets back to Simple/Medium/Complex for local CSV structure
-                         writer.writerow({
-                            'Category': 'Incident',
-                            'Simple': values.get('Simple', 0),
-                            'Medium': values.get('Medium', 0),
-                            'Complex': values.get('Complex', 0)
-                        })
-                    elif category == 'PRF Creations':
-                         writer.writerow({
-                            'Category': 'PRF Creations',
-                            'Simple': values.get('Simple', 0),
-                            'Medium': 0, # PRF Creations only has one input, so Medium/Complex are 0
-                            'Complex': 0
-                        })
-                    else:
-                        writer.writerow({
-                            'Category': category,
-                            'Simple': values.get('Simple', 0),
-                            'Medium': values.get('Medium', 0),
-                            'Complex': values.get('Complex', 0)
-                        })
-            
-            self.sheets_update_wrapper()
-
-            messagebox.showinfo("Success", "Data Updated Successfully!")
-            self.clear_input_fields()
-            self.back_to_dashboard_callback()
+            # Timed against SAVE_LATENCY_BUDGET_MS (see productivity_save.py)
+            self.last_save_ms = commit_and_publish(increments, on_result=self.sheets_result_callback)
         except Exception as e:
             messagebox.showerror("Save Error", f"Error saving data: {e}")
+            return
+
+        self.report_sync_status("Updating Google Sheets...")
+        self.clear_input_fields()
+        self.back_to_dashboard_callback()
+
+        # Confirm once the click handler has returned
+        self.after(0, messagebox.showinfo, "Success", "Data Updated Successfully!")
+
+    def entered_increments(self):
+        """Maps the inputs onto Simple/Medium/Complex increments per category."""
+        new_data = self.get_input_data()
+
+        increments = {}
+        for category, complexities in new_data.items():
+            for complexity, value in complexities.items():
+                # Pass the name of the complexity as it appears in the input field
+                # e.g., 'P1 Ticket', 'Simple', 'PRF Creations'
+                self.update_cumulative_values(increments, category, complexity, value)
+        return increments
 
     def close_without_saving(self):
         self.back_to_dashboard_callback()
 
     def sheets_update_wrapper(self):
-        """Wrapper to call update_google_sheet and show error/warning messages."""
-        google_sheets_result = update_google_sheet()
-        if "Error" in google_sheets_result or "Warning" in google_sheets_result:
-             messagebox.showwarning("Google Sheets Update", google_sheets_result)
+        """Publish stage: queues this month's Google Sheets update and reports its progress."""
+        enqueue_productivity_upload(current_month(), on_result=self.sheets_result_callback)
+        self.report_sync_status("Updating Google Sheets...")
         # We don't show success here, as success is handled by the main save function or the Edit dialog
 
+    def sheets_result_callback(self, success, message, will_retry):
+        """Outbound queue callback (worker thread): hands the result to the Tk thread."""
+        self.after(0, self.on_publish_result, success, message, will_retry)
+
+    def on_publish_result(self, success, message, will_retry):
+        if success:
+            self.report_sync_status(f"Google Sheets updated at {datetime.now().strftime('%I:%M %p')}.")
+            return
+        if will_retry:
+            self.report_sync_status("Google Sheets update pending; it will be retried automatically.")
+            message += "\n\nThe update has been saved and will be retried automatically."
+        else:
+            self.report_sync_status("Google Sheets update failed.")
+        messagebox.showwarning("Google Sheets Update", message)
+
+    def report_sync_status(self, text):
+        """Shows publish progress on the dashboard (the standalone popup has none, so it is logged)."""
+        dashboard = getattr(self.master, 'dashboard_view', None)
+        if dashboard is not None:
+            dashboard.set_sync_status(text)
+        else:
+            print(text)
+
     def update_cumulative_values(self, existing_values, category, complexity, value):
         if category not in existing_values:
-            existing_values[category] = defaultdict(int)
+            existing_values[category] = {}
         try:
             int_value = int(value) if value else 0
             
@@ -709,6 +646,6 @@ class ProductivityView(ctk.CTkFrame):
             else:
                 key = complexity # QA/Package complexities are already 'Simple', 'Medium', 'Complex'
 
-            existing_values[category][key] += int_value
+            existing_values[category][key] = existing_values[category].get(key, 0) + int_value
         except ValueError:
             messagebox.showerror("Invalid Input", f"Please enter a valid number for {category} {complexity}.")
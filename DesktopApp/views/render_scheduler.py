@@ -0,0 +1,56 @@
+# views/render_scheduler.py
+"""
+Dirty-tracking render scheduler.
+
+Each registered render task has a key function describing its inputs (data
+version, canvas size, ...). A task only runs when its key differs from the
+one it last rendered with, and nothing runs while the view isn't visible, so
+a view hidden in the tray costs essentially no UI time.
+"""
+
+
+class RenderScheduler:
+    """Runs registered render callbacks only when visible and their inputs changed."""
+
+    def __init__(self, is_visible):
+        self.is_visible = is_visible
+        self._tasks = {}
+        self._last_keys = {}
+        self.performed = {}
+        self.skipped = {}
+
+    def register(self, name, render, key):
+        """Registers `render()` to run whenever `key()` changes."""
+        self._tasks[name] = (render, key)
+        self.performed[name] = 0
+        self.skipped[name] = 0
+
+    def invalidate(self, name=None):
+        """Forces a task (or every task) to render on the next run."""
+        if name is None:
+            self._last_keys.clear()
+        else:
+            self._last_keys.pop(name, None)
+
+    def run(self):
+        """Renders every dirty task. Returns the number of tasks rendered."""
+        if not self.is_visible():
+            for name in self._tasks:
+                self.skipped[name] += 1
+            return 0
+
+        rendered = 0
+        for name, (render, key) in self._tasks.items():
+            current_key = key()
+            if name in self._last_keys and self._last_keys[name] == current_key:
+                self.skipped[name] += 1
+                continue
+            render()
+            self._last_keys[name] = current_key
+            self.performed[name] += 1
+            rendered += 1
+        return rendered
+
+    def stats(self):
+        """{task: (performed, skipped)} counters for measuring UI cost."""
+        return {name: (self.performed[name], self.skipped[name]) for name in self._tasks}
@@ -0,0 +1,69 @@
+# views/retained_canvas.py
+"""
+Retained-mode drawing on a Tk canvas.
+
+Charts describe each frame as a set of keyed items. The first time a key is
+drawn its canvas item is created; afterwards only what changed is pushed to Tk
+with coords()/itemconfigure(), and items whose key wasn't drawn this frame are
+deleted. Redrawing an unchanged chart costs no Tk calls at all, and a resize
+just moves the existing items.
+"""
+
+
+class RetainedCanvas:
+    """Keeps canvas items alive across redraws and only updates what changed."""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self._items = {}      # key -> [item id, coords, options]
+        self._drawn = set()
+
+        # Counters for measuring redraw cost and item churn
+        self.frames = 0
+        self.items_created = 0
+        self.items_updated = 0
+        self.items_deleted = 0
+
+    def begin(self):
+        """Starts a frame. Every item that should stay must be drawn before end()."""
+        self._drawn = set()
+        self.frames += 1
+
+    def draw(self, key, kind, coords, **options):
+        """Creates or updates the `kind` item ("arc", "rectangle", "text", ...) for `key`. Returns its id."""
+        coords = tuple(round(value, 1) for value in coords)
+        self._drawn.add(key)
+
+        entry = self._items.get(key)
+        if entry is None:
+            item = getattr(self.canvas, f"create_{kind}")(*coords, **options)
+            self._items[key] = [item, coords, dict(options)]
+            self.items_created += 1
+            return item
+
+        item, old_coords, old_options = entry
+        if coords != old_coords:
+            self.canvas.coords(item, *coords)
+            entry[1] = coords
+            self.items_updated += 1
+        changed = {name: value for name, value in options.items() if old_options.get(name) != value}
+        if changed:
+            self.canvas.itemconfigure(item, **changed)
+            old_options.update(changed)
+            self.items_updated += 1
+        return item
+
+    def end(self):
+        """Deletes the items that weren't drawn this frame."""
+        for key in [key for key in self._items if key not in self._drawn]:
+            self.canvas.delete(self._items.pop(key)[0])
+            self.items_deleted += 1
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "items": len(self._items),
+            "created": self.items_created,
+            "updated": self.items_updated,
+            "deleted": self.items_deleted,
+        }
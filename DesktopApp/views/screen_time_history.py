@@ -0,0 +1,163 @@
+# views/screen_time_history.py
+"""
+Long-horizon screen time history, one row per day in the data store.
+
+Each day's row holds the per-app totals for that date, plus the last journal
+record those totals cover:
+
+    {"usage": {...}, "titles": {...}, "break_time": s, "idle_time": s, ...}
+
+History is kept indefinitely. A save replaces only the row for its day, and
+range queries only read the rows they cover (days are the primary key), so a
+year of history costs nothing at startup or on save. The focus intervals behind
+the rollups are archived to the store when the journal is compacted; see
+archive_intervals().
+
+History used to be one JSON file per month in the ScreenTime folder
+(screen_time_MM-YYYY.json), and before that a rolling 7-day
+screen_time_data.json. import_legacy() moves both into the store once.
+"""
+import os
+import json
+from datetime import date, datetime, timedelta
+
+from .data_utils import SCREEN_TIME_HISTORY_FOLDER, data_file_exists, read_json_verified
+from .data_store import get_data_store
+from .app_identity import add_title_detail
+
+PARTITION_PREFIX = "screen_time_"
+PARTITION_SUFFIX = ".json"
+
+
+def _month_start(month_key):
+    return datetime.strptime(month_key, "%m-%Y").date()
+
+
+class ScreenTimeHistory:
+    """Per-day screen time rollups and archived focus intervals, stored in the data store."""
+
+    def __init__(self, store=None, folder=SCREEN_TIME_HISTORY_FOLDER):
+        self.store = store or get_data_store()
+        # Only read for the one-shot import of the old monthly files
+        self.folder = folder
+
+    # --- Queries ---
+
+    def get_day(self, day):
+        """The saved entry for one day (date or 'YYYY-MM-DD'), or None."""
+        day_str = str(day)
+        rows = self.store.screen_time_days(day_str, day_str)
+        return dict(rows[0][1], date=day_str) if rows else None
+
+    def range(self, start, end):
+        """Saved entries with start <= date <= end, oldest first."""
+        return [dict(entry, date=day_str) for day_str, entry, _ in self.store.screen_time_days(str(start), str(end))]
+
+    def recent(self, days, today=None):
+        """Entries for the last `days` days up to and including today."""
+        today = today or date.today()
+        return self.range(today - timedelta(days=days - 1), today)
+
+    def journal_seq(self):
+        """Last journal record covered by saved history."""
+        return self.store.screen_time_journal_seq()
+
+    def intervals(self, start, end):
+        """Archived (start, end, app, kind) focus intervals overlapping two timestamps, oldest first."""
+        return self.store.focus_intervals(start, end)
+
+    # --- Updates ---
+
+    def save_day(self, entry, journal_seq=None):
+        """Replaces one day's entry, rewriting only that day's row."""
+        self.store.save_screen_time_day(
+            entry["date"], {key: value for key, value in entry.items() if key not in ("date", "journal_seq")},
+            journal_seq)
+
+    def merge_day(self, day_str, usage, break_time, idle_time, last_timestamp, journal_seq, suspended_time=0,
+                  titles=None):
+        """Adds recovered totals (e.g. replayed from the journal) to one day's entry."""
+        entry = self.get_day(day_str) or {"date": day_str, "usage": {}, "break_time": 0, "idle_time": 0}
+        merged_usage = dict(entry.get("usage", {}))
+        for app, seconds in usage.items():
+            merged_usage[app] = merged_usage.get(app, 0) + seconds
+        entry["usage"] = merged_usage
+        if titles:
+            merged_titles = {app: dict(title_totals) for app, title_totals in entry.get("titles", {}).items()}
+            for app, title_totals in titles.items():
+                detail = merged_titles.setdefault(app, {})
+                for title, seconds in title_totals.items():
+                    add_title_detail(detail, title, seconds)
+            entry["titles"] = merged_titles
+        entry["break_time"] = entry.get("break_time", 0) + break_time
+        entry["idle_time"] = entry.get("idle_time", 0) + idle_time
+        if suspended_time:
+            entry["suspended_time"] = entry.get("suspended_time", 0) + suspended_time
+        entry["last_timestamp"] = max(entry.get("last_timestamp", 0), last_timestamp)
+        self.save_day(entry, journal_seq)
+
+    def archive_intervals(self, records):
+        """Stores (seq, start, end, app, kind) journal records; passed to the journal as its archive."""
+        self.store.add_focus_intervals(records)
+
+    # --- Migration ---
+
+    def partition_files(self):
+        """(month key, path) of each old monthly history file still in the folder, oldest first."""
+        if not os.path.isdir(self.folder):
+            return []
+        files = []
+        for name in os.listdir(self.folder):
+            if name.startswith(PARTITION_PREFIX) and name.endswith(PARTITION_SUFFIX):
+                key = name[len(PARTITION_PREFIX):-len(PARTITION_SUFFIX)]
+                try:
+                    _month_start(key)
+                except ValueError:
+                    continue
+                files.append((key, os.path.join(self.folder, name)))
+        return sorted(files, key=lambda item: _month_start(item[0]))
+
+    def import_legacy(self, legacy_file):
+        """
+        Moves the old monthly history files and the rolling 7-day
+        screen_time_data.json into the store. Days already in the store are
+        left alone. The old files are renamed to *.migrated, not deleted.
+        Returns the number of days imported.
+        """
+        imported = 0
+        for _, path in self.partition_files():
+            if not data_file_exists(path):
+                continue
+            try:
+                partition = read_json_verified(path)
+            except Exception as e:
+                print(f"Error reading screen time history {path}: {e}")
+                continue
+            days = partition.get("days", {})
+            for day_str in sorted(days):
+                if self.get_day(day_str) is None:
+                    self.save_day(dict(days[day_str], date=day_str), partition.get("journal_seq", -1))
+                    imported += 1
+            self._mark_migrated(path)
+
+        if os.path.exists(legacy_file):
+            try:
+                with open(legacy_file, "r", encoding="utf-8") as f:
+                    legacy = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error reading legacy screen time data {legacy_file}: {e}")
+                return imported
+            for entry in legacy if isinstance(legacy, list) else []:
+                if not isinstance(entry, dict) or "date" not in entry or self.get_day(entry["date"]) is not None:
+                    continue
+                self.save_day(entry, entry.get("journal_seq"))
+                imported += 1
+            self._mark_migrated(legacy_file)
+        return imported
+
+    @staticmethod
+    def _mark_migrated(path):
+        try:
+            os.replace(path, path + ".migrated")
+        except OSError as e:
+            print(f"Could not rename migrated screen time data {path}: {e}")
@@ -0,0 +1,240 @@
+# views/screen_time_journal.py
+"""
+Append-only journal of screen time intervals.
+
+Every attributed span is appended as one small JSON line (start, end, app, kind,
+and the window title when it differs from the app name) with an increasing
+sequence number. Lines are buffered and written with a
+single fsync per flush, so durable persistence is cheap enough to run every few
+seconds. The daily rollups in history record the last sequence number they
+cover; compaction hands exactly those records to the archive (the focus
+interval table, see data_store.py) and drops them, and on startup only the
+(short) uncovered tail is replayed.
+"""
+import os
+import json
+import time
+import threading
+from datetime import date
+
+from .durations import to_ms, to_seconds, totals_to_seconds
+from .app_identity import add_title_detail
+from .data_utils import write_text_atomic
+
+# How often buffered intervals are written and fsynced
+FLUSH_INTERVAL_SECONDS = 5.0
+
+# Fold the journal into the daily rollups after this long or this many records.
+# The tracker overrides the interval with its checkpoint cadence.
+COMPACT_INTERVAL_SECONDS = 900.0
+COMPACT_MAX_RECORDS = 5000
+
+KIND_APP = "app"
+KIND_IDLE = "idle"
+KIND_BREAK = "break"
+KIND_SUSPEND = "suspend"
+
+
+class ScreenTimeJournal:
+    """Buffered, fsync-batched append-only log of focus intervals."""
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL_SECONDS,
+                 compact_interval=COMPACT_INTERVAL_SECONDS, compact_max_records=COMPACT_MAX_RECORDS, archive=None,
+                 clock=time.time):
+        self.path = path
+        # Times the flush and compaction cadences; see set_clock()
+        self.clock = clock
+        # Called with the (seq, start, end, app, kind) records a compaction drops
+        self.archive = archive
+        self.flush_interval = flush_interval
+        self.compact_interval = compact_interval
+        self.compact_max_records = compact_max_records
+        self._buffer = []
+        # _lock guards the buffer and numbering and is only held for in-memory work, so
+        # append() (on the sampler thread) never waits on disk. _file_lock serializes
+        # writers of the file itself: flushes and compaction.
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._last_flush = clock()
+        self._last_compact = clock()
+        self.records_since_compaction = 0
+        self.last_seq = max((seq for seq, *_ in self._read_records() if seq is not None), default=-1)
+
+    def set_clock(self, clock):
+        """Times the cadences with `clock` from now on (e.g. the focus source's wall clock)."""
+        self.clock = clock
+        self._last_flush = self._last_compact = clock()
+
+    def resume_after(self, seq):
+        """Makes sure new records are numbered after `seq` (e.g. the last one the rollups cover)."""
+        with self._lock:
+            self.last_seq = max(self.last_seq, seq)
+
+    def append(self, start, end, app, kind=KIND_APP, title=None):
+        """Queues one interval and returns its sequence number (None if it was dropped)."""
+        if end <= start:
+            return None
+        # Millisecond boundaries, so replayed durations are exact (see durations.py)
+        record = {"s": round(start, 3), "e": round(end, 3)}
+        if app:
+            record["a"] = app
+        if title and title != app:
+            record["t"] = title
+        if kind != KIND_APP:
+            record["k"] = kind
+        with self._lock:
+            self.last_seq += 1
+            record["n"] = self.last_seq
+            self._buffer.append(json.dumps(record, separators=(",", ":")))
+            self.records_since_compaction += 1
+            return self.last_seq
+
+    def maybe_flush(self):
+        """
+        Flushes if the flush interval has passed since the last flush. Never
+        waits: while a compaction owns the file, records stay buffered until the next call.
+        """
+        if self.clock() - self._last_flush < self.flush_interval:
+            return
+        if not self._file_lock.acquire(blocking=False):
+            return
+        try:
+            self._flush_locked()
+        finally:
+            self._file_lock.release()
+
+    def flush(self):
+        """Writes all buffered intervals with a single write and fsync."""
+        with self._file_lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        # Caller holds _file_lock; the buffer is swapped out under _lock and written without it
+        with self._lock:
+            self._last_flush = self.clock()
+            if not self._buffer:
+                return
+            lines = self._buffer
+            self._buffer = []
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            # Keep the intervals so the next flush can retry
+            with self._lock:
+                self._buffer = lines + self._buffer
+            print(f"Error writing screen time journal {self.path}: {e}")
+
+    def should_compact(self):
+        return (self.records_since_compaction >= self.compact_max_records or
+                (self.records_since_compaction > 0 and self.clock() - self._last_compact >= self.compact_interval))
+
+    def compact(self, upto_seq):
+        """
+        Drops every record numbered `upto_seq` or lower, archiving them first.
+        Call only after the rollups covering them are on disk; later records are
+        kept. If archiving fails nothing is dropped.
+
+        Only the file lock is held while reading, archiving and rewriting, so
+        append() keeps going; intervals appended meanwhile stay in the buffer
+        and are written by the first flush after the new file is in place.
+        """
+        with self._file_lock:
+            self._flush_locked()
+            with self._lock:
+                self._last_compact = self.clock()
+            try:
+                keep = []
+                dropped = []
+                if os.path.exists(self.path):
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        for line in f:
+                            record = self._parse(line)
+                            if record[0] is not None and record[0] > upto_seq:
+                                keep.append(line.strip())
+                            elif record[1] is not None:
+                                dropped.append(record[:5])
+                if dropped and self.archive is not None:
+                    self.archive(dropped)
+                # The journal is rebuilt from history on every compaction, so it needs no backup
+                write_text_atomic(self.path, "\n".join(keep) + "\n" if keep else "", backup=False)
+                with self._lock:
+                    self.records_since_compaction = len(keep) + len(self._buffer)
+            except Exception as e:
+                print(f"Error compacting screen time journal {self.path}: {e}")
+
+    @staticmethod
+    def _parse(line):
+        """(seq, start, end, app, kind, title) for one journal line, all None if it is blank or torn."""
+        line = line.strip()
+        if not line:
+            return None, None, None, None, None, None
+        try:
+            record = json.loads(line)
+            start, end = float(record["s"]), float(record["e"])
+            seq = record.get("n")
+            seq = int(seq) if seq is not None else None
+        except (ValueError, KeyError, TypeError):
+            # A torn final line from a crash mid-write; everything before it is intact
+            return None, None, None, None, None, None
+        return seq, start, end, record.get("a"), record.get("k", KIND_APP), record.get("t")
+
+    def _read_records(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                seq, start, end, app, kind, title = self._parse(line)
+                if start is not None:
+                    yield seq, start, end, app, kind, title
+
+    def read_intervals(self, since_seq=-1, since=0.0):
+        """
+        Yields (start, end, app, kind) for every journaled interval numbered after
+        `since_seq`. Unnumbered records (older journals) are kept if they end after `since`.
+        """
+        for _, start, end, app, kind, _ in self._uncovered(since_seq, since):
+            yield start, end, app, kind
+
+    def _uncovered(self, since_seq, since):
+        for record in self._read_records():
+            seq, end = record[0], record[2]
+            if (seq > since_seq) if seq is not None else (end > since):
+                yield record
+
+    def replay(self, since_seq=-1, since=0.0):
+        """
+        Aggregates journaled intervals into daily rollups:
+        {date_str: {"usage": {app: seconds}, "titles": {app: {title: seconds}}, "break_time": s, "idle_time": s,
+                    "suspended_time": s, "last_timestamp": t, "journal_seq": n}}
+        """
+        days = {}   # durations summed in ms, converted to seconds at the end
+        for seq, start, end, app, kind, title in self._uncovered(since_seq, since):
+            # Intervals are only journaled once complete, so one that straddles the
+            # last save was not yet in the saved rollups and counts in full
+            day = days.setdefault(str(date.fromtimestamp(start)), {"usage": {}, "titles": {}, "break_time": 0, "idle_time": 0,
+                                                                  "suspended_time": 0, "last_timestamp": end,
+                                                                  "journal_seq": -1})
+            day["last_timestamp"] = max(day["last_timestamp"], end)
+            if seq is not None:
+                day["journal_seq"] = max(day["journal_seq"], seq)
+            duration = to_ms(end) - to_ms(start)
+            if kind == KIND_IDLE:
+                day["idle_time"] += duration
+            elif kind == KIND_BREAK:
+                day["break_time"] += duration
+            elif kind == KIND_SUSPEND:
+                day["suspended_time"] += duration
+            elif app:
+                day["usage"][app] = day["usage"].get(app, 0) + duration
+                # Older records have no title; the app name stands in for it
+                add_title_detail(day["titles"].setdefault(app, {}), title or app, duration)
+        for day in days.values():
+            day["usage"] = totals_to_seconds(day["usage"])
+            day["titles"] = {app: totals_to_seconds(titles) for app, titles in day["titles"].items()}
+            day["break_time"] = to_seconds(day["break_time"])
+            day["idle_time"] = to_seconds(day["idle_time"])
+            day["suspended_time"] = to_seconds(day["suspended_time"])
+        return days
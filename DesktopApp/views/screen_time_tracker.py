@@ -0,0 +1,355 @@
+# views/screen_time_tracker.py
+"""
+Headless screen time tracker: focus sampling, aggregation and persistence.
+
+Every span is journaled and fsynced within a few seconds (screen_time_journal.py).
+At the checkpoint cadence the persistence thread writes today's totals to its
+row in the history table and archives the journal records it covers to the
+focus interval table, so a crash, kill or power loss costs at most the last journal flush:
+on restart the uncovered journal tail is replayed on top of the last checkpoint.
+
+Nothing here touches Tk, so the same tracker runs inside the app (in-process)
+or on its own in the tracker daemon (see tracker_daemon.py). Three threads are
+involved and none waits on another's slow work:
+
+- the sampler thread is the single writer of `core` (see tracker_core.py);
+- the persistence thread folds snapshots into the daily history rows;
+- readers (GUI, IPC) only take `snapshot` and `weekly_data` references.
+"""
+import time
+import queue
+import threading
+from datetime import date
+
+from .data_utils import SCREEN_TIME_FILE, SCREEN_TIME_HISTORY_FOLDER, SCREEN_TIME_JOURNAL_FILE
+from .config_service import get_config
+from .focus_tracker import FocusTracker, create_focus_source, suspend_gap_from_config
+from .idle_detector import IdleDetector, create_activity_source, idle_threshold_from_config
+from .screen_time_journal import ScreenTimeJournal
+from .app_identity import AppIdentityTable, add_title_detail
+from .tracker_core import TrackerCore
+from .screen_time_history import ScreenTimeHistory
+from .durations import to_ms, to_seconds, totals_to_seconds
+from .tracker_lock import LOCK_SUFFIX, TrackerLock, TrackerLockHeld
+
+# Days of history kept in memory for the live view (the weekly bar graph)
+HISTORY_DAYS = 7
+
+# Continuous work (in seconds) after which a break reminder pops up
+WORK_THRESHOLD_SECONDS = 600  # 10 minutes
+
+# Default checkpoint cadence, overridable via 'Checkpoint Minutes' in config.csv
+DEFAULT_CHECKPOINT_SECONDS = 60.0
+
+
+def checkpoint_interval_from_config(config):
+    """Reads 'Checkpoint Minutes' from the config dict, falling back to the default."""
+    try:
+        minutes = float(config.get('Checkpoint Minutes', ''))
+        if minutes > 0:
+            return minutes * 60
+    except (TypeError, ValueError):
+        pass
+    return DEFAULT_CHECKPOINT_SECONDS
+
+
+class ScreenTimeTracker:
+    """Tracks screen time for today and keeps the last week of daily rollups at hand."""
+
+    def __init__(self, history_folder=SCREEN_TIME_HISTORY_FOLDER, journal_file=SCREEN_TIME_JOURNAL_FILE,
+                 legacy_file=SCREEN_TIME_FILE, store=None):
+        # Only one tracker may own the journal and write history (see tracker_lock.py)
+        self.lock = TrackerLock(journal_file + LOCK_SUFFIX)
+        if not self.lock.acquire():
+            raise TrackerLockHeld(f"Screen time is already being tracked by another process ({self.lock.path})")
+        self.history = ScreenTimeHistory(store, history_folder)
+        self.legacy_file = legacy_file
+        self.journal = ScreenTimeJournal(journal_file, archive=self.history.archive_intervals)
+        # app_times is keyed by interned app id; see app_identity.py
+        self.app_table = AppIdentityTable()
+        # Today's totals are owned by the sampler thread; everything else reads core.snapshot.
+        # They are kept in integer milliseconds and saved as seconds (see durations.py).
+        self.core = TrackerCore(self.app_table, self.journal, date.today())
+
+        # Last HISTORY_DAYS daily rollups. Replaced (never mutated) on save, so readers can iterate freely.
+        self.weekly_data = []
+        self.history_version = 0
+
+        self.is_on_break = False
+        self.running = False
+        self.focus_source = None
+        self.focus_tracker = None
+        self.idle_detector = None
+        self.sampler_thread = None
+
+        self._save_lock = threading.Lock()
+        self._save_requests = queue.SimpleQueue()
+        self._save_scheduled = False
+        self.persist_thread = None
+
+        try:
+            self.load_data()
+        except BaseException:
+            self.lock.release()
+            raise
+
+    # --- Reader API (any thread) ---
+
+    @property
+    def snapshot(self):
+        return self.core.snapshot
+
+    def refresh(self):
+        """Nothing to fetch in-process; see TrackerClient.refresh()."""
+        return self.core.snapshot
+
+    def history_range(self, start, end):
+        """Saved daily rollups between two dates (inclusive), for views longer than a week."""
+        return self.history.range(start, end)
+
+    def today_data(self):
+        """Saved rollup entry for today, or None."""
+        today_str = str(date.today())
+        return next((item for item in self.weekly_data if item["date"] == today_str), None)
+
+    def pending_focus_time(self):
+        """Seconds spent on the current window since the tracker last woke up (not yet in app_times)."""
+        if (self.is_on_break or self.focus_tracker is None or self.idle_detector.is_idle or
+                not self.focus_tracker.current_title or self.focus_tracker.last_update_time is None):
+            return 0.0
+        # Capped at the heartbeat, so a suspend in progress doesn't show up as focus time
+        return min(max(0.0, self.focus_source.clock() - self.focus_tracker.last_update_time), self.focus_tracker.heartbeat)
+
+    # --- Commands (any thread; applied by the sampler) ---
+
+    def start_break(self):
+        self.is_on_break = True
+        self.core.submit(self.core.set_continuous_work_time, 0)
+
+    def end_break(self, start, end):
+        """Records a break between two epoch times in seconds."""
+        self.is_on_break = False
+        start_ms = to_ms(start)
+        self.core.submit(self.core.add_break, start_ms, to_ms(end) - start_ms)
+
+    def set_continuous_work_time(self, seconds):
+        self.core.submit(self.core.set_continuous_work_time, to_ms(seconds))
+
+    # --- Lifecycle ---
+
+    def start(self):
+        """Starts the sampler and persistence threads."""
+        self.running = True
+        self.attach_sources(create_focus_source(), create_activity_source(), get_config())
+        self.persist_thread = threading.Thread(target=self._persist_loop, daemon=True)
+        self.persist_thread.start()
+        self.sampler_thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self.sampler_thread.start()
+
+    def attach_sources(self, focus_source, activity_source, config):
+        """
+        Wires the focus and activity sources and the config-driven cadences.
+        start() passes the platform sources; tests pass scripted ones and call
+        record_focus_span from focus_tracker.run() on their own thread.
+        """
+        # Checkpoints happen when the journal is due for compaction, timed on the source's wall clock
+        self.journal.set_clock(focus_source.wall_clock)
+        self.journal.compact_interval = checkpoint_interval_from_config(config)
+        self.focus_source = focus_source
+        self.focus_tracker = FocusTracker(focus_source, suspend_gap=suspend_gap_from_config(config))
+        self.idle_detector = IdleDetector(activity_source, threshold=idle_threshold_from_config(config))
+
+    def stop(self):
+        """Stops sampling and writes a final save."""
+        self.running = False
+        if self.focus_source:
+            # Wake the sampler so the in-flight focus span is recorded before saving
+            self.focus_source.stop()
+        if self.sampler_thread and self.sampler_thread.is_alive() and self.sampler_thread is not threading.current_thread():
+            self.sampler_thread.join(timeout=2)
+        if not (self.sampler_thread and self.sampler_thread.is_alive()):
+            # The sampler is gone, so apply what it left queued (e.g. the last break)
+            self.core.apply_pending()
+        if self.persist_thread:
+            self._save_requests.put(None)
+            self.persist_thread.join(timeout=5)
+        self.save_data()
+        self.lock.release()
+
+    # --- Sampler thread ---
+
+    def _sample_loop(self):
+        """Attributes time to the active window whenever focus changes."""
+        try:
+            self.focus_tracker.run(lambda: self.running, self.record_focus_span)
+        finally:
+            self.focus_source.stop()
+
+    def record_focus_span(self, app_title, process, elapsed_ms, suspended_ms=0):
+        """
+        Attributes one span (in ms) reported by the focus tracker to the window
+        that was in front. `suspended_ms` is time the machine was asleep; it
+        follows the attributed part and goes to its own bucket.
+        """
+        self.core.apply_pending()
+
+        current_day = date.today()
+        if current_day != self.core.day:
+            self.request_save(self.core.roll_over(current_day))
+
+        span_end = self.focus_source.wall_clock()
+        span_start = to_ms(span_end) - elapsed_ms - suspended_ms
+
+        if suspended_ms > 0:
+            self.core.add_suspended(span_start + elapsed_ms, suspended_ms)
+            # Sleeping counts as a break for the reminder
+            self.core.set_continuous_work_time(0)
+
+        if not self.is_on_break:
+            # Idle is cut at a whole millisecond and active time is the rest, so the two add up exactly
+            idle_time = min(elapsed_ms, to_ms(self.idle_detector.split(to_seconds(elapsed_ms))[1]))
+            active_time = elapsed_ms - idle_time
+            # Going idle: active part comes first. Coming back: idle part comes first.
+            if self.idle_detector.is_idle:
+                active_start, idle_start = span_start, span_start + active_time
+            else:
+                idle_start, active_start = span_start, span_start + idle_time
+
+            if idle_time > 0:
+                self.core.add_idle(idle_start, idle_time)
+            # Sleep on the long heartbeat while nobody is at the desk
+            self.focus_tracker.set_low_power(self.idle_detector.is_idle)
+
+            if self.idle_detector.is_idle:
+                # Being away counts as a break for the reminder
+                self.core.set_continuous_work_time(0)
+
+            if app_title and active_time > 0:
+                self.core.add_app_time(app_title, process, active_start, active_time)
+        else:
+            # Reset continuous work timer during break
+            self.core.set_continuous_work_time(0)
+
+        self.core.publish(span_end)
+
+        # Durable every few seconds via the journal; checkpoint into history at the
+        # checkpoint cadence. Only one checkpoint is ever queued, so writes coalesce.
+        self.journal.maybe_flush()
+        if self.journal.should_compact() and not self._save_scheduled:
+            self._save_scheduled = True
+            self.request_save()
+
+    # --- Persistence ---
+
+    def request_save(self, snapshot=None):
+        """Queues a save of `snapshot` (the latest one if None) on the persistence thread."""
+        if self.persist_thread and self.persist_thread.is_alive():
+            self._save_requests.put((snapshot,))
+        else:
+            self.save_data(snapshot)
+
+    def _persist_loop(self):
+        while True:
+            request = self._save_requests.get()
+            if request is None:
+                return
+            self.save_data(request[0])
+
+    def load_data(self):
+        """Loads recent history and today's totals."""
+        self.history.import_legacy(self.legacy_file)
+
+        # Fold in anything journaled after the last history save (e.g. before a crash)
+        recovered = self.recover_from_journal()
+        self.weekly_data = self.history.recent(HISTORY_DAYS)
+
+        app_times = {}
+        app_titles = {}
+        break_time = 0
+        idle_time = 0
+        suspended_time = 0
+        entry = self.history.get_day(date.today())
+        if entry is not None:
+            entry_usage = entry.get("usage", {})
+            if isinstance(entry_usage, dict):
+                app_times = self.intern_usage(entry_usage)
+                app_titles = self.intern_titles(entry.get("titles", {}))
+            break_time = to_ms(entry.get("break_time", 0))
+            idle_time = to_ms(entry.get("idle_time", 0))
+            suspended_time = to_ms(entry.get("suspended_time", 0))
+
+        # Called before the sampler starts, so this thread is still the only writer
+        self.core.load(date.today(), app_times, app_titles, break_time, idle_time, suspended_time)
+
+        if recovered:
+            self.journal.compact(self.history.journal_seq())
+
+    def intern_usage(self, named_usage):
+        """Converts a saved {app name or raw title: seconds} dict to {app id: ms}."""
+        usage = {}
+        for name, seconds in named_usage.items():
+            app_id = self.app_table.intern(name)
+            usage[app_id] = usage.get(app_id, 0) + to_ms(seconds)
+        return usage
+
+    def intern_titles(self, named_titles):
+        """Converts a saved {app name: {title: seconds}} dict to {app id: {title: ms}}."""
+        titles = {}
+        if not isinstance(named_titles, dict):
+            return titles
+        for name, title_totals in named_titles.items():
+            detail = titles.setdefault(self.app_table.intern(name), {})
+            for title, seconds in title_totals.items():
+                add_title_detail(detail, title, to_ms(seconds))
+        return titles
+
+    def named_app_titles(self, app_titles):
+        """Per-title breakdown keyed by app name, for saving."""
+        named = {}
+        for app_id, title_totals in app_titles.items():
+            detail = named.setdefault(self.app_table.name(app_id), {})
+            for title, ms in title_totals.items():
+                add_title_detail(detail, title, ms)
+        return named
+
+    def recover_from_journal(self):
+        """Merges journaled intervals newer than the last history save into history."""
+        covered_seq = self.history.journal_seq()
+        watermark = max((entry.get("last_timestamp", 0) for entry in self.history.recent(HISTORY_DAYS)), default=0)
+        self.journal.resume_after(covered_seq)
+        try:
+            recovered_days = self.journal.replay(since_seq=covered_seq, since=watermark)
+        except Exception as e:
+            print(f"Error replaying screen time journal: {e}")
+            return False
+
+        for day_str, day in sorted(recovered_days.items()):
+            self.history.merge_day(day_str, day["usage"], day["break_time"], day["idle_time"],
+                                   day["last_timestamp"], day["journal_seq"], day["suspended_time"], day["titles"])
+        return bool(recovered_days)
+
+    def save_data(self, snapshot=None):
+        """Saves a day's totals (the latest snapshot by default) to its history row."""
+        with self._save_lock:
+            snapshot = snapshot or self.core.snapshot
+            if snapshot is self.core.snapshot:
+                self._save_scheduled = False
+
+            entry = {
+                "date": str(snapshot.day),
+                "usage": totals_to_seconds(self.app_table.named_totals(snapshot.app_times)),
+                "titles": {app: totals_to_seconds(titles) for app, titles in self.named_app_titles(snapshot.app_titles).items()},
+                "break_time": to_seconds(snapshot.break_time),
+                "idle_time": to_seconds(snapshot.idle_time),
+                "suspended_time": to_seconds(snapshot.suspended_time),
+                "last_timestamp": time.time() # Save the timestamp right before saving
+            }
+            try:
+                self.history.save_day(entry, snapshot.journal_seq)
+                # History now covers the journal up to the snapshot
+                self.journal.compact(snapshot.journal_seq)
+            except Exception as e:
+                print(f"Error saving screen time history for {entry['date']}: {e}")
+
+            self.weekly_data = self.history.recent(HISTORY_DAYS)
+            self.history_version += 1
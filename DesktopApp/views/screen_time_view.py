@@ -1,15 +1,23 @@
 import tkinter as tk
 import customtkinter as ctk
 import time
-import threading
-import pygetwindow as gw
-import json
 import os
-from datetime import date, timedelta, datetime
+from datetime import date, timedelta
 import math
 from theme import Theme
 from PIL import Image
-from .data_utils import get_user_data_path, resource_path, SCREEN_TIME_FILE, read_config, update_google_sheet_screen_time
+from .data_utils import get_user_data_path, resource_path, CATEGORY_RULES_FILE
+from .config_service import get_config
+from .outbound_queue import enqueue_screen_time_upload
+from .idle_detector import IDLE_BUCKET
+from .category_matcher import CategoryMatcher, APP_CATEGORIES, usage_by_category
+from .app_usage_list import AppUsageList
+from .render_scheduler import RenderScheduler
+from .screen_time_tracker import WORK_THRESHOLD_SECONDS
+from .tracker_daemon import create_tracker, stop_tracker
+from .daily_rollups import DailyRollupCache, BAR_RANGES
+from .retained_canvas import RetainedCanvas
+from .durations import to_ms, to_seconds, totals_to_seconds
 from tkinter import messagebox  # Ensure messagebox is imported
 
 # Windows API imports for rounded corners (Windows-specific) - Add this after your existing imports
@@ -47,10 +55,6 @@ def create_rounded_region(hwnd, radius):
     return result != 0
 
 
-# --- CONFIGURATION ---
-# Time (in seconds) after which a break reminder will pop up
-WORK_THRESHOLD_SECONDS = 600  # 600 # 60 minutes
-# ---------------------
 
 
 def tint_icon(image_path, color_hex, size=(40, 40)):
@@ -490,29 +494,15 @@ def load_png_image(path, size=(25, 25)):
     except Exception as e:
         print(f"Error loading PNG image from {path}: {e}")
         return None
-# Hardcoded application categories for demonstration.
-APP_CATEGORIES = {
-    "Work": ["visual studio code", "jira", "excel", "slack", "outlook", "github", "word"],
-    "Social Media": ["facebook", "twitter", "instagram", "tiktok", "whatsapp"],
-    "Learning": ["youtube", "udemy", "coursera", "stack overflow"],
-    "Entertainment": ["spotify", "vlc media player", "netflix", "prime video", "steam", "valorant", "league of legends"],
-    "File/System": ["file explorer", "notepad", "edit"],
-    "Communication": ["zoom", "discord", "skype", "teams"],
-    "Browsing": ["chrome", "firefox", "edge", "opera", "brave"],
-    "Design": ["photoshop", "illustrator", "figma", "canva"]
-}
+# Keyword rules live in category_matcher.py; users can add their own in category_rules.json
+CATEGORY_MATCHER = CategoryMatcher(APP_CATEGORIES, rules_file=CATEGORY_RULES_FILE)
 
 def get_category(app_title):
-    """Assigns an app to a predefined category."""
-    title_lower = app_title.lower()
-    for category, keywords in APP_CATEGORIES.items():
-        for keyword in keywords:
-            if keyword.lower() in title_lower:
-                return category
-    return "Other"
+    """Assigns an app to a predefined or user-defined category."""
+    return CATEGORY_MATCHER.categorize(app_title)
 
 class ScreenTimeView(ctk.CTkFrame):
-    def __init__(self, master, back_to_dashboard_callback):
+    def __init__(self, master, back_to_dashboard_callback, tracker=None):
         super().__init__(master, fg_color=Theme.BACKGROUND)
         self.back_to_dashboard = back_to_dashboard_callback
         self.master_window = master 
@@ -530,10 +520,17 @@ class ScreenTimeView(ctk.CTkFrame):
         self.title_number_font = ctk.CTkFont(*Theme.FONT_TITLE) 
         
         self.tracking = True
-        self.weekly_data = []
         
         os.makedirs(self.DATA_FOLDER, exist_ok=True)
-        self.load_data()
+        # Attach to the headless tracker daemon if one is running, otherwise track in-process.
+        # Either way the view only reads tracker.snapshot / tracker.weekly_data.
+        # The app passes in the tracker it started at launch; standalone, the view starts its own.
+        self.owns_tracker = tracker is None
+        self.tracker = tracker or create_tracker()
+        self.app_table = self.tracker.app_table
+        # Finished days' totals for the bar graph, summed once
+        self.daily_rollups = DailyRollupCache(self.tracker.history_range)
+        self.bar_range_days = BAR_RANGES[0]
 
         self.start_time = time.time()
         self.last_update_time = time.time()
@@ -543,13 +540,25 @@ class ScreenTimeView(ctk.CTkFrame):
         self.break_start_time = None
         
         # --- NEW: Break Reminder State ---
-        self.continuous_work_time = 0.0
+        # Continuous work time comes from the tracker snapshot; after a snooze the
+        # reminder waits for a snapshot newer than this version
+        self.reminder_wait_version = 0
         self.is_reminder_active = False
         self.reminder_window = None
         self.popup_timer_window = None # Stores the LiveTimersPopup instance
         # --- END NEW ---
-        
+
+        # Charts/list are only redrawn while visible and when their inputs changed.
+        # usage_version only moves when app, break or idle totals do, not on every heartbeat.
+        self.render_scheduler = RenderScheduler(self.winfo_viewable)
+        self.render_scheduler.register("pie", self.draw_pie_chart,
+                                       lambda: (self.tracker.snapshot.usage_version, self.canvas_size(self.pie_chart_canvas)))
+        self.render_scheduler.register("bar", self.draw_bar_graph, self.bar_graph_key)
+        self.render_scheduler.register("app_list", self.update_app_list, lambda: self.tracker.snapshot.usage_version)
+
         self.setup_ui()
+        # Catch up as soon as the view is shown again (e.g. restored from the tray)
+        self.bind("<Map>", lambda event: self.render_scheduler.run(), add="+")
         
         # Schedule the initial render to run shortly after the widgets have settled and been sized.
         self.master_window.after(10, self.initial_render)
@@ -558,92 +567,28 @@ class ScreenTimeView(ctk.CTkFrame):
         
         # New: Get "Week Offs" from config - Note: this is still used for the bar graph logic, 
         # but NOT for the upload status check anymore.
-        self.week_offs = read_config().get('Week Offs', 'Sat, Sun').split(',')
-        self.week_offs = [day.strip()[:3] for day in self.week_offs]
+        self.week_offs = get_config().week_offs
 
 
     def initial_render(self):
         """A one-time call to render the charts immediately after the UI is mapped."""
-        self.draw_pie_chart()
-        self.draw_bar_graph()
-        self.update_app_list()
-
-    def load_data(self):
-        """Loads historical screen time data and today's session data from JSON file."""
-        today_str = str(date.today())
-        
-        if os.path.exists(SCREEN_TIME_FILE):
-            try:
-                with open(SCREEN_TIME_FILE, "r") as f:
-                    self.weekly_data = json.load(f)
-            except json.JSONDecodeError as e:
-                print(f"Error decoding screen time data: {e}. Starting with empty data.")
-                self.weekly_data = []
-        else:
-            self.weekly_data = []
-
-        # --- Data Persistence Logic ---
-        self.app_times = {}
-        self.break_time = 0
-        self.last_saved_timestamp = time.time() # Default to current time
-
-        # Check if today's data exists in the historical log and load it
-        for entry in self.weekly_data:
-            if entry["date"] == today_str:
-                entry_usage = entry.get("usage", {})
-                if isinstance(entry_usage, dict):
-                    self.app_times = entry_usage
-                self.break_time = entry.get("break_time", 0)
-                # Load the timestamp of the last save
-                self.last_saved_timestamp = entry.get("last_timestamp", time.time())
-                break
-        
-        if not isinstance(self.app_times, dict):
-            self.app_times = {}
-
-        # --- Resume Logic: Account for time elapsed while the app was closed ---
-        if str(date.fromtimestamp(self.last_saved_timestamp)) == today_str:
-            time_since_closed = time.time() - self.last_saved_timestamp
-            
-            self.last_update_time = time.time() 
-        else:
-            # If the loaded data is from a previous day, reset counters for a fresh start today
-            self.app_times = {}
-            self.break_time = 0
-            self.last_update_time = time.time()
-
-    def save_data(self):
-        """Saves current daily data to the JSON file."""
-        today_str = str(date.today())
-        
-        found = False
-        for entry in self.weekly_data:
-            if entry["date"] == today_str:
-                entry["usage"] = self.app_times
-                entry["break_time"] = self.break_time
-                entry["last_timestamp"] = time.time() # Save the timestamp right before saving
-                found = True
-                break
-        if not found:
-            self.weekly_data.append({
-                "date": today_str, 
-                "usage": self.app_times, 
-                "break_time": self.break_time,
-                "last_timestamp": time.time() # Save the timestamp
-            })
-        
-        self.weekly_data = sorted(self.weekly_data, key=lambda x: x['date'], reverse=False)[-7:]
-        
-        try:
-            with open(SCREEN_TIME_FILE, "w") as f:
-                json.dump(self.weekly_data, f, indent=4)
-        except Exception as e:
-            print(f"Error saving screen time data to {SCREEN_TIME_FILE}: {e}")
+        self.render_scheduler.invalidate()
+        self.render_scheduler.run()
+
+    def bar_graph_key(self):
+        """The bar graph's inputs: today's running total, saved history, range and size."""
+        snapshot = self.tracker.snapshot
+        return (snapshot.app_total + snapshot.break_time, self.tracker.history_version, date.today(),
+                self.bar_range_days, self.canvas_size(self.bar_graph_canvas))
+
+    @staticmethod
+    def canvas_size(canvas):
+        return canvas.winfo_width(), canvas.winfo_height()
 
     def start_tracking(self):
-        """Starts the background tracking thread and GUI update loop."""
-        self.update_thread = threading.Thread(target=self.track_time_loop, daemon=True)
-        self.update_thread.start()
+        """Starts the tracker (a no-op when attached to the daemon) and GUI update loop."""
+        if self.owns_tracker:
+            self.tracker.start()
         # The main GUI update is scheduled to start the regular refresh loop
         self.master_window.after(1000, self.update_gui)
     
@@ -653,7 +598,7 @@ class ScreenTimeView(ctk.CTkFrame):
             return
 
         if initial_remind:
-            message = "You've been working continuously for an hour. Your focus improves after short breaks. Ready to step away?"
+            message = f"You've been working continuously for {WORK_THRESHOLD_SECONDS // 60} minutes. Your focus improves after short breaks. Ready to step away?"
         else:
             message = "Hey, still working hard! Your eyes and mind need a quick reset. Ready to step away?"
 
@@ -684,86 +629,53 @@ class ScreenTimeView(ctk.CTkFrame):
         else:
             # Set the timer based on user's snooze selection
             snooze_seconds = snooze_minutes * 60
-            self.continuous_work_time = WORK_THRESHOLD_SECONDS - snooze_seconds
+            self.tracker.set_continuous_work_time(WORK_THRESHOLD_SECONDS - snooze_seconds)
+            self.reminder_wait_version = self.tracker.snapshot.version
             print(f"Reminder snoozed. Next check in {snooze_minutes} minutes.")
 
 
     def update_data_to_sheet(self):
         """Manually triggers the data upload to the Google Sheet."""
-        self.save_data()
+        self.tracker.save_data()
         
         # Prepare data for upload 
-        current_day_data = next((item for item in self.weekly_data if item["date"] == str(date.today())), None)
+        current_day_data = self.tracker.today_data()
         
         if not current_day_data:
             messagebox.showwarning("No Data", "No screen time data available for today.")
             return
         
-        print("Uploading screen time data to Google Sheets...")
-        upload_status = update_google_sheet_screen_time(user_screen_time_data=current_day_data)
-        print(upload_status)
-        
-        # Show confirmation dialog ONLY when manually triggered
-        if "Success" in upload_status:
+        print("Queueing screen time upload to Google Sheets...")
+        enqueue_screen_time_upload(current_day_data, on_result=self.upload_result_callback)
+
+    def upload_result_callback(self, success, message, will_retry):
+        """Outbound queue callback (worker thread): hands the result to the Tk thread."""
+        self.master_window.after(0, self.show_upload_status, success, message, will_retry)
+
+    def show_upload_status(self, success, message, will_retry):
+        """Shows the result of a manual upload (shutdown uploads stay silent)."""
+        print(message)
+        if success:
             messagebox.showinfo("Success!", "Screen time data successfully updated on Google Sheets.")
-        elif "Error" in upload_status:
-            messagebox.showerror("Update Failed", f"Screen time update failed:\n\n{upload_status}")
+        elif will_retry:
+            messagebox.showwarning("Update Delayed", f"Screen time update couldn't be sent right now and will be retried automatically:\n\n{message}")
         else:
-            messagebox.showwarning("Update Status", upload_status)
+            messagebox.showerror("Update Failed", f"Screen time update failed:\n\n{message}")
             
     def stop_tracking(self):
-        """Sets flag to stop the background thread gracefully and triggers final saves."""
+        """Stops tracking (or detaches from the daemon) and triggers final saves."""
         self.tracking = False
-        # CRITICAL: Force a final save on shutdown
-        self.save_data()
-
-        # Silent auto-upload on app shutdown (no popup messages)
-        try:
-            current_day_data = next((item for item in self.weekly_data if item["date"] == str(date.today())), None)
-            if current_day_data:
-                print("Uploading screen time data to Google Sheets...")
-                upload_status = update_google_sheet_screen_time(user_screen_time_data=current_day_data)
-                print(upload_status)  # Only log to console
-        except Exception as e:
-            print(f"Silent upload error: {e}")
+        # CRITICAL: Force a final save on shutdown, then queue the silent upload
+        stop_tracker(self.tracker)
 
         print("Screen time tracking thread flagged for shutdown.")
 
-    def track_time_loop(self):
-        """A background thread to continuously check the active window and update time data."""
-        last_day = date.today()
-        while self.tracking:
-            try:
-                current_day = date.today()
-                if current_day > last_day:
-                    self.save_data()
-                    self.load_data() 
-                last_day = current_day
-
-                elapsed_time = time.time() - self.last_update_time
-
-                if not self.is_on_break:
-                    active_window = gw.getActiveWindow()
-
-                    if not self.is_reminder_active and self.continuous_work_time >= WORK_THRESHOLD_SECONDS:
-                        self.master_window.after(0, self.popup_break_reminder, True)
-
-                    if active_window and active_window.title:
-                        app_title = active_window.title
-
-                        if app_title not in self.app_times:
-                            self.app_times[app_title] = 0
-
-                        self.app_times[app_title] += elapsed_time
-                        self.continuous_work_time += elapsed_time
-                else:
-                    # Reset continuous work timer during break
-                    self.continuous_work_time = 0.0
-
-                self.last_update_time = time.time()
-                time.sleep(0.01)
-            except Exception as e:
-                pass
+    def check_break_reminder(self):
+        """Shows the break reminder once the tracker reports WORK_THRESHOLD_SECONDS of continuous work."""
+        snapshot = self.tracker.snapshot
+        if (not self.is_on_break and not self.is_reminder_active and snapshot.version > self.reminder_wait_version
+                and snapshot.continuous_work_time >= to_ms(WORK_THRESHOLD_SECONDS)):
+            self.popup_break_reminder(True)
 
 
     def setup_ui(self):
@@ -795,7 +707,12 @@ class ScreenTimeView(ctk.CTkFrame):
         # Top-left: Bar Graph
         bar_graph_frame = ctk.CTkFrame(main_content_frame, corner_radius=15, height=350)
         bar_graph_frame.grid(row=0, column=0, padx=15, pady=15, sticky="nsew")
-        ctk.CTkLabel(bar_graph_frame, text="Weekly Usage Bar Graph", font=Theme.FONT_SUBTITLE).pack(pady=10)
+        self.bar_graph_title = ctk.CTkLabel(bar_graph_frame, text="Weekly Usage Bar Graph", font=Theme.FONT_SUBTITLE)
+        self.bar_graph_title.pack(pady=(10, 5))
+        self.bar_range_selector = ctk.CTkSegmentedButton(bar_graph_frame, values=[f"{days} Days" for days in BAR_RANGES],
+                                                         command=self.set_bar_range, font=Theme.FONT_NORMAL)
+        self.bar_range_selector.set(f"{self.bar_range_days} Days")
+        self.bar_range_selector.pack()
         self.bar_graph_canvas = ctk.CTkCanvas(bar_graph_frame, highlightthickness=0)
         self.bar_graph_canvas.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
 
@@ -810,12 +727,18 @@ class ScreenTimeView(ctk.CTkFrame):
         self.pie_chart_canvas.bind("<Leave>", self.on_pie_chart_leave)
         self.tooltip_text_id = None
 
+        # Retained-mode layers: chart items are created once and then updated in place
+        self.bar_layer = RetainedCanvas(self.bar_graph_canvas)
+        self.pie_layer = RetainedCanvas(self.pie_chart_canvas)
+        self.pie_slices = {}  # arc item id -> (category, seconds), for the tooltip
+
         # Bottom-left: App List
         app_list_frame = ctk.CTkFrame(main_content_frame, corner_radius=15, height=350)
         app_list_frame.grid(row=1, column=0, padx=15, pady=15, sticky="nsew")
         ctk.CTkLabel(app_list_frame, text="App Usage List", font=Theme.FONT_SUBTITLE).pack(pady=(10, 5))
-        self.app_list_scrollable_frame = ctk.CTkScrollableFrame(app_list_frame, corner_radius=10)
-        self.app_list_scrollable_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+        # Virtualized list: only the visible rows exist as widgets
+        self.app_usage_list = AppUsageList(app_list_frame, self.format_time_string)
+        self.app_usage_list.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
 
         # Bottom-right: Timers and Break Buttons
         break_timer_frame = ctk.CTkFrame(main_content_frame, corner_radius=15, height=350)
@@ -849,8 +772,9 @@ class ScreenTimeView(ctk.CTkFrame):
         if not self.is_on_break:
             self.break_start_time = time.time()
             self.is_on_break = True
-            # Reset continuous work timer during break
-            self.continuous_work_time = 0.0
+            # The tracker stops counting and resets the continuous work timer
+            self.tracker.start_break()
+            self.reminder_wait_version = self.tracker.snapshot.version
 
             if self.popup_timer_window is None or not self.popup_timer_window.winfo_exists():
                 self.popup_timer_window = LiveTimersPopup(self.master_window, self)
@@ -863,7 +787,7 @@ class ScreenTimeView(ctk.CTkFrame):
         """Resets the break time counters and updates the UI labels."""
         # Save the accumulated break time before resetting
         if self.break_start_time is not None:
-            self.break_time += time.time() - self.break_start_time
+            self.tracker.end_break(self.break_start_time, time.time())
 
         self.break_start_time = None
         self.break_timer_label.configure(text="00:00:00")
@@ -898,30 +822,25 @@ class ScreenTimeView(ctk.CTkFrame):
 
         item = self.pie_chart_canvas.find_closest(event.x, event.y)[0]
         
-        if "pie_slice" in self.pie_chart_canvas.gettags(item):
-            self.pie_chart_canvas.delete(self.tooltip_text_id)
-            
-            tags = self.pie_chart_canvas.itemcget(item, "tags").split(" ")
-            if len(tags) >= 2:
-                category = tags[0]
-                try:
-                    time_spent = float(tags[1])
-                    time_str = self.format_time_string(time_spent)
-                    tooltip_text = f"{category}: {time_str}"
-                    
-                    self.tooltip_text_id = self.pie_chart_canvas.create_text(event.x, event.y - 10, text=tooltip_text, font=("Helvetica", 10), fill=Theme.TEXT, anchor="s")
-                except ValueError:
-                    pass
+        if item in self.pie_slices:
+            category, time_spent = self.pie_slices[item]
+            tooltip_text = f"{category}: {self.format_time_string(time_spent)}"
+
+            # One tooltip item, moved and re-texted as the mouse moves
+            if self.tooltip_text_id is None:
+                self.tooltip_text_id = self.pie_chart_canvas.create_text(event.x, event.y - 10, text=tooltip_text, font=("Helvetica", 10), fill=Theme.TEXT, anchor="s")
+            else:
+                self.pie_chart_canvas.coords(self.tooltip_text_id, event.x, event.y - 10)
+                self.pie_chart_canvas.itemconfigure(self.tooltip_text_id, text=tooltip_text, fill=Theme.TEXT, state="normal")
+            self.pie_chart_canvas.tag_raise(self.tooltip_text_id)
 
     def on_pie_chart_leave(self, event):
-        """Removes the tooltip when the mouse leaves the canvas."""
+        """Hides the tooltip when the mouse leaves the canvas."""
         if self.tooltip_text_id is not None:
-            self.pie_chart_canvas.delete(self.tooltip_text_id)
+            self.pie_chart_canvas.itemconfigure(self.tooltip_text_id, state="hidden")
 
     def draw_pie_chart(self):
         """Draws the circular usage chart on the canvas based on categories."""
-        self.pie_chart_canvas.delete("all")
-
         canvas_width = self.pie_chart_canvas.winfo_width()
         canvas_height = self.pie_chart_canvas.winfo_height()
         
@@ -938,16 +857,20 @@ class ScreenTimeView(ctk.CTkFrame):
         x2 = center_x + radius
         y2 = center_y + radius
         
-        category_usage = {"Break": self.break_time}
-        for app, time_spent in self.app_times.items():
-            category = get_category(app)
-            if category not in category_usage:
-                category_usage[category] = 0
-            category_usage[category] += time_spent
+        snapshot = self.tracker.snapshot
+        category_usage = {"Break": to_seconds(snapshot.break_time), IDLE_BUCKET: to_seconds(snapshot.idle_time)}
+        category_times, _ = self.usage_by_category(snapshot)
+        for category, time_spent in totals_to_seconds(category_times).items():
+            category_usage[category] = category_usage.get(category, 0) + time_spent
+
+        # Slices are keyed by rank, so a new total only moves/recolours existing arcs
+        self.pie_layer.begin()
+        self.pie_slices = {}
 
         total_time = sum(category_usage.values())
         if total_time == 0:
-            self.pie_chart_canvas.create_oval(x1, y1, x2, y2, outline=Theme.TEXT_SECONDARY, width=4)
+            self.pie_layer.draw("empty", "oval", (x1, y1, x2, y2), outline=Theme.TEXT_SECONDARY, width=4)
+            self.pie_layer.end()
             return
 
         angle_start = 0
@@ -960,65 +883,36 @@ class ScreenTimeView(ctk.CTkFrame):
             
             fill_color = self.chart_colors[color_index % len(self.chart_colors)]
             
-            tag_str = f"{category} {time_spent} pie_slice"
-            self.pie_chart_canvas.create_arc(x1, y1, x2, y2, start=angle_start, extent=angle, fill=fill_color, outline=Theme.BACKGROUND, width=2, tags=tag_str)
+            item = self.pie_layer.draw(("slice", color_index), "arc", (x1, y1, x2, y2), start=round(angle_start, 2), extent=round(angle, 2),
+                                       fill=fill_color, outline=Theme.BACKGROUND, width=2)
+            self.pie_slices[item] = (category, time_spent)
             
             angle_start = angle_end
             color_index += 1
 
+        self.pie_layer.end()
+
     def draw_bar_graph(self):
-        """Draws the bar graph for weekly usage and average."""
-        self.bar_graph_canvas.delete("all")
-        
+        """Draws the bar graph for daily usage over the selected range and its average."""
         # Define 'today' here
         today = date.today()
-        
-        weekly_totals = []
-        # Load saved data, sorted by date
-        sorted_weekly_data = sorted(self.weekly_data, key=lambda x: x['date'], reverse=False)
-
-        # Populate weekly_totals from saved data
-        for entry in sorted_weekly_data:
-            total_seconds = sum(entry.get("usage", {}).values()) + entry.get("break_time", 0)
-            weekly_totals.append(total_seconds)
-        
-        # --- FIX: Handle Today's Live Data ---
-        
-        # 1. Check if today's data is already in the SAVED list (only happens on day rollover/save)
-        today_str = str(today)
-        is_today_in_saved_data = any(entry['date'] == today_str for entry in self.weekly_data)
-        
-        # 2. Get the current, live session total
-        live_today_total = sum(self.app_times.values()) + self.break_time
 
-        if is_today_in_saved_data:
-            # If today is already saved, we MUST update the *last* element of weekly_totals, not append.
-            # This handles the case where the app re-opens and loads old data, then starts tracking.
-            if weekly_totals and datetime.strptime(sorted_weekly_data[-1]['date'], '%Y-%m-%d').date() == today:
-                 weekly_totals[-1] = live_today_total # Replace the saved total with the active live total
-            else:
-                 # Should not happen if data is clean, but safe to append if sorting failed.
-                 weekly_totals.append(live_today_total)
-        elif live_today_total > 0 or len(weekly_totals) < 7:
-             # If today is NOT saved, append the live total to the list
-             weekly_totals.append(live_today_total)
-
-        # --- END FIX ---
-             
-        # Select the last 7 data points for the daily bars
-        NUM_DAYS_TO_SHOW = 7
-        daily_bars_data = weekly_totals[-NUM_DAYS_TO_SHOW:]
+        # Finished days come from the rollup cache; today is the tracker's running total
+        snapshot = self.tracker.snapshot
+        self.daily_rollups.sync(self.tracker.weekly_data, self.tracker.history_version, today)
+        daily_bars = self.daily_rollups.series(self.bar_range_days, today, to_seconds(snapshot.app_total + snapshot.break_time))
+        daily_bars_data = [total_seconds for _, total_seconds in daily_bars]
              
         if not daily_bars_data:
              return
 
-        # Calculate the average based on the data displayed in the daily bars (up to 7 days)
+        # Calculate the average based on the data displayed in the daily bars
         if not daily_bars_data:
              avg_seconds = 0
         else:
             avg_seconds = sum(daily_bars_data) / len(daily_bars_data)
 
-        # Prepare all 8 pieces of data for visualization (7 days + 1 avg)
+        # Prepare the data for visualization (daily bars + 1 avg)
         data_for_display = daily_bars_data + [avg_seconds]
         
         max_time = max(data_for_display)
@@ -1031,7 +925,9 @@ class ScreenTimeView(ctk.CTkFrame):
 
         # Total number of bars to draw is the number of daily bars + 1 (for average)
         num_bars = len(data_for_display)
-        BAR_SPACING = 5 # Adjusted spacing for 8 bars total
+        BAR_SPACING = 5 if num_bars <= 8 else 2
+        # Longer ranges only label every few bars so the text doesn't overlap
+        label_step = max(1, math.ceil(len(daily_bars_data) / 7))
         
         # Calculate bar width based on available space and spacing
         total_spacing_width = BAR_SPACING * (num_bars + 1)
@@ -1040,8 +936,11 @@ class ScreenTimeView(ctk.CTkFrame):
         
         x_start = BAR_SPACING
         y_padding = 30
+
+        # Items are keyed by bar position; a refresh or resize updates them in place
+        self.bar_layer.begin()
         
-        # --- Draw Daily Bars (i < 7) ---
+        # --- Draw Daily Bars ---
         for i, total_seconds in enumerate(daily_bars_data):
             height_ratio = total_seconds / max_time if max_time > 0 else 0
             bar_height = height_ratio * (canvas_height - 2 * y_padding)
@@ -1051,20 +950,21 @@ class ScreenTimeView(ctk.CTkFrame):
             x2 = x1 + bar_width
             y2 = canvas_height - y_padding
             
-            self.bar_graph_canvas.create_rectangle(x1, y1, x2, y2, fill=self.chart_colors[i % len(self.chart_colors)], outline="")
+            self.bar_layer.draw(("bar", i), "rectangle", (x1, y1, x2, y2), fill=self.chart_colors[i % len(self.chart_colors)], outline="")
             
+            # Newest bar is always labelled; older ones every label_step bars
+            if (len(daily_bars_data) - 1 - i) % label_step != 0:
+                continue
+
             # Date Label (X-Axis)
-            # Find the date corresponding to this bar
-            days_ago = len(daily_bars_data) - 1 - i 
-            day_date = today - timedelta(days=days_ago)
-            day_name = day_date.strftime("%d/%b") # e.g., 12/Sep
-            self.bar_graph_canvas.create_text(x1 + bar_width/2, canvas_height - y_padding/2, text=day_name, font=("Rubik", 7), fill=Theme.TEXT)
+            day_name = daily_bars[i][0].strftime("%d/%b") # e.g., 12/Sep
+            self.bar_layer.draw(("date", i), "text", (x1 + bar_width/2, canvas_height - y_padding/2), text=day_name, font=("Rubik", 7), fill=Theme.TEXT)
 
             # Time Label (On top of the bar)
             time_str = self.format_time_string(total_seconds)
-            self.bar_graph_canvas.create_text(x1 + bar_width/2, y1 - 10, text=time_str, font=("Rubik", 8), fill=Theme.TEXT_SECONDARY)
+            self.bar_layer.draw(("time", i), "text", (x1 + bar_width/2, y1 - 10), text=time_str, font=("Rubik", 8), fill=Theme.TEXT_SECONDARY)
 
-        # --- Draw Weekly Average Bar (i == 7) ---
+        # --- Draw Average Bar (last) ---
         
         height_ratio = avg_seconds / max_time if max_time > 0 else 0
         bar_height = height_ratio * (canvas_height - 2 * y_padding)
@@ -1076,53 +976,60 @@ class ScreenTimeView(ctk.CTkFrame):
         y2 = canvas_height - y_padding
         
         # Apply dashed outline and remove fill for distinction
-        self.bar_graph_canvas.create_rectangle(x1, y1, x2, y2, 
-                                               outline=Theme.ACCENT_PURPLE, 
-                                               width=2, 
-                                               dash=(4, 2), 
-                                               fill="") # Use empty fill
+        self.bar_layer.draw("avg_bar", "rectangle", (x1, y1, x2, y2),
+                            outline=Theme.ACCENT_PURPLE, 
+                            width=2, 
+                            dash=(4, 2), 
+                            fill="") # Use empty fill
         
         # Calculate the start and end dates of the period represented by the average
         
-        # Determine the earliest date included in the average calculation (7 days ago)
-        start_of_period = today - timedelta(days=NUM_DAYS_TO_SHOW - 1)
+        # Determine the earliest date included in the average calculation
+        start_of_period = today - timedelta(days=self.bar_range_days - 1)
         end_of_period = today
         
         date_range_str_line1 = start_of_period.strftime('%b %d')
         date_range_str_line2 = end_of_period.strftime('%b %d')
         
         # Display the average date range across two lines
-        self.bar_graph_canvas.create_text(x1 + bar_width/2, canvas_height - y_padding - 8, text=date_range_str_line1, font=("Rubik", 7), fill=Theme.TEXT)
-        self.bar_graph_canvas.create_text(x1 + bar_width/2, canvas_height - y_padding/2 + 2, text=date_range_str_line2, font=("Rubik", 7), fill=Theme.TEXT)
+        self.bar_layer.draw("avg_from", "text", (x1 + bar_width/2, canvas_height - y_padding - 8), text=date_range_str_line1, font=("Rubik", 7), fill=Theme.TEXT)
+        self.bar_layer.draw("avg_to", "text", (x1 + bar_width/2, canvas_height - y_padding/2 + 2), text=date_range_str_line2, font=("Rubik", 7), fill=Theme.TEXT)
 
         # Time Label (On top of the average bar)
         avg_time_str = self.format_time_string(avg_seconds)
-        self.bar_graph_canvas.create_text(x1 + bar_width/2, y1 - 10, text=avg_time_str, font=("Rubik", 8), fill=Theme.TEXT_SECONDARY)
+        self.bar_layer.draw("avg_time", "text", (x1 + bar_width/2, y1 - 10), text=avg_time_str, font=("Rubik", 8), fill=Theme.TEXT_SECONDARY)
 
+        self.bar_layer.end()
 
-    def update_app_list(self):
-        """Updates the list of apps and their usage."""
-        for widget in self.app_list_scrollable_frame.winfo_children():
-            widget.destroy()
 
-        combined_times = self.app_times.copy()
-        if self.break_time > 0:
-            combined_times["Break"] = self.break_time
+    def chart_stats(self):
+        """Redraw and canvas-item churn counters for the charts."""
+        return {"bar": self.bar_layer.stats(), "pie": self.pie_layer.stats(), "renders": self.render_scheduler.stats()}
+
+    def set_bar_range(self, value):
+        """Switches the bar graph between the 7/30/90 day views."""
+        self.bar_range_days = int(value.split()[0])
+        title = "Weekly Usage Bar Graph" if self.bar_range_days == 7 else f"Usage Bar Graph - Last {self.bar_range_days} Days"
+        self.bar_graph_title.configure(text=title)
+        self.render_scheduler.run()
+
+    def usage_by_category(self, snapshot):
+        """({category: ms}, {app name: category}) for a snapshot, categorized per window title."""
+        return usage_by_category(snapshot.app_times, snapshot.app_titles, self.app_table.name, get_category)
+
+    def update_app_list(self):
+        """Updates the list of apps and their usage, reusing existing rows."""
+        snapshot = self.tracker.snapshot
+        combined_times = totals_to_seconds(self.app_table.named_totals(snapshot.app_times))
+        _, app_categories = self.usage_by_category(snapshot)
+        if snapshot.break_time > 0:
+            combined_times["Break"] = to_seconds(snapshot.break_time)
+        if snapshot.idle_time > 0:
+            combined_times[IDLE_BUCKET] = to_seconds(snapshot.idle_time)
 
         sorted_times = sorted(combined_times.items(), key=lambda item: item[1], reverse=True)
-        
-        for name, seconds in sorted_times:
-            time_str = self.format_time_string(seconds)
-            
-            row_frame = ctk.CTkFrame(self.app_list_scrollable_frame, fg_color="transparent")
-            row_frame.pack(fill=tk.X, pady=2)
-            
-            category = get_category(name)
-            category_color = Theme.ACCENT_BLUE if category == "Work" else Theme.TEXT_SECONDARY
-            
-            ctk.CTkLabel(row_frame, text=name, anchor="w", font=("Rubik", 11), padx=5, fg_color="transparent").pack(side=tk.LEFT, fill=tk.X, expand=True)
-            ctk.CTkLabel(row_frame, text=f"[{category}]", anchor="e", font=("Rubik", 10), padx=5, text_color=category_color, fg_color="transparent").pack(side=tk.RIGHT)
-            ctk.CTkLabel(row_frame, text=time_str, anchor="e", font=("Rubik", 11), padx=5, fg_color="transparent").pack(side=tk.RIGHT)
+        self.app_usage_list.set_rows([(name, seconds, app_categories.get(name) or get_category(name))
+                                      for name, seconds in sorted_times])
 
     def update_gui(self):
         """Updates the Tkinter GUI with the latest data and schedules the next update."""
@@ -1131,11 +1038,19 @@ class ScreenTimeView(ctk.CTkFrame):
 
         current_time = time.time()
 
+        # Keep the break popup live even while this view is hidden
+        visible = self.winfo_viewable()
+
         # Always update timers (fast operation)
-        total_seconds = sum(self.app_times.values())
+        # Pull the daemon's latest state (no-op in-process)
+        self.tracker.refresh()
+        self.check_break_reminder()
+
+        total_seconds = to_seconds(self.tracker.snapshot.app_total) + self.tracker.pending_focus_time()
         total_h, total_m, total_s = self.format_time(total_seconds)
         total_time_str = f"{total_h:02}:{total_m:02}:{total_s:02}"
-        self.total_screen_time_label.configure(text=total_time_str)
+        if visible:
+            self.total_screen_time_label.configure(text=total_time_str)
 
         break_time_str = "00:00:00"
         if self.is_on_break and self.break_start_time is not None:
@@ -1143,7 +1058,8 @@ class ScreenTimeView(ctk.CTkFrame):
             current_break_duration = current_time - self.break_start_time
             h, m, s = self.format_time(current_break_duration)
             break_time_str = f"{h:02}:{m:02}:{s:02}"
-            self.break_timer_label.configure(text=break_time_str)
+            if visible:
+                self.break_timer_label.configure(text=break_time_str)
 
         # Update the popup window if it exists
         if self.popup_timer_window and self.popup_timer_window.winfo_exists():
@@ -1152,9 +1068,7 @@ class ScreenTimeView(ctk.CTkFrame):
         # Update charts and lists less frequently (every 5 seconds)
         self.gui_update_counter += 1
         if self.gui_update_counter >= 5:
-            self.draw_pie_chart()
-            self.draw_bar_graph()
-            self.update_app_list()
+            self.render_scheduler.run()
             self.gui_update_counter = 0
 
         if self.tracking:
@@ -1212,11 +1126,11 @@ class ScreenTimeView(ctk.CTkFrame):
         
         self.bar_graph_canvas.configure(bg=Theme.CARD)
         self.pie_chart_canvas.configure(bg=Theme.CARD)
-        self.app_list_scrollable_frame.configure(fg_color=Theme.CARD)
+        self.app_usage_list.configure(fg_color=Theme.CARD)
         
         self.total_screen_time_label.configure(text_color=Theme.ACCENT_BLUE if not is_dark else Theme.ACCENT_BLUE_HOVER)
         self.break_timer_label.configure(text_color=Theme.ACCENT_PURPLE)
 
-        self.update_app_list()
-        self.draw_pie_chart()
-        self.draw_bar_graph()
\ No newline at end of file
+        # Colours changed, so everything is dirty; hidden views catch up on <Map>
+        self.render_scheduler.invalidate()
+        self.render_scheduler.run()
\ No newline at end of file
@@ -0,0 +1,533 @@
+# views/sheet_sync.py
+"""
+Batched Google Sheets sync.
+
+The productivity upload used to talk to the sheet one step at a time: read all
+values to check the headers, write + format + merge the headers, read again,
+scan for the employee, write the row, format it, append, and read everything a
+third time just to learn the new row number - five to eight round trips per
+save. Here the worksheet is read once, the changes are worked out locally and
+collected in a SheetBatch, and everything (grid growth, values, formats, merges,
+appends) goes out as one spreadsheet batch_update.
+
+New employee rows use the API's appendCells, which lands after the last row
+with data on the server side, so two people saving at once cannot claim the
+same row number from a stale read.
+
+FakeSpreadsheet is an in-memory stand-in for a gspread Spreadsheet that applies
+the same batch requests and counts round trips, so sync behaviour can be checked
+without network access or credentials.
+"""
+import re
+import json
+from datetime import date, datetime, timedelta
+
+from .data_utils import SHEET_INDEX_FILE, data_file_exists, read_json_verified, write_text_atomic
+
+HEADER_FORMAT = {
+    'backgroundColor': {'red': 0.26, 'green': 0.52, 'blue': 0.96},
+    'textFormat': {'bold': True, 'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}},
+    'horizontalAlignment': 'CENTER',
+    'verticalAlignment': 'MIDDLE',
+}
+CENTERED_FORMAT = {
+    'horizontalAlignment': 'CENTER',
+    'verticalAlignment': 'MIDDLE',
+}
+
+# --- Productivity report layout (two header rows, one row per employee, columns A-M) ---
+
+PRODUCTIVITY_HEADER_ROWS = [
+    ['Employee Name', 'Data Submitted', 'Packages', 'Packages', 'Packages', 'QA', 'QA', 'QA',
+     'Incident', 'Incident', 'Incident', 'PRF Creation', 'Total'],
+    ['', '', 'Simple', 'Medium', 'Complex', 'Simple', 'Medium', 'Complex', 'P1', 'P2', 'P3', 'Simple', ''],
+]
+PRODUCTIVITY_COLUMN_COUNT = len(PRODUCTIVITY_HEADER_ROWS[0])
+# (first row, last row, first column, last column), 1-based and inclusive:
+# A1:A2, B1:B2, C1:E1, F1:H1, I1:K1, L1:L2, M1:M2
+PRODUCTIVITY_MERGES = [
+    (1, 2, 1, 1), (1, 2, 2, 2), (1, 1, 3, 5), (1, 1, 6, 8), (1, 1, 9, 11), (1, 2, 12, 12), (1, 2, 13, 13),
+]
+
+
+# --- Cell values ---
+#
+# The old per-cell calls wrote with valueInputOption=USER_ENTERED, so Sheets
+# parsed each value as if typed: timestamps and "M/D" date headers became real
+# dates. batch_update takes CellData instead, so the same parsing is done here
+# for the shapes the app writes, with the number format Sheets would have picked.
+
+TIMESTAMP_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+DAY_MONTH_PATTERN = re.compile(r'^(\d{1,2})/(\d{1,2})$')
+NUMBER_PATTERN = re.compile(r'^-?\d+(\.\d+)?$')
+TIMESTAMP_NUMBER_FORMAT = {'type': 'DATE_TIME', 'pattern': 'yyyy-mm-dd hh:mm:ss'}
+DATE_HEADER_NUMBER_FORMAT = {'type': 'DATE', 'pattern': 'M/d'}
+# Day 0 of Sheets date serial numbers
+SHEETS_EPOCH = datetime(1899, 12, 30)
+
+
+def sheets_serial(moment):
+    """A date or datetime as a Sheets serial number (days since 1899-12-30)."""
+    if not isinstance(moment, datetime):
+        moment = datetime(moment.year, moment.month, moment.day)
+    return (moment - SHEETS_EPOCH) / timedelta(days=1)
+
+
+def _user_entered(value):
+    """(ExtendedValue, numberFormat or None) for one value, parsed like USER_ENTERED."""
+    if isinstance(value, bool):
+        return {'boolValue': value}, None
+    if isinstance(value, (int, float)):
+        return {'numberValue': value}, None
+    text = str(value)
+    if text.startswith('='):
+        return {'formulaValue': text}, None
+    if NUMBER_PATTERN.match(text):
+        return {'numberValue': float(text) if '.' in text else int(text)}, None
+    if TIMESTAMP_PATTERN.match(text):
+        moment = datetime.strptime(text, '%Y-%m-%d %H:%M:%S')
+        return {'numberValue': sheets_serial(moment)}, TIMESTAMP_NUMBER_FORMAT
+    day_month = DAY_MONTH_PATTERN.match(text)
+    if day_month:
+        # Typed without a year, Sheets takes month/day in the current year
+        try:
+            day = date(date.today().year, int(day_month.group(1)), int(day_month.group(2)))
+            return {'numberValue': sheets_serial(day)}, DATE_HEADER_NUMBER_FORMAT
+        except ValueError:
+            pass
+    return {'stringValue': text}, None
+
+
+def _cell_data(value, cell_format=None):
+    """CellData for one value: '' / None become empty cells, dates get their number format."""
+    cell = {}
+    number_format = None
+    if value is not None and value != '':
+        cell['userEnteredValue'], number_format = _user_entered(value)
+    if cell_format or number_format:
+        cell['userEnteredFormat'] = dict(cell_format or {})
+        if number_format:
+            cell['userEnteredFormat']['numberFormat'] = number_format
+    return cell
+
+
+def _row_data(values, cell_format=None):
+    return {'values': [_cell_data(value, cell_format) for value in values]}
+
+
+def _fields(rows, cell_format):
+    """Field mask covering the values and every format key the rows set."""
+    format_fields = list(cell_format or {})
+    if any('numberFormat' in cell.get('userEnteredFormat', {}) for row in rows for cell in row['values']):
+        format_fields.append('numberFormat')
+    if not format_fields:
+        return 'userEnteredValue'
+    return 'userEnteredValue,userEnteredFormat({})'.format(','.join(dict.fromkeys(format_fields)))
+
+
+def _record_grid_size(worksheet, rows, cols):
+    """Keeps a long-lived worksheet handle's row/column counts in step with our appendDimension requests."""
+    properties = getattr(worksheet, '_properties', None)
+    if isinstance(properties, dict):
+        grid = properties.setdefault('gridProperties', {})
+        grid['rowCount'] = max(grid.get('rowCount', 0), rows)
+        grid['columnCount'] = max(grid.get('columnCount', 0), cols)
+    else:
+        worksheet.row_count = max(worksheet.row_count, rows)
+        worksheet.col_count = max(worksheet.col_count, cols)
+
+
+class SheetBatch:
+    """Collects changes to one worksheet and submits them in a single batch_update."""
+
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+        self.requests = []
+        self._rows = worksheet.row_count
+        self._cols = worksheet.col_count
+
+    def ensure_size(self, rows, cols):
+        """Grows the grid to at least rows x cols."""
+        for dimension, current, wanted in (('ROWS', self._rows, rows), ('COLUMNS', self._cols, cols)):
+            if wanted > current:
+                self.requests.append({'appendDimension': {
+                    'sheetId': self.worksheet.id, 'dimension': dimension, 'length': wanted - current}})
+        self._rows = max(self._rows, rows)
+        self._cols = max(self._cols, cols)
+
+    def set_rows(self, first_row, rows, cell_format=None, first_col=1):
+        """Overwrites a block of cells starting at (first_row, first_col), 1-based."""
+        self.ensure_size(first_row + len(rows) - 1, first_col + max(len(row) for row in rows) - 1)
+        row_data = [_row_data(row, cell_format) for row in rows]
+        self.requests.append({'updateCells': {
+            'start': {'sheetId': self.worksheet.id, 'rowIndex': first_row - 1, 'columnIndex': first_col - 1},
+            'rows': row_data,
+            'fields': _fields(row_data, cell_format),
+        }})
+
+    def set_cell(self, row, col, value, cell_format=None):
+        self.set_rows(row, [[value]], cell_format, first_col=col)
+
+    def append_rows(self, rows, cell_format=None):
+        """Appends rows after the last row with data (placed by the server, not by our read)."""
+        self.ensure_size(self._rows, max(len(row) for row in rows))
+        row_data = [_row_data(row, cell_format) for row in rows]
+        self.requests.append({'appendCells': {
+            'sheetId': self.worksheet.id,
+            'rows': row_data,
+            'fields': _fields(row_data, cell_format),
+        }})
+
+    def merge(self, first_row, last_row, first_col, last_col):
+        """Merges a block of cells, 1-based and inclusive."""
+        self.requests.append({'mergeCells': {
+            'range': {'sheetId': self.worksheet.id, 'startRowIndex': first_row - 1, 'endRowIndex': last_row,
+                      'startColumnIndex': first_col - 1, 'endColumnIndex': last_col},
+            'mergeType': 'MERGE_ALL',
+        }})
+
+    def submit(self):
+        """Sends every collected change as one request. Returns the number of changes sent."""
+        if not self.requests:
+            return 0
+        self.worksheet.spreadsheet.batch_update({'requests': self.requests})
+        _record_grid_size(self.worksheet, self._rows, self._cols)
+        sent = len(self.requests)
+        self.requests = []
+        return sent
+
+
+def find_or_add_worksheet(spreadsheet, title, rows=1, cols=1):
+    """Returns (worksheet, created)."""
+    for worksheet in spreadsheet.worksheets():
+        if worksheet.title == title:
+            return worksheet, False
+    return spreadsheet.add_worksheet(title=title, rows=rows, cols=cols), True
+
+
+def sync_productivity_report(worksheet, data_row):
+    """
+    Writes `data_row` (employee name first, columns A-M) into the monthly
+    productivity worksheet, replacing the employee's existing row or appending a
+    new one, and adds the header rows if they are missing. One read, one write.
+    Returns 'updated' or 'appended'.
+    """
+    existing_data = worksheet.get_all_values()
+    batch = SheetBatch(worksheet)
+
+    headers_exist = len(existing_data) >= 2 and existing_data[0][:1] == ['Employee Name']
+    if not headers_exist:
+        batch.set_rows(1, PRODUCTIVITY_HEADER_ROWS, HEADER_FORMAT)
+        for merge in PRODUCTIVITY_MERGES:
+            batch.merge(*merge)
+
+    # One row per employee per month; rows 1-2 are the headers
+    employee_name = data_row[0]
+    update_row_index = -1
+    for i, row in enumerate(existing_data[2:]):
+        if row and row[0] == employee_name:
+            update_row_index = i + 3
+            break
+
+    if update_row_index != -1:
+        batch.set_rows(update_row_index, [data_row], CENTERED_FORMAT)
+        result = 'updated'
+    else:
+        batch.append_rows([data_row], CENTERED_FORMAT)
+        result = 'appended'
+    batch.submit()
+    return result
+
+
+# --- Screen time report layout (one row per employee, one column per date) ---
+
+SCREEN_TIME_HEADERS = ['Employee Name', 'Last Updated On']
+SCREEN_TIME_MIN_COLS = len(SCREEN_TIME_HEADERS) + 10  # Room for the next dates
+
+
+def column_letter(col):
+    """1 -> 'A', 27 -> 'AA'."""
+    letters = ''
+    while col > 0:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def cell_a1(row, col):
+    return f"{column_letter(col)}{row}"
+
+
+def _single_value(value_range):
+    """The value of a one-cell range from batch_get ('' for an empty cell)."""
+    return value_range[0][0] if value_range and value_range[0] else ''
+
+
+class SheetIndex:
+    """
+    Locally persisted positions in shared worksheets: header -> column and
+    employee -> row, plus the header row's width. Positions are 1-based.
+    Entries are hints, never trusted blindly: callers probe the few cells they
+    are about to rely on and rebuild the entry when a probe disagrees.
+    """
+
+    def __init__(self, path=SHEET_INDEX_FILE):
+        self.path = path
+        self.entries = {}
+        if data_file_exists(path):
+            try:
+                self.entries = read_json_verified(path)
+            except Exception as e:
+                print(f"Error reading sheet index {path}: {e}")
+
+    def entry(self, worksheet):
+        key = f"{worksheet.spreadsheet.id}/{worksheet.title}"
+        return self.entries.setdefault(key, {'headers': {}, 'employees': {}, 'width': 0})
+
+    def rebuild(self, entry, header_row, first_column):
+        """Refills an entry from row 1 and column A as read from the sheet."""
+        entry['headers'] = {}
+        for col, header in enumerate(header_row, start=1):
+            if header:
+                entry['headers'].setdefault(header, col)
+        entry['width'] = len(header_row)
+        entry['employees'] = {}
+        for row, values in enumerate(first_column[1:], start=2):
+            if values and values[0]:
+                entry['employees'].setdefault(values[0], row)
+
+    def save(self):
+        try:
+            # A lost index only costs one rebuild, so no backup copy
+            write_text_atomic(self.path, json.dumps(self.entries), backup=False)
+        except Exception as e:
+            print(f"Error saving sheet index {self.path}: {e}")
+
+
+def _probe_index(worksheet, entry, employee_name, date_header):
+    """
+    True if the cached positions we are about to use still hold what the
+    index says: today's date column (or, if it is new, the last header and the
+    free cell after it) and the employee's row. One read of at most three cells.
+    """
+    probes = []
+    date_col = entry['headers'].get(date_header)
+    if date_col:
+        probes.append((cell_a1(1, date_col), date_header))
+    else:
+        width = entry['width']
+        last_header = next((header for header, col in entry['headers'].items() if col == width), None)
+        if last_header is None:
+            return False
+        probes.append((cell_a1(1, width), last_header))
+        probes.append((cell_a1(1, width + 1), ''))
+    employee_row = entry['employees'].get(employee_name)
+    if employee_row:
+        probes.append((cell_a1(employee_row, 1), employee_name))
+    else:
+        # Unknown employee: resolved by a rebuild, which also tells us whether they exist
+        return False
+
+    ranges = [a1 for a1, _ in probes]
+    values = worksheet.batch_get(ranges)
+    return all(_single_value(value) == expected for value, (_, expected) in zip(values, probes))
+
+
+def sync_screen_time(worksheet, created, employee_name, date_header, value, timestamp, index):
+    """
+    Writes `value` into the employee's cell for `date_header` and stamps
+    'Last Updated On', adding the date column and the employee row when
+    missing. Positions come from `index` (a SheetIndex) and are checked by
+    reading just those cells; only a miss reads row 1 and column A to rebuild
+    the index. All writes go out in one batch, so an upload costs the same
+    number of requests however many employees and dates the sheet holds.
+    `created` says the worksheet was just added and still needs its headers.
+    """
+    entry = index.entry(worksheet)
+    batch = SheetBatch(worksheet)
+
+    if created:
+        batch.set_rows(1, [SCREEN_TIME_HEADERS], HEADER_FORMAT)
+        # The blue header band spans the pre-sized columns, like the first dates will
+        batch.set_rows(1, [[''] * (SCREEN_TIME_MIN_COLS - len(SCREEN_TIME_HEADERS))], HEADER_FORMAT,
+                       first_col=len(SCREEN_TIME_HEADERS) + 1)
+        index.rebuild(entry, SCREEN_TIME_HEADERS, [SCREEN_TIME_HEADERS[:1]])
+    elif not _probe_index(worksheet, entry, employee_name, date_header):
+        header_row, first_column = worksheet.batch_get(['1:1', 'A:A'])
+        index.rebuild(entry, header_row[0] if header_row else [], first_column)
+
+    batch.ensure_size(worksheet.row_count, SCREEN_TIME_MIN_COLS)
+
+    date_col = entry['headers'].get(date_header)
+    if not date_col:
+        date_col = entry['width'] + 1
+        batch.set_cell(1, date_col, date_header, HEADER_FORMAT)
+        entry['headers'][date_header] = date_col
+        entry['width'] = date_col
+
+    employee_row = entry['employees'].get(employee_name)
+    if employee_row:
+        batch.set_cell(employee_row, date_col, value)
+        batch.set_cell(employee_row, 2, timestamp)
+    else:
+        new_row = [employee_name, timestamp] + [''] * (date_col - 3) + [value]
+        batch.append_rows([new_row])
+        # The server picks the row; the next upload's rebuild picks it up
+
+    batch.submit()
+    index.save()
+
+
+# --- In-memory backend ---
+
+# How the fake renders the number formats the sync code sets
+_FAKE_DATE_RENDERERS = {
+    TIMESTAMP_NUMBER_FORMAT['pattern']: lambda moment: moment.strftime('%Y-%m-%d %H:%M:%S'),
+    DATE_HEADER_NUMBER_FORMAT['pattern']: lambda moment: f"{moment.month}/{moment.day}",
+}
+
+
+def _display_value(cell):
+    """The string get_all_values() would return for a CellData."""
+    value = cell.get('userEnteredValue', {})
+    if 'numberValue' in value:
+        number = value['numberValue']
+        render = _FAKE_DATE_RENDERERS.get(cell.get('userEnteredFormat', {}).get('numberFormat', {}).get('pattern'))
+        if render:
+            return render(SHEETS_EPOCH + timedelta(seconds=round(number * 86400)))
+        return str(int(number)) if float(number).is_integer() else str(number)
+    if 'formulaValue' in value:
+        # No formula engine; the fake shows the formula itself
+        return value['formulaValue']
+    if 'boolValue' in value:
+        return 'TRUE' if value['boolValue'] else 'FALSE'
+    return value.get('stringValue', '')
+
+
+def _parse_a1(a1):
+    """'B3' -> (3, 2); a missing row or column part (as in 'A' or '1') is 0."""
+    letters = ''.join(ch for ch in a1 if ch.isalpha())
+    digits = ''.join(ch for ch in a1 if ch.isdigit())
+    col = 0
+    for ch in letters.upper():
+        col = col * 26 + ord(ch) - ord('A') + 1
+    return (int(digits) if digits else 0), col
+
+
+class FakeWorksheet:
+    """In-memory worksheet; see FakeSpreadsheet."""
+
+    def __init__(self, spreadsheet, sheet_id, title, rows, cols):
+        self.spreadsheet = spreadsheet
+        self.id = sheet_id
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self.cells = {}     # (row, col) 0-based -> display string
+        self.formats = {}   # (row, col) 0-based -> userEnteredFormat
+        self.merges = []
+
+    def _last_row_with_data(self):
+        return max((row + 1 for (row, _), value in self.cells.items() if value != ''), default=0)
+
+    def get_all_values(self):
+        self.spreadsheet.round_trips += 1
+        return self._values()
+
+    def row_values(self, row):
+        self.spreadsheet.round_trips += 1
+        values = self._values()
+        return values[row - 1] if row <= len(values) else []
+
+    def batch_get(self, ranges):
+        """Values for each A1 range ('B1', 'A1:C1', '1:1', 'A:A'), trimmed like the API."""
+        self.spreadsheet.round_trips += 1
+        values = self._values()
+        result = []
+        for a1 in ranges:
+            first, _, last = a1.partition(':')
+            row1, col1 = _parse_a1(first)
+            row2, col2 = _parse_a1(last) if last else (row1, col1)
+            rows = values[max(row1, 1) - 1:row2 or None]
+            block = [row[max(col1, 1) - 1:col2 or None] for row in rows]
+            block = [row[:max((i + 1 for i, v in enumerate(row) if v != ''), default=0)] for row in block]
+            while block and not block[-1]:
+                block.pop()
+            result.append(block)
+        return result
+
+    def _values(self):
+        # Like the API: trailing empty rows/columns are trimmed, rows padded to equal width
+        last_row = self._last_row_with_data()
+        last_col = max((col + 1 for (_, col), value in self.cells.items() if value != ''), default=0)
+        return [[self.cells.get((row, col), '') for col in range(last_col)] for row in range(last_row)]
+
+    def _write_rows(self, first_row, first_col, rows, fields):
+        for r, row in enumerate(rows):
+            for c, cell in enumerate(row.get('values', [])):
+                row_index, col_index = first_row + r, first_col + c
+                if row_index >= self.row_count or col_index >= self.col_count:
+                    raise ValueError(f"Range exceeds grid limits of '{self.title}' "
+                                     f"({self.row_count}x{self.col_count})")
+                self.cells[(row_index, col_index)] = _display_value(cell)
+                if 'userEnteredFormat' in fields:
+                    self.formats[(row_index, col_index)] = cell.get('userEnteredFormat', {})
+
+    def apply(self, request):
+        kind, body = next(iter(request.items()))
+        if kind == 'appendDimension':
+            if body['dimension'] == 'ROWS':
+                self.row_count += body['length']
+            else:
+                self.col_count += body['length']
+        elif kind == 'updateCells':
+            start = body['start']
+            self._write_rows(start.get('rowIndex', 0), start.get('columnIndex', 0), body['rows'], body['fields'])
+        elif kind == 'appendCells':
+            first_row = self._last_row_with_data()
+            self.row_count = max(self.row_count, first_row + len(body['rows']))
+            self._write_rows(first_row, 0, body['rows'], body['fields'])
+        elif kind == 'mergeCells':
+            self.merges.append(body['range'])
+        else:
+            raise ValueError(f"Unsupported request: {kind}")
+
+
+def _request_sheet_id(request):
+    body = next(iter(request.values()))
+    if 'sheetId' in body:
+        return body['sheetId']
+    return (body.get('start') or body.get('range'))['sheetId']
+
+
+class FakeSpreadsheet:
+    """
+    In-memory stand-in for a gspread Spreadsheet. Supports the calls the sync
+    code makes (worksheets, add_worksheet, get_all_values, row_values,
+    batch_get, batch_update) and counts every one of them in `round_trips`.
+    """
+
+    def __init__(self, title="TaskSnapJournal", spreadsheet_id="fake-spreadsheet"):
+        self.title = title
+        self.id = spreadsheet_id
+        self.round_trips = 0
+        self.batches = []
+        self._worksheets = []
+
+    def worksheets(self):
+        self.round_trips += 1
+        return list(self._worksheets)
+
+    def add_worksheet(self, title, rows, cols):
+        self.round_trips += 1
+        worksheet = FakeWorksheet(self, len(self._worksheets), title, rows, cols)
+        self._worksheets.append(worksheet)
+        return worksheet
+
+    def batch_update(self, body):
+        self.round_trips += 1
+        self.batches.append(body)
+        by_id = {worksheet.id: worksheet for worksheet in self._worksheets}
+        for request in body['requests']:
+            by_id[_request_sheet_id(request)].apply(request)
+        return {'replies': [{} for _ in body['requests']]}
@@ -0,0 +1,104 @@
+# views/sheets_client.py
+"""
+Process-wide Google Sheets client and handle cache.
+
+Every upload used to call gspread.service_account() and gc.open() from
+scratch: re-read the credentials file, exchange a fresh OAuth token, search
+Drive for the spreadsheet by name and fetch its metadata to find the
+worksheet. The SheetsClient does that once. The authorised client, each
+spreadsheet (by name) and each worksheet (by spreadsheet name and title) are
+kept for the life of the process, so a repeat upload goes straight to reading
+and writing cells.
+
+The access token is refreshed in place when it has expired. If a request
+fails, callers invalidate() the cache and the next attempt starts clean (the
+outbound queue retries failed uploads), which covers revoked tokens and
+worksheets that were deleted or renamed under us.
+"""
+import threading
+
+from .data_utils import GSPREAD_CREDENTIALS_FILE
+from .sheet_sync import find_or_add_worksheet
+
+
+class SheetsClient:
+    """Lazily connects and memoizes spreadsheet and worksheet handles."""
+
+    def __init__(self, credentials_file=GSPREAD_CREDENTIALS_FILE, connect=None, not_found=None):
+        self.credentials_file = credentials_file
+        # connect() -> gspread-like client; not_found: the exceptions open() raises for a missing spreadsheet
+        self._connect = connect
+        self._not_found = not_found
+        self._lock = threading.RLock()
+        self._client = None
+        self._spreadsheets = {}  # name -> spreadsheet
+        self._worksheets = {}    # (spreadsheet name, title) -> worksheet
+        self.connects = 0
+
+    def _default_connect(self):
+        import gspread
+        if self._not_found is None:
+            self._not_found = (gspread.exceptions.SpreadsheetNotFound,)
+        return gspread.service_account(filename=self.credentials_file)
+
+    def client(self):
+        """The authorised client, connecting on first use and refreshing an expired token."""
+        with self._lock:
+            if self._client is None:
+                self._client = (self._connect or self._default_connect)()
+                self.connects += 1
+            else:
+                self._refresh_token()
+            return self._client
+
+    def _refresh_token(self):
+        # gspread 5 keeps the credentials on .auth, gspread 6 on .http_client.auth
+        credentials = getattr(self._client, 'auth', None) or getattr(getattr(self._client, 'http_client', None), 'auth', None)
+        if credentials is None or not getattr(credentials, 'expired', False):
+            return
+        from google.auth.transport.requests import Request
+        credentials.refresh(Request())
+
+    def spreadsheet(self, name):
+        """The spreadsheet called `name`, created if it doesn't exist yet."""
+        with self._lock:
+            spreadsheet = self._spreadsheets.get(name)
+            if spreadsheet is None:
+                client = self.client()
+                try:
+                    spreadsheet = client.open(name)
+                except self._not_found or ():
+                    spreadsheet = client.create(name)
+                self._spreadsheets[name] = spreadsheet
+            return spreadsheet
+
+    def worksheet(self, spreadsheet_name, title, rows=1, cols=1):
+        """Returns (worksheet, created); the worksheet is added with rows x cols if missing."""
+        with self._lock:
+            key = (spreadsheet_name, title)
+            worksheet = self._worksheets.get(key)
+            if worksheet is not None:
+                return worksheet, False
+            worksheet, created = find_or_add_worksheet(self.spreadsheet(spreadsheet_name), title, rows, cols)
+            self._worksheets[key] = worksheet
+            return worksheet, created
+
+    def invalidate(self):
+        """Drops the client and every cached handle; the next call reconnects."""
+        with self._lock:
+            self._client = None
+            self._spreadsheets.clear()
+            self._worksheets.clear()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_sheets_client():
+    """The shared SheetsClient."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SheetsClient()
+        return _client
@@ -7,8 +7,8 @@ from tkinter import messagebox
 from theme import Theme
 from PIL import Image
 import os
-import json
-from .data_utils import resource_path, get_user_data_path
+from .data_utils import resource_path
+from .data_store import get_data_store
 def load_png_image(path, size=(25, 25)):
     """
     Loads a PNG image asset and returns a CTkImage object with theme-dependent colors.
@@ -52,14 +52,13 @@ def load_png_image(path, size=(25, 25)):
 
 class ToDoView(ctk.CTkFrame):
     """
-    A view for the To-Do List screen, with file persistence in AppData.
+    A view for the To-Do List screen, persisted row by row in the data store.
     """
     def __init__(self, master, back_to_dashboard_callback):  # REMOVED: start_in_forced_mode parameter
         super().__init__(master, fg_color=Theme.BACKGROUND)
         self.back_to_dashboard = back_to_dashboard_callback
         
         self.tasks = []
-        self.data_file = os.path.join(get_user_data_path(), "tasks.json")
         
         # --- Fonts ---
         self.title_font = Theme.FONT_HEADER
@@ -116,66 +115,35 @@ class ToDoView(ctk.CTkFrame):
         self.clear_button.pack(pady=(10, 20), padx=20, fill="x")
 
     def load_tasks(self):
-        """Loads tasks from the JSON file."""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    tasks_data = json.load(f)
-                
-                for task in tasks_data:
-                    self.add_task_to_list(task['text'], task['completed'])
-            except Exception as e:
-                print(f"Error loading tasks: {e}")
-                messagebox.showerror("Data Error", "Could not load saved tasks.")
-
-    def save_tasks(self):
-        """Saves current tasks to the JSON file."""
-        tasks_data = []
-        for task in self.tasks:
-            # Check if task already has a creation date
-            existing_date = None
-            if os.path.exists(self.data_file):
-                try:
-                    with open(self.data_file, 'r') as f:
-                        old_tasks = json.load(f)
-                        for old_task in old_tasks:
-                            if old_task['text'] == task['checkbox'].cget("text"):
-                                existing_date = old_task.get('created_date')
-                                break
-                except:
-                    pass
-                
-            tasks_data.append({
-                'text': task['checkbox'].cget("text"),
-                'completed': bool(task['checkbox'].get()),
-                'created_date': existing_date or datetime.now().strftime("%b %d, %Y")
-            })
-        
+        """Loads tasks from the data store."""
         try:
-            os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-            with open(self.data_file, 'w') as f:
-                json.dump(tasks_data, f, indent=4)
+            for task in get_data_store().todos():
+                self.add_task_to_list(task['id'], task['text'], task['completed'])
         except Exception as e:
-            print(f"Error saving tasks: {e}")
-            messagebox.showerror("Data Error", "Could not save tasks to file.")
-
+            print(f"Error loading tasks: {e}")
+            messagebox.showerror("Data Error", "Could not load saved tasks.")
 
     def add_task(self):
         task_text = self.task_entry.get().strip()
         if task_text:
-            self.add_task_to_list(task_text, False)
+            try:
+                task_id = get_data_store().add_todo(task_text)
+            except Exception as e:
+                print(f"Error saving task: {e}")
+                messagebox.showerror("Data Error", "Could not save the task.")
+                return
+            self.add_task_to_list(task_id, task_text, False)
             self.task_entry.delete(0, tk.END)
-            self.save_tasks()
         else:
             messagebox.showwarning("Warning", "Task cannot be empty!")
 
-    def add_task_to_list(self, task_text, completed=False):
+    def add_task_to_list(self, task_id, task_text, completed=False):
         task_frame = ctk.CTkFrame(self.task_list_frame, corner_radius=10, fg_color="transparent")
         task_frame.pack(fill="x", pady=5)
         
         checkbox = ctk.CTkCheckBox(task_frame, text=task_text,
                                     font=self.default_task_font,
-                                    command=lambda: self.toggle_task_completion(checkbox))
+                                    command=lambda: self.toggle_task_completion(checkbox, task_id))
         
         if completed:
             checkbox.select()
@@ -183,9 +151,9 @@ class ToDoView(ctk.CTkFrame):
         
         checkbox.pack(side="left", padx=10, pady=5)
         
-        self.tasks.append({'frame': task_frame, 'checkbox': checkbox})
+        self.tasks.append({'id': task_id, 'frame': task_frame, 'checkbox': checkbox})
 
-    def toggle_task_completion(self, checkbox, initial_load=False):
+    def toggle_task_completion(self, checkbox, task_id=None, initial_load=False):
         if checkbox.get() == 1:
             new_font = ctk.CTkFont(family=self.default_task_font.cget("family"),
                                    size=self.default_task_font.cget("size"),
@@ -202,7 +170,15 @@ class ToDoView(ctk.CTkFrame):
         checkbox.configure(font=new_font)
         
         if not initial_load:
-            self.save_tasks() # Save state when toggled by user
+            self.save_task_state(task_id, checkbox.get() == 1) # Save state when toggled by user
+
+    def save_task_state(self, task_id, completed):
+        """Saves one task's completion state."""
+        try:
+            get_data_store().set_todo_completed(task_id, completed)
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            messagebox.showerror("Data Error", "Could not save tasks.")
 
     def clear_completed_tasks(self):
         tasks_to_keep = []
@@ -212,7 +188,11 @@ class ToDoView(ctk.CTkFrame):
             else:
                 tasks_to_keep.append(task)
         self.tasks = tasks_to_keep
-        self.save_tasks() # Save after clearing  
+        try:
+            get_data_store().delete_completed_todos()
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+            messagebox.showerror("Data Error", "Could not save tasks.")
 
     def update_ui_colors(self):
         is_dark = ctk.get_appearance_mode() == "Dark"
@@ -391,7 +371,6 @@ class ToDoPopup(ctk.CTkToplevel):
         
         # Initialize data
         self.tasks = []
-        self.data_file = os.path.join(get_user_data_path(), "tasks.json")
         
         # Load tasks
         self.load_tasks()
@@ -413,43 +392,37 @@ class ToDoPopup(ctk.CTkToplevel):
         self.geometry(f"+{x}+{y}")
     
     def load_tasks(self):
-        """Loads incomplete tasks from the JSON file and groups them by date."""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    tasks_data = json.load(f)
-                
-                # Only load incomplete tasks
-                incomplete_tasks = [task for task in tasks_data if not task.get('completed', False)]
-                
-                if not incomplete_tasks:
-                    # No tasks to show - enable done button immediately
-                    self.show_no_tasks_message()
-                    return
-                
-                # Group tasks by date
-                tasks_by_date = {}
-                for task in incomplete_tasks:
-                    date = task.get('created_date', 'Unknown date')
-                    if date not in tasks_by_date:
-                        tasks_by_date[date] = []
-                    tasks_by_date[date].append(task)
-                
-                # Display tasks grouped by date
-                for date, tasks in sorted(tasks_by_date.items(), reverse=True):
-                    self.add_date_header(date)
-                    for task in tasks:
-                        self.add_task_to_list(
-                            task['text'],
-                            task.get('completed', False)
-                        )
-                    
-            except Exception as e:
-                print(f"Error loading tasks: {e}")
-                # On error, enable done button so user can close
+        """Loads incomplete tasks from the data store and groups them by date."""
+        try:
+            # Only load incomplete tasks
+            incomplete_tasks = get_data_store().todos(include_completed=False)
+            
+            if not incomplete_tasks:
+                # No tasks to show - enable done button immediately
                 self.show_no_tasks_message()
-        else:
-            # File doesn't exist - enable done button immediately
+                return
+            
+            # Group tasks by date
+            tasks_by_date = {}
+            for task in incomplete_tasks:
+                date = task.get('created_date') or 'Unknown date'
+                if date not in tasks_by_date:
+                    tasks_by_date[date] = []
+                tasks_by_date[date].append(task)
+            
+            # Display tasks grouped by date
+            for date, tasks in sorted(tasks_by_date.items(), reverse=True):
+                self.add_date_header(date)
+                for task in tasks:
+                    self.add_task_to_list(
+                        task['id'],
+                        task['text'],
+                        task['completed']
+                    )
+                
+        except Exception as e:
+            print(f"Error loading tasks: {e}")
+            # On error, enable done button so user can close
             self.show_no_tasks_message()
     
     def add_date_header(self, date_str):
@@ -507,7 +480,7 @@ class ToDoPopup(ctk.CTkToplevel):
         # Hide the "Mark All Complete" button since there are no tasks
         self.complete_all_button.configure(state="disabled")
     
-    def add_task_to_list(self, task_text, completed=False):
+    def add_task_to_list(self, task_id, task_text, completed=False):
         """Adds a task to the popup list."""
         task_frame = ctk.CTkFrame(
             self.task_list_frame,
@@ -527,7 +500,7 @@ class ToDoPopup(ctk.CTkToplevel):
             task_content,
             text=task_text,
             font=ctk.CTkFont(family="Rubik", size=14, weight="bold"),
-            command=lambda: self.toggle_task_completion(checkbox, task_frame),
+            command=lambda: self.toggle_task_completion(checkbox, task_frame, task_id),
             text_color="white",
             fg_color=Theme.ACCENT_GREEN,
             hover_color=Theme.ACCENT_GREEN_HOVER,
@@ -540,6 +513,7 @@ class ToDoPopup(ctk.CTkToplevel):
         checkbox.pack(side="left", anchor="w", fill="x", expand=True)
         
         self.tasks.append({
+            'id': task_id,
             'frame': task_frame,
             'checkbox': checkbox,
             'text': task_text
@@ -548,7 +522,7 @@ class ToDoPopup(ctk.CTkToplevel):
         # Apply initial styling
         self.toggle_task_completion(checkbox, task_frame, initial_load=True)
     
-    def toggle_task_completion(self, checkbox, task_frame, initial_load=False):
+    def toggle_task_completion(self, checkbox, task_frame, task_id=None, initial_load=False):
         """Updates the visual state when a task is toggled."""
         is_completed = checkbox.get() == 1
         
@@ -580,7 +554,7 @@ class ToDoPopup(ctk.CTkToplevel):
             task_frame.configure(border_color=("#4A4D5A", "#3A3D4A"))
         
         if not initial_load:
-            self.save_tasks()
+            self.save_task_state(task_id, is_completed)
             self.check_all_complete()
     
     def mark_all_complete(self):
@@ -590,7 +564,8 @@ class ToDoPopup(ctk.CTkToplevel):
                 task['checkbox'].select()
                 self.toggle_task_completion(
                     task['checkbox'],
-                    task['frame']
+                    task['frame'],
+                    task['id']
                 )
     
     def check_all_complete(self):
@@ -607,29 +582,12 @@ class ToDoPopup(ctk.CTkToplevel):
             else:
                 self.done_button.configure(state="disabled")
     
-    def save_tasks(self):
-        """Saves the current task states back to the JSON file."""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    all_tasks = json.load(f)
-                
-                # Update completion status
-                for task in self.tasks:
-                    task_text = task['text']
-                    is_completed = task['checkbox'].get() == 1
-                    
-                    for saved_task in all_tasks:
-                        if saved_task['text'] == task_text:
-                            saved_task['completed'] = is_completed
-                            break
-                
-                # Write back to file
-                with open(self.data_file, 'w') as f:
-                    json.dump(all_tasks, f, indent=4)
-                    
-            except Exception as e:
-                print(f"Error saving tasks: {e}")
+    def save_task_state(self, task_id, completed):
+        """Saves one task's completion state back to the data store."""
+        try:
+            get_data_store().set_todo_completed(task_id, completed)
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
     
     def close_window(self):
         """Closes the popup window and exits the application."""
@@ -0,0 +1,154 @@
+# views/tracker_core.py
+"""
+Screen time tracker core.
+
+Today's usage totals are owned by a single writer, the tracking thread. Other
+threads never touch them directly: they submit() commands which the writer
+applies between focus spans. After every change the writer publishes a new
+immutable, versioned UsageSnapshot. Readers (GUI refresh, saving, uploads) just
+take the current `snapshot` reference, so they never block the sampler and can
+never observe a half-updated dict.
+"""
+import queue
+from collections import namedtuple
+from types import MappingProxyType
+
+from .app_identity import add_title_detail
+from .durations import to_seconds
+from .screen_time_journal import KIND_APP, KIND_IDLE, KIND_BREAK, KIND_SUSPEND
+
+# All durations are integer milliseconds (see durations.py).
+# app_times is {app id: ms}; app_titles is {app id: {title: ms}}.
+# app_total is sum(app_times), kept as a running total so readers never sum it.
+# suspended_time is time the machine was asleep, which is neither app nor idle time.
+# journal_seq is the last journal record the snapshot includes.
+# version bumps on every publish (each heartbeat); usage_version only when the
+# app, break or idle totals change, so charts can skip heartbeats that changed nothing.
+UsageSnapshot = namedtuple("UsageSnapshot", [
+    "version", "usage_version", "day", "app_times", "app_titles", "app_total", "break_time", "idle_time",
+    "suspended_time", "continuous_work_time", "journal_seq", "timestamp",
+])
+
+
+class TrackerCore:
+    """Single-writer owner of one day's usage totals."""
+
+    def __init__(self, app_table, journal, day):
+        self.app_table = app_table
+        self.journal = journal
+        self._commands = queue.SimpleQueue()
+        self._version = 0
+        self._usage_version = 0
+        self._reset(day)
+        self.snapshot = None
+        self.publish()
+
+    def _reset(self, day, app_times=None, app_titles=None, break_time=0, idle_time=0, suspended_time=0):
+        self._day = day
+        self._app_times = dict(app_times or {})
+        self._app_total = sum(self._app_times.values())
+        # Inner title dicts are copied on write, so snapshots can share the unchanged ones
+        self._app_titles = {app_id: MappingProxyType(dict(titles)) for app_id, titles in (app_titles or {}).items()}
+        self._break_time = break_time
+        self._idle_time = idle_time
+        self._suspended_time = suspended_time
+        self._continuous_work_time = 0
+        self._journal_seq = self.journal.last_seq
+        self._timestamp = 0.0
+        self._usage_version += 1
+
+    # --- Any thread ---
+
+    def submit(self, command, *args):
+        """Queues `command(*args)` to run on the writer. Commands are core methods below."""
+        self._commands.put((command, args))
+
+    # --- Writer only ---
+
+    def load(self, day, app_times, app_titles, break_time, idle_time, suspended_time=0):
+        """Replaces the totals with a day's saved rollup, in milliseconds."""
+        self._reset(day, app_times, app_titles, break_time, idle_time, suspended_time)
+        self.publish()
+
+    def apply_pending(self):
+        """Runs submitted commands. Returns True if any were applied."""
+        applied = False
+        while True:
+            try:
+                command, args = self._commands.get_nowait()
+            except queue.Empty:
+                break
+            command(*args)
+            applied = True
+        if applied:
+            self.publish()
+        return applied
+
+    def roll_over(self, day):
+        """Starts a fresh day. Returns the final snapshot of the day that ended."""
+        finished = self.snapshot
+        self._reset(day)
+        self.publish()
+        return finished
+
+    # Spans are given as (start, duration) in epoch milliseconds
+
+    def add_app_time(self, app_title, process, start_ms, ms):
+        app_id = self.app_table.intern(app_title, process)
+        self._app_times[app_id] = self._app_times.get(app_id, 0) + ms
+        self._app_total += ms
+        titles = dict(self._app_titles.get(app_id, {}))
+        add_title_detail(titles, app_title, ms)
+        self._app_titles[app_id] = MappingProxyType(titles)
+        self._usage_version += 1
+        self._continuous_work_time += ms
+        self._journal_span(start_ms, ms, self.app_table.name(app_id), KIND_APP, app_title)
+
+    def add_idle(self, start_ms, ms):
+        self._idle_time += ms
+        self._usage_version += 1
+        self._journal_span(start_ms, ms, None, KIND_IDLE)
+
+    def add_break(self, start_ms, ms):
+        self._break_time += ms
+        self._usage_version += 1
+        self._journal_span(start_ms, ms, None, KIND_BREAK)
+
+    def add_suspended(self, start_ms, ms):
+        self._suspended_time += ms
+        self._journal_span(start_ms, ms, None, KIND_SUSPEND)
+
+    def set_continuous_work_time(self, ms):
+        self._continuous_work_time = ms
+
+    def _journal_span(self, start_ms, ms, app, kind, title=None):
+        self._journaled(self.journal.append(to_seconds(start_ms), to_seconds(start_ms + ms), app, kind, title))
+
+    def _journaled(self, seq):
+        if seq is not None:
+            self._journal_seq = seq
+
+    def publish(self, timestamp=None):
+        """Swaps in a new immutable snapshot of the current totals."""
+        if timestamp is not None:
+            self._timestamp = timestamp
+        self._version += 1
+        self.snapshot = UsageSnapshot(
+            version=self._version,
+            usage_version=self._usage_version,
+            day=self._day,
+            app_times=MappingProxyType(dict(self._app_times)),
+            app_titles=MappingProxyType(dict(self._app_titles)),
+            app_total=self._app_total,
+            break_time=self._break_time,
+            idle_time=self._idle_time,
+            suspended_time=self._suspended_time,
+            continuous_work_time=self._continuous_work_time,
+            journal_seq=self._journal_seq,
+            timestamp=self._timestamp,
+        )
+        return self.snapshot
+
+    @property
+    def day(self):
+        return self._day
@@ -0,0 +1,330 @@
+# views/tracker_daemon.py
+"""
+Headless screen time tracker daemon and the client the GUI attaches with.
+
+`main.py --tracker-daemon` runs a ScreenTimeTracker without Tk, the tray or
+any view, and serves a small query API on a localhost socket. The address and
+a random auth key are written to TRACKER_DAEMON_FILE in the user data folder;
+only processes that can read that file can connect.
+
+When the app starts and a daemon is running, it attaches through a
+TrackerClient (see create_tracker) instead of starting its own tracker. The client mirrors the
+reader/command API of ScreenTimeTracker, so the view doesn't care which it has.
+
+Whichever process tracks holds the tracker lock (see tracker_lock.py). The
+daemon refuses to start while the app is tracking in-process, and the app
+connects as a client whenever the lock is held by a daemon.
+"""
+import os
+import json
+import time
+import secrets
+import threading
+from multiprocessing.connection import Listener, Client
+
+from .data_utils import TRACKER_DAEMON_FILE, write_text_atomic
+from .app_identity import AppIdentityTable
+from .screen_time_tracker import ScreenTimeTracker
+from .outbound_queue import enqueue_screen_time_upload
+from .tracker_core import UsageSnapshot
+from .tracker_lock import TrackerLockHeld
+
+DAEMON_HOST = "127.0.0.1"
+# How long the app waits for a daemon that holds the lock to publish its address
+CONNECT_WAIT_SECONDS = 5.0
+CONNECT_RETRY_SECONDS = 0.25
+
+
+def _read_daemon_file(path=TRACKER_DAEMON_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            info = json.load(f)
+        return (info["host"], int(info["port"])), bytes.fromhex(info["authkey"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, None
+
+
+class TrackerDaemon:
+    """Serves a tracker's snapshots and commands to local clients."""
+
+    def __init__(self, tracker, daemon_file=TRACKER_DAEMON_FILE):
+        self.tracker = tracker
+        self.daemon_file = daemon_file
+        self.authkey = secrets.token_bytes(32)
+        self.listener = Listener((DAEMON_HOST, 0), authkey=self.authkey)
+        self._shutdown = threading.Event()
+
+    def publish_address(self):
+        host, port = self.listener.address
+        # Clients never see a half-written address; it is rewritten on every start, so no backup
+        info = {"host": host, "port": port, "authkey": self.authkey.hex(), "pid": os.getpid()}
+        write_text_atomic(self.daemon_file, json.dumps(info), backup=False)
+
+    def serve_forever(self):
+        """Accepts clients until a "shutdown" request arrives."""
+        self.publish_address()
+        accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
+        accept_thread.start()
+        try:
+            while not self._shutdown.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            try:
+                os.remove(self.daemon_file)
+            except OSError:
+                pass
+            self.listener.close()
+
+    def _accept_loop(self):
+        while not self._shutdown.is_set():
+            try:
+                conn = self.listener.accept()
+            except Exception as e:
+                # Wrong auth key or the listener was closed
+                if not self._shutdown.is_set():
+                    print(f"Tracker daemon: rejected connection: {e}")
+                continue
+            threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+
+    def _serve_client(self, conn):
+        with conn:
+            while not self._shutdown.is_set():
+                try:
+                    op, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send((True, self.handle(op, args)))
+                except Exception as e:
+                    conn.send((False, f"{e.__class__.__name__}: {e}"))
+
+    def handle(self, op, args):
+        tracker = self.tracker
+        if op == "state":
+            snapshot = tracker.snapshot
+            # Durations stay in integer ms, as in the snapshot
+            return {
+                "version": snapshot.version,
+                "usage_version": snapshot.usage_version,
+                "day": snapshot.day,
+                "usage": tracker.app_table.named_totals(snapshot.app_times),
+                "titles": tracker.named_app_titles(snapshot.app_titles),
+                "app_total": snapshot.app_total,
+                "break_time": snapshot.break_time,
+                "idle_time": snapshot.idle_time,
+                "suspended_time": snapshot.suspended_time,
+                "continuous_work_time": snapshot.continuous_work_time,
+                "journal_seq": snapshot.journal_seq,
+                "timestamp": snapshot.timestamp,
+                "pending": tracker.pending_focus_time(),
+                "is_on_break": tracker.is_on_break,
+                "history_version": tracker.history_version,
+            }
+        if op == "history":
+            return tracker.weekly_data
+        if op == "history_range":
+            return tracker.history_range(*args)
+        if op == "start_break":
+            return tracker.start_break()
+        if op == "end_break":
+            return tracker.end_break(*args)
+        if op == "set_continuous_work_time":
+            return tracker.set_continuous_work_time(*args)
+        if op == "save":
+            return tracker.save_data()
+        if op == "shutdown":
+            self._shutdown.set()
+            return None
+        raise ValueError(f"unknown request {op!r}")
+
+
+def create_tracker(daemon_file=TRACKER_DAEMON_FILE, wait=CONNECT_WAIT_SECONDS, tracker_factory=ScreenTimeTracker):
+    """
+    A client for the running daemon if there is one, else an in-process
+    ScreenTimeTracker (not yet started). Raises TrackerLockHeld if another
+    process holds the tracker lock and doesn't accept connections within `wait`.
+    """
+    client = TrackerClient.connect(daemon_file)
+    if client is not None:
+        return client
+    try:
+        return tracker_factory()
+    except TrackerLockHeld:
+        pass
+    # A daemon that has just started holds the lock before it publishes its address
+    deadline = time.monotonic() + wait
+    while True:
+        client = TrackerClient.connect(daemon_file)
+        if client is not None:
+            return client
+        if time.monotonic() >= deadline:
+            raise TrackerLockHeld("Screen time is being tracked by another TaskSnap process that isn't accepting connections")
+        time.sleep(CONNECT_RETRY_SECONDS)
+
+
+def stop_tracker(tracker):
+    """
+    App shutdown: final save (or detach from the daemon), then a silent upload
+    of today's total. The upload is spooled to disk by the outbound queue, so
+    exit doesn't wait on the network; anything unsent goes out next start.
+    """
+    tracker.stop()
+    try:
+        current_day_data = tracker.today_data()
+        if current_day_data:
+            print("Queueing screen time upload to Google Sheets...")
+            enqueue_screen_time_upload(current_day_data)
+    except Exception as e:
+        print(f"Silent upload error: {e}")
+
+
+class TrackerClient:
+    """GUI-side stand-in for ScreenTimeTracker, backed by a running daemon."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._lock = threading.Lock()
+        # Names from the daemon are interned locally, so snapshots look like in-process ones
+        self.app_table = AppIdentityTable()
+        self.weekly_data = []
+        self.history_version = -1
+        self.is_on_break = False
+        self._pending = 0.0
+        self.snapshot = None
+        self.refresh()
+
+    @classmethod
+    def connect(cls, daemon_file=TRACKER_DAEMON_FILE):
+        """Returns a client for the running daemon, or None if there isn't one."""
+        address, authkey = _read_daemon_file(daemon_file)
+        if address is None:
+            return None
+        try:
+            client = cls(Client(address, authkey=authkey))
+        except Exception as e:
+            print(f"Tracker daemon not reachable: {e}")
+            return None
+        return client if client.snapshot is not None else None
+
+    def _call(self, op, *args):
+        with self._lock:
+            self._conn.send((op, args))
+            ok, result = self._conn.recv()
+        if not ok:
+            raise RuntimeError(f"Tracker daemon request {op!r} failed: {result}")
+        return result
+
+    def refresh(self):
+        """Fetches the daemon's current state (and history if it changed)."""
+        try:
+            state = self._call("state")
+            if state["history_version"] != self.history_version:
+                self.weekly_data = self._call("history")
+                self.history_version = state["history_version"]
+        except Exception as e:
+            print(f"Error querying tracker daemon: {e}")
+            return self.snapshot
+
+        app_times = {}
+        for name, ms in state["usage"].items():
+            app_id = self.app_table.intern(name)
+            app_times[app_id] = app_times.get(app_id, 0) + ms
+        app_titles = {self.app_table.intern(name): titles for name, titles in state["titles"].items()}
+
+        self.is_on_break = state["is_on_break"]
+        self._pending = state["pending"]
+        self.snapshot = UsageSnapshot(
+            version=state["version"], usage_version=state.get("usage_version", state["version"]), day=state["day"], app_times=app_times, app_titles=app_titles,
+            app_total=state["app_total"], break_time=state["break_time"], idle_time=state["idle_time"],
+            suspended_time=state["suspended_time"],
+            continuous_work_time=state["continuous_work_time"], journal_seq=state["journal_seq"],
+            timestamp=state["timestamp"])
+        return self.snapshot
+
+    def history_range(self, start, end):
+        try:
+            return self._call("history_range", start, end)
+        except Exception as e:
+            print(f"Error querying tracker daemon history: {e}")
+            return []
+
+    def today_data(self):
+        today_str = str(self.snapshot.day)
+        return next((item for item in self.weekly_data if item["date"] == today_str), None)
+
+    def pending_focus_time(self):
+        return self._pending
+
+    def start_break(self):
+        self.is_on_break = True
+        self._send_command("start_break")
+
+    def end_break(self, start, end):
+        self.is_on_break = False
+        self._send_command("end_break", start, end)
+
+    def set_continuous_work_time(self, seconds):
+        self._send_command("set_continuous_work_time", seconds)
+
+    def _send_command(self, op, *args):
+        try:
+            self._call(op, *args)
+        except Exception as e:
+            print(f"Error sending {op} to tracker daemon: {e}")
+
+    def save_data(self):
+        """Asks the daemon to save, then pulls the saved history."""
+        self._send_command("save")
+        self.refresh()
+
+    def start(self):
+        """The daemon is already tracking."""
+
+    def stop(self):
+        """Detaches; the daemon keeps tracking after the GUI exits."""
+        self.save_data()
+        self.close()
+
+    def shutdown_daemon(self):
+        """Asks the daemon to save and exit."""
+        self._send_command("shutdown")
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def run_daemon():
+    """Entry point for `main.py --tracker-daemon`. Returns a process exit code."""
+    existing = TrackerClient.connect()
+    if existing is not None:
+        print("Tracker daemon is already running.")
+        existing.close()
+        return 0
+
+    try:
+        tracker = ScreenTimeTracker()
+    except TrackerLockHeld as e:
+        # The app is tracking in-process; a second tracker would double-count
+        print(f"Not starting the tracker daemon: {e}")
+        return 1
+    tracker.start()
+    daemon = TrackerDaemon(tracker)
+    print(f"Tracker daemon listening on {daemon.listener.address} (pid {os.getpid()}).")
+    try:
+        daemon.serve_forever()
+    finally:
+        tracker.stop()
+    return 0
+
+
+def stop_daemon():
+    """Asks a running daemon to save and exit. Returns True if one was running."""
+    client = TrackerClient.connect()
+    if client is None:
+        return False
+    client.shutdown_daemon()
+    return True
@@ -0,0 +1,78 @@
+# views/tracker_lock.py
+"""
+Exclusive lock held by whichever process is tracking screen time.
+
+Only one ScreenTimeTracker may append to the journal and write screen time
+history at a time; two of them (e.g. the app tracking in-process and a
+tracker daemon started later) would double-count usage and race on the files.
+The tracker takes an OS-level lock on a file next to the journal before it
+loads anything and holds it until it stops. The OS drops the lock when the
+process dies, so a crash never leaves a stale lock behind.
+"""
+import os
+import sys
+
+LOCK_SUFFIX = ".lock"
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class TrackerLockHeld(Exception):
+    """Raised when another tracker already holds the lock."""
+
+
+class TrackerLock:
+    """Non-blocking exclusive lock on `path`; the holder's pid is written into the file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    @property
+    def held(self):
+        return self._file is not None
+
+    def acquire(self):
+        """Takes the lock. Returns False (without waiting) if another holder has it."""
+        if self._file is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        f = open(self.path, "a+", encoding="ascii")
+        try:
+            _try_lock(f)
+        except OSError:
+            f.close()
+            return False
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        self._file = f
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            _unlock(self._file)
+        except OSError:
+            pass
+        self._file.close()
+        self._file = None
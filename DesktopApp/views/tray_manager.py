@@ -75,6 +75,9 @@ class TrayManager:
         
         # Restore window state if it was minimized
         self.app.state('normal')
+
+        # Started in the tray: nothing has been built yet
+        self.app.show_initial_view()
     
     def show_view(self, view_name):
         """Shows a specific view in the main window."""
@@ -87,7 +90,7 @@ class TrayManager:
         self.app.focus_force()
         self.app.state('normal')
         
-        # Switch to the requested view
+        # Switch to the requested view (built on first use by the app's view registry)
         if view_name == 'dashboard':
             self.app.show_dashboard()
         elif view_name == 'todo':
@@ -101,20 +104,22 @@ class TrayManager:
     
     def take_break(self, icon=None, item=None):
         """Triggers a break."""
-        if hasattr(self.app, 'screen_time_view'):
-            if not self.app.screen_time_view.is_on_break:
-                self.app.after(0, self.app.screen_time_view.start_break)
-                self.icon.notify("Break started. Take your time to rest! ☕", "TaskSnap")
-            else:
-                self.icon.notify("You're already on a break! 😊", "TaskSnap")
+        # The Screen Time view may not be built yet; that has to happen on the Tk thread
+        self.app.after(0, self._take_break)
+
+    def _take_break(self):
+        """Internal method to start a break from main thread."""
+        if self.app.take_break():
+            self.icon.notify("Break started. Take your time to rest! ☕", "TaskSnap")
+        else:
+            self.icon.notify("You're already on a break! 😊", "TaskSnap")
     
 
     
     def quit_app(self, icon=None, item=None):
         """Exits the entire application."""
         # Stop tracking and save data
-        if hasattr(self.app, 'screen_time_view'):
-            self.app.screen_time_view.stop_tracking()
+        self.app.stop_tracking()
         
         # Stop the icon
         if self.icon:
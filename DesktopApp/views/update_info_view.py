@@ -6,7 +6,8 @@ from PIL import Image
 import csv
 import os
 import re
-from .data_utils import read_config, write_config, CONFIG_FILE, resource_path
+from .data_utils import write_config, CONFIG_FILE, resource_path
+from .config_service import get_config
 
 def load_png_image(path, size=(25, 25)):
     """
@@ -76,7 +77,7 @@ class UpdateInfoView(ctk.CTkFrame):
         self.config_data = {}
 
         self.create_widgets()
-        self.load_current_data(read_config())
+        self.load_current_data(get_config())
         self.update_ui_colors()
         
     def create_widgets(self):
@@ -235,7 +236,7 @@ class UpdateInfoView(ctk.CTkFrame):
         return re.match(r"^\d{1,2}:\d{2}$", time_str)
         
     def save_changes(self):
-        new_config = self.config_data.copy()
+        new_config = dict(self.config_data)
         
         user_name = self.form_entries['User First Name'].get().strip()
         user_mail = self.form_entries['User Email'].get().strip()
@@ -289,7 +290,6 @@ class UpdateInfoView(ctk.CTkFrame):
             
             messagebox.showinfo("Success", "Changes saved successfully!")
             
-            self.main_app_master.config = new_config
             self.main_app_master.dashboard_view.update_user_name(user_name) 
             
             self.back_to_dashboard()
@@ -0,0 +1,79 @@
+# views/view_registry.py
+"""
+Lazily built views for the main window.
+
+TaskSnapApp used to construct every view (widgets, tinted icons, data loads)
+before the first frame was shown, even when starting hidden in the tray. The
+ViewRegistry holds a factory per view name instead and builds a view the first
+time something navigates to it. prewarm() can build the rest one at a time
+while Tk is idle, so later navigation is instant without delaying first paint.
+"""
+import time
+
+# Delay before idle-time prewarming starts, and between views
+PREWARM_DELAY_MS = 1500
+
+# Prewarm order: Screen Time first, it also runs the break reminder. The view
+# shown at startup (dashboard or update_info) is already built and is skipped.
+PREWARM_ORDER = ["screentime", "dashboard", "productivity", "todo", "update_info"]
+
+
+def prewarm_from_config(config, start_minimized=False):
+    """
+    Reads 'Prewarm Views' (yes/no) from the config dict. Defaults to prewarming
+    only when the window starts visible; from the tray nothing is built early.
+    """
+    value = str(config.get('Prewarm Views', '')).strip().lower()
+    if value in ('yes', 'true', '1', 'on'):
+        return True
+    if value in ('no', 'false', '0', 'off'):
+        return False
+    return not start_minimized
+
+
+class ViewRegistry:
+    """Builds each registered view on first use and keeps it."""
+
+    def __init__(self):
+        self._factories = {}
+        self._views = {}
+        self.build_ms = {}  # name -> construction time, for startup reporting
+
+    def register(self, name, factory):
+        self._factories[name] = factory
+
+    def get(self, name):
+        """The view called `name`, built now if this is its first use."""
+        view = self._views.get(name)
+        if view is None:
+            started = time.perf_counter()
+            view = self._factories[name]()
+            self.build_ms[name] = (time.perf_counter() - started) * 1000
+            self._views[name] = view
+        return view
+
+    def built(self, name):
+        """The view if it has been built, else None (never builds)."""
+        return self._views.get(name)
+
+    def built_views(self):
+        return list(self._views.values())
+
+    def prewarm(self, widget, names, delay_ms=PREWARM_DELAY_MS):
+        """Builds the not-yet-built `names` one per idle slot, starting after `delay_ms`."""
+        pending = [name for name in names if name in self._factories and name not in self._views]
+
+        def build_next():
+            while pending and pending[0] in self._views:
+                pending.pop(0)
+            if not pending:
+                return
+            try:
+                self.get(pending.pop(0))
+            except Exception as e:
+                print(f"Error prewarming view: {e}")
+            if pending:
+                widget.after(delay_ms, lambda: widget.after_idle(build_next))
+
+        if pending:
+            widget.after(delay_ms, lambda: widget.after_idle(build_next))